@@ -4,16 +4,21 @@ Kalshi vs Polymarket Arbitrage Scanner
 Finds price discrepancies between platforms.
 """
 
-import requests
-import json
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import transport
+import polymarket_sync
 
 # ============== FETCH DATA ==============
 def get_kalshi_markets():
     """Get relevant Kalshi markets."""
     url = "https://api.elections.kalshi.com/trade-api/v2/events"
     params = {"status": "open", "limit": 200, "with_nested_markets": "true"}
-    response = requests.get(url, params=params, timeout=30)
+    response = transport.get(url, params=params, timeout=30)
     events = response.json().get('events', [])
     
     markets = {}
@@ -30,37 +35,15 @@ def get_kalshi_markets():
     return markets
 
 def get_polymarket_markets():
-    """Get relevant Polymarket markets."""
-    url = "https://gamma-api.polymarket.com/markets"
-    params = {"closed": "false", "limit": 100}
-    response = requests.get(url, params=params, timeout=30)
-    data = response.json()
-    
+    """Get every open Polymarket market (incremental sync)."""
     markets = {}
-    for m in data:
-        question = m.get('question', '')
-        prices_raw = m.get('outcomePrices', '[]')
-        
-        # Parse prices - might be string or list
-        if isinstance(prices_raw, str):
-            try:
-                prices = json.loads(prices_raw)
-            except:
-                continue
-        else:
-            prices = prices_raw
-        
-        if len(prices) >= 2:
-            try:
-                yes_price = float(prices[0]) * 100  # Convert to cents
-                markets[question] = {
-                    'title': question,
-                    'yes': yes_price,
-                    'no': 100 - yes_price,
-                    'volume': m.get('volumeNum', m.get('volume', 0))
-                }
-            except:
-                continue
+    for m in polymarket_sync.open_markets(timeout=30):
+        markets[m['title']] = {
+            'title': m['title'],
+            'yes': m['yes'],
+            'no': m['no'],
+            'volume': m['volume']
+        }
     return markets
 
 # ============== MATCHING LOGIC ==============
@@ -235,8 +218,6 @@ def show_known_opportunities():
     print("=" * 70)
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) > 1 and sys.argv[1] == "--known":
         show_known_opportunities()
     else:
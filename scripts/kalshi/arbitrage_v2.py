@@ -16,112 +16,88 @@ v2.1 changes (Grok recommendations):
 import os
 import sys
 import json
-import requests
+import time
 import statistics
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 sys.stdout.reconfigure(line_buffering=True)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import transport
+import logpipe
+import polymarket_sync
+import kalshi_api
+from keyword_index import TitleIndex, TokenIndex
+from econ_titles import EconIndex, describe
+from pair_table import PairTable
+from title_ann import pair_titles
+
 LOG_DIR = PROJECT_ROOT / "logs" / "kalshi"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
+# Run log: structured records written off the scan path (see logpipe.py);
+# console output only with --verbose / LOG_CONSOLE=1. Results still go to
+# arbitrage_v2.jsonl.
+log = logpipe.get_logger("arbitrage_v2", LOG_DIR / "arbitrage_v2-run.jsonl",
+                         console_format="%(message)s")
 
 ODDS_API_KEY = os.getenv("ODDS_API_KEY", "")
 FRED_API_KEY = os.getenv("FRED_API_KEY", "")
 MAX_DAYS = 60  # Only markets closing within this many days
 
+# Sources are fetched concurrently; each must land within its deadline
+# (seconds from scan start, capped by SCAN_BUDGET_SECONDS) or it is skipped.
+SCAN_BUDGET_SECONDS = float(os.getenv("SCAN_BUDGET_SECONDS", "90"))
+SOURCE_DEADLINES = {
+    "kalshi": 90,
+    "polymarket": 30,
+    "predictit": 30,
+    "odds": 45,
+    "fred": 30,
+}
+
 # ============================================================
 #  DATA SOURCES
 # ============================================================
 
-def fetch_kalshi_short_term():
-    """Fetch Kalshi markets closing within MAX_DAYS, min volume 500."""
-    print("  📡 Kalshi...")
-    markets = {}
-    cursor = None
-    cutoff = (datetime.now(timezone.utc) + timedelta(days=MAX_DAYS)).isoformat()
-
-    for page in range(20):
-        params = {
-            "status": "open", "limit": 200,
-            "with_nested_markets": "true",
-        }
-        if cursor:
-            params["cursor"] = cursor
-        try:
-            r = requests.get(
-                "https://api.elections.kalshi.com/trade-api/v2/events",
-                params=params, timeout=15
-            )
-            data = r.json()
-        except Exception as e:
-            print(f"    ⚠️ page {page}: {e}")
-            break
-
-        for event in data.get("events", []):
-            cat = event.get("category", "")
-            for m in event.get("markets", []):
-                vol = m.get("volume", 0) or 0
-                close = m.get("close_time", "")
-                if vol < 500 or not close or close > cutoff:
-                    continue
-                markets[m["ticker"]] = {
-                    "ticker": m["ticker"],
-                    "title": m.get("title", ""),
-                    "category": cat,
-                    "yes_bid": m.get("yes_bid", 0) or 0,
-                    "yes_ask": m.get("yes_ask", 0) or 0,
-                    "no_bid": m.get("no_bid", 0) or 0,
-                    "no_ask": m.get("no_ask", 0) or 0,
-                    "last_price": m.get("last_price", 0) or 0,
-                    "volume": vol,
-                    "close_time": close,
-                }
-
-        cursor = data.get("cursor")
-        if not cursor:
-            break
-
-    print(f"    ✅ {len(markets)} short-term markets (<{MAX_DAYS}d, vol≥500)")
-    return markets
+def fetch_kalshi_short_term(max_age=None):
+    """Kalshi markets closing within MAX_DAYS, min volume 500, as a MarketStore
+    — the short-term universe snapshot shared with monitor.py (see
+    kalshi_api.short_term_markets)."""
+    log.info("  📡 Kalshi...")
+    store = kalshi_api.short_term_markets(max_age, log=log.info)
+    return store.select(store.closing_within(MAX_DAYS) & (store.volume >= 500))
 
 
 def fetch_polymarket():
-    """Fetch Polymarket — returns dict keyed by normalized question."""
-    print("  📡 Polymarket...")
+    """Fetch Polymarket (every open market, incremental sync) — returns dict
+    keyed by normalized question."""
+    log.info("  📡 Polymarket...")
     markets = {}
     try:
-        r = requests.get(
-            "https://gamma-api.polymarket.com/markets",
-            params={"closed": "false", "limit": 200}, timeout=15
-        )
-        for m in r.json():
-            q = m.get("question", "")
-            prices = m.get("outcomePrices", "[]")
-            if isinstance(prices, str):
-                prices = json.loads(prices)
-            if len(prices) < 2:
-                continue
-            yes = round(float(prices[0]) * 100, 1)
-            markets[normalize(q)] = {
-                "title": q,
+        for m in polymarket_sync.open_markets(timeout=15, log=log.info):
+            yes = round(m["yes"], 1)
+            markets[normalize(m["title"])] = {
+                "title": m["title"],
                 "yes": yes,
                 "no": round(100 - yes, 1),
                 "source": "polymarket",
             }
-        print(f"    ✅ {len(markets)} markets")
+        log.info(f"    ✅ {len(markets)} markets")
     except Exception as e:
-        print(f"    ⚠️ {e}")
+        log.warning(f"    ⚠️ {e}")
     return markets
 
 
 def fetch_predictit():
     """Fetch PredictIt — returns dict keyed by normalized contract name."""
-    print("  📡 PredictIt...")
+    log.info("  📡 PredictIt...")
     markets = {}
     try:
-        r = requests.get("https://www.predictit.org/api/marketdata/all/", timeout=15)
+        r = transport.get("https://www.predictit.org/api/marketdata/all/", timeout=15)
         for m in r.json().get("markets", []):
             mname = m.get("name", "")
             for c in m.get("contracts", []):
@@ -136,9 +112,9 @@ def fetch_predictit():
                     "no": round((1 - price) * 100, 1),
                     "source": "predictit",
                 }
-        print(f"    ✅ {len(markets)} contracts")
+        log.info(f"    ✅ {len(markets)} contracts")
     except Exception as e:
-        print(f"    ⚠️ {e}")
+        log.warning(f"    ⚠️ {e}")
     return markets
 
 
@@ -147,12 +123,12 @@ def fetch_sports_odds():
     v2.1: Average across ALL bookmakers for consensus probability.
     Flag any >5% gap vs Kalshi for arbitrage."""
     if not ODDS_API_KEY:
-        print("  ⏭️  Odds API: no key (https://the-odds-api.com)")
+        log.info("  ⏭️  Odds API: no key (https://the-odds-api.com)")
         return {}
-    print("  📡 Sports odds...")
+    log.info("  📡 Sports odds...")
     markets = {}
     try:
-        sports = requests.get(
+        sports = transport.get(
             "https://api.the-odds-api.com/v4/sports/",
             params={"apiKey": ODDS_API_KEY}, timeout=15
         ).json()
@@ -160,7 +136,7 @@ def fetch_sports_odds():
                    and any(k in s["key"] for k in ["nfl", "nba", "mlb", "nhl", "mma"])]
 
         for sport in targets[:5]:
-            resp = requests.get(
+            resp = transport.get(
                 f"https://api.the-odds-api.com/v4/sports/{sport}/odds/",
                 params={"apiKey": ODDS_API_KEY, "regions": "us",
                         "markets": "h2h", "oddsFormat": "american"},
@@ -211,12 +187,21 @@ def fetch_sports_odds():
                             "game_time": game_time,
                         }
 
-        print(f"    ✅ {len(markets)} team/game lines (multi-book consensus)")
+        log.info(f"    ✅ {len(markets)} team/game lines (multi-book consensus)")
     except Exception as e:
-        print(f"    ⚠️ {e}")
+        log.warning(f"    ⚠️ {e}")
     return markets
 
 
+ODDS_STOPWORDS = {"win", "the", "to", "a", "in", "of", "at", "vs"}
+TITLE_STOPWORDS = ODDS_STOPWORDS | {"will"}
+
+
+def build_odds_index(odds):
+    """Team/entity word index over the odds keys (dict order preserved)."""
+    return TokenIndex((key, set(key.split()) - ODDS_STOPWORDS) for key in odds)
+
+
 def american_to_prob(odds):
     """Convert American odds to implied probability %.
     +150 → 40%, -200 → 66.7%, etc."""
@@ -229,9 +214,9 @@ def fetch_fred_econ():
     """Fetch key economic data from FRED for CPI/Fed rate context.
     Now includes 12-month CPI history for probability distribution model."""
     if not FRED_API_KEY:
-        print("  ⏭️  FRED: no key (https://fred.stlouisfed.org)")
+        log.info("  ⏭️  FRED: no key (https://fred.stlouisfed.org)")
         return {}
-    print("  📡 FRED economic data...")
+    log.info("  📡 FRED economic data...")
     data = {}
     series = {
         "DFEDTARU": "fed_rate_upper",      # Fed Funds upper target
@@ -244,7 +229,7 @@ def fetch_fred_econ():
         try:
             # Fetch more observations for CPI to build distribution
             limit = 14 if sid == "CPIAUCSL" else 3
-            r = requests.get(
+            r = transport.get(
                 "https://api.stlouisfed.org/fred/series/observations",
                 params={"series_id": sid, "api_key": FRED_API_KEY,
                         "file_type": "json", "limit": limit, "sort_order": "desc"},
@@ -270,7 +255,7 @@ def fetch_fred_econ():
 
     # Fetch GDP growth rate (quarterly, annualized)
     try:
-        r = requests.get(
+        r = transport.get(
             "https://api.stlouisfed.org/fred/series/observations",
             params={"series_id": "A191RL1Q225SBEA", "api_key": FRED_API_KEY,
                     "file_type": "json", "limit": 4, "sort_order": "desc"},
@@ -286,15 +271,15 @@ def fetch_fred_econ():
         pass
 
     if data:
-        print(f"    ✅ Fed rate: {data.get('fed_rate_lower','?')}-{data.get('fed_rate_upper','?')}%")
+        log.info(f"    ✅ Fed rate: {data.get('fed_rate_lower','?')}-{data.get('fed_rate_upper','?')}%")
         if "cpi_mom" in data:
-            print(f"    ✅ CPI MoM: {data['cpi_mom']}% (mean: {data.get('cpi_mom_mean','?')}%, stdev: {data.get('cpi_mom_stdev','?')}%)")
+            log.info(f"    ✅ CPI MoM: {data['cpi_mom']}% (mean: {data.get('cpi_mom_mean','?')}%, stdev: {data.get('cpi_mom_stdev','?')}%)")
         if "unemployment" in data:
-            print(f"    ✅ Unemployment: {data['unemployment']}%")
+            log.info(f"    ✅ Unemployment: {data['unemployment']}%")
         if "gdp_growth" in data:
-            print(f"    ✅ GDP growth: {data['gdp_growth']}% (annualized)")
+            log.info(f"    ✅ GDP growth: {data['gdp_growth']}% (annualized)")
         if data.get("cpi_mom_history"):
-            print(f"    📊 CPI MoM last {len(data['cpi_mom_history'])} months: {data['cpi_mom_history']}")
+            log.info(f"    📊 CPI MoM last {len(data['cpi_mom_history'])} months: {data['cpi_mom_history']}")
     return data
 
 
@@ -402,6 +387,49 @@ def get_catalyst_calendar():
     return catalysts
 
 
+def fetch_all_sources():
+    """
+    Fetch every source at once. Returns (results, status) where results maps
+    source → data ({} if it failed or missed its deadline) and status maps
+    source → "ok" | "empty" | "late" | "error" | "disabled" (no API key).
+    """
+    fetchers = {
+        "kalshi": fetch_kalshi_short_term,
+        "polymarket": fetch_polymarket,
+        "predictit": fetch_predictit,
+        "odds": fetch_sports_odds,
+        "fred": fetch_fred_econ,
+    }
+    results, status = {}, {}
+    for name, has_key in (("odds", ODDS_API_KEY), ("fred", FRED_API_KEY)):
+        if not has_key:
+            fetchers[name]()  # logs the "no key" hint
+            del fetchers[name]
+            results[name], status[name] = {}, "disabled"
+
+    start = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="source")
+    futures = {name: pool.submit(fn) for name, fn in fetchers.items()}
+
+    for name, future in futures.items():
+        deadline = min(SOURCE_DEADLINES.get(name, SCAN_BUDGET_SECONDS), SCAN_BUDGET_SECONDS)
+        try:
+            results[name] = future.result(timeout=max(0, deadline - (time.monotonic() - start)))
+            status[name] = "ok" if results[name] else "empty"
+        except FutureTimeout:
+            results[name] = {}
+            status[name] = "late"
+            log.info(f"  ⏱️ {name}: missed {deadline:.0f}s deadline — matching without it")
+        except Exception as e:
+            results[name] = {}
+            status[name] = "error"
+            log.warning(f"  ⚠️ {name}: {e}")
+
+    # Don't hold the scan for stragglers
+    pool.shutdown(wait=False, cancel_futures=True)
+    return results, status
+
+
 # ============================================================
 #  STRICT MATCHING — keyword pairs only, no fuzzy
 # ============================================================
@@ -414,23 +442,9 @@ def normalize(s):
 
 # Each entry: name, kalshi keywords, external keywords (checked against ALL sources)
 MATCH_RULES = [
-    # ---- CPI Monthly Ranges (Grok rec: specific thresholds) ----
-    ("CPI > 0.0% Jan 2026",   ["cpi", "0.0", "january", "2026"],     ["cpi", "january"]),
-    ("CPI > 0.1% Jan 2026",   ["cpi", "0.1", "january", "2026"],     ["cpi", "0.1"]),
-    ("CPI > 0.2% Jan 2026",   ["cpi", "0.2", "january", "2026"],     ["cpi", "0.2"]),
-    ("CPI > 0.3% Jan 2026",   ["cpi", "0.3", "january", "2026"],     ["cpi", "0.3"]),
-    ("CPI > 0.4% Jan 2026",   ["cpi", "0.4", "january", "2026"],     ["cpi", "0.4"]),
-    ("CPI > 0.0% Feb 2026",   ["cpi", "0.0", "february", "2026"],    ["cpi", "february"]),
-    ("CPI > 0.1% Feb 2026",   ["cpi", "0.1", "february", "2026"],    ["cpi", "0.1"]),
-    ("CPI > 0.2% Feb 2026",   ["cpi", "0.2", "february", "2026"],    ["cpi", "0.2"]),
-    ("CPI > 0.3% Feb 2026",   ["cpi", "0.3", "february", "2026"],    ["cpi", "0.3"]),
-    ("CPI > 0.4% Feb 2026",   ["cpi", "0.4", "february", "2026"],    ["cpi", "0.4"]),
-    # Generic CPI (any month)
-    ("CPI > 0.0%",            ["cpi", "0.0"],                        ["cpi", "inflation"]),
-    ("CPI > 0.1%",            ["cpi", "0.1"],                        ["cpi", "inflation"]),
-    ("CPI > 0.2%",            ["cpi", "0.2"],                        ["cpi", "inflation"]),
-    ("CPI > 0.3%",            ["cpi", "0.3"],                        ["cpi", "inflation"]),
-    ("CPI > 0.4%",            ["cpi", "0.4"],                        ["cpi", "inflation"]),
+    # ---- CPI ----
+    # Threshold markets (CPI/unemployment/GDP/inflation above X% in a period)
+    # are generated from parsed titles in match_strict — see econ_titles.py
     ("CPI YoY",               ["cpi", "year"],                       ["cpi", "year"]),
 
     # ---- Fed Rate Decisions (Grok rec: hold/cut/hike) ----
@@ -447,23 +461,14 @@ MATCH_RULES = [
 
     # ---- Economics (expanded) ----
     ("Recession 2026",         ["recession", "2026"],                 ["recession"]),
-    ("GDP Growth > 0%",        ["gdp", "growth", "0"],               ["gdp", "growth"]),
-    ("GDP Growth > 1%",        ["gdp", "growth", "1"],               ["gdp", "growth"]),
-    ("GDP Growth > 2%",        ["gdp", "growth", "2"],               ["gdp", "growth"]),
-    ("GDP Growth > 3%",        ["gdp", "growth", "3"],               ["gdp", "growth"]),
     ("GDP Growth Q1",          ["gdp", "q1"],                        ["gdp", "quarter"]),
     ("GDP Growth Q2",          ["gdp", "q2"],                        ["gdp", "quarter"]),
     ("GDP Negative",           ["gdp", "negative"],                  ["gdp", "contraction"]),
     ("Jobs Report",            ["jobs", "report"],                    ["jobs", "nonfarm"]),
     ("Nonfarm Payrolls",       ["nonfarm", "payroll"],                ["nonfarm", "payroll"]),
-    ("Unemployment > 4.0%",    ["unemployment", "4.0"],               ["unemployment"]),
-    ("Unemployment > 4.5%",    ["unemployment", "4.5"],               ["unemployment"]),
-    ("Unemployment > 5.0%",    ["unemployment", "5.0"],               ["unemployment"]),
     ("Unemployment Rate",      ["unemployment", "rate"],              ["unemployment", "rate"]),
     ("Jobless Claims",         ["jobless", "claims"],                 ["jobless", "claims"]),
     ("Powell Leaves",          ["powell", "leave"],                   ["powell", "resign"]),
-    ("Inflation > 3%",         ["inflation", "3"],                    ["inflation"]),
-    ("Inflation > 4%",         ["inflation", "4"],                    ["inflation"]),
 
     # ---- Politics ----
     ("Trump Ends Fed",         ["trump", "end", "federal reserve"],   ["trump", "federal reserve"]),
@@ -546,208 +551,293 @@ MATCH_RULES = [
 ]
 
 
-def match_strict(kalshi, externals):
-    """Only match on explicit keyword rules. No fuzzy."""
+def days_until_close(m):
+    """Whole days until a Kalshi market closes ("?" if unknown)."""
+    ts = m.get("close_ts")
+    if ts is None or ts != ts:
+        return "?"
+    return max(0, int((ts - time.time()) // 86400))
+
+
+def kalshi_title_index(kalshi):
+    """Keyword index over Kalshi titles (build once per snapshot)."""
+    return TitleIndex((ticker, m["title"]) for ticker, m in kalshi.items())
+
+
+def kalshi_econ_index(kalshi):
+    """Parsed economic threshold markets (build once per snapshot)."""
+    return EconIndex((ticker, m["title"]) for ticker, m in kalshi.items())
+
+
+def match_strict(kalshi, externals, kalshi_index=None, econ_index=None, pairs=None, stale=()):
+    """Only match on explicit keyword rules. No fuzzy.
+    `externals` is {source name: markets}; when several sources match a
+    rule, the last one wins.
+    With `pairs` (a PairTable) keyword rules are resolved incrementally —
+    only new/retitled markets are re-matched and only moved quotes
+    re-priced; sources in `stale` (late/failed this run) keep their cached
+    pairs. Otherwise titles are indexed once per call (or pass
+    kalshi_index), so each rule costs a posting-set intersection rather than
+    a pass over every title. Economic threshold markets (CPI, unemployment,
+    GDP, inflation) are matched on parsed terms instead of MATCH_RULES — one
+    rule per distinct (indicator, comparator, threshold, period) in the
+    snapshot."""
     results = []
+    if econ_index is None:
+        econ_index = kalshi_econ_index(kalshi)
+    sources = list(externals.values())
+    ext_econ = [(source_markets, EconIndex((key, ext.get("title", key))
+                                           for key, ext in source_markets.items()))
+                for source_markets in sources]
+
+    if pairs is not None:
+        opps, stats = pairs.match(kalshi, externals, MATCH_RULES, strict_opportunity, stale=stale)
+        for opp in opps:  # reused pairs keep their price; days left moves on
+            opp["days_left"] = days_until_close(kalshi[opp["kalshi_ticker"]])
+        results.extend(opps)
+        log.info(f"  ♻️ Incremental match: {stats['changed']} new/retitled, {stats['removed']} gone, "
+                 f"{stats['rematched']} rules re-matched, {stats['repriced']} pairs re-priced")
+    else:
+        if kalshi_index is None:
+            kalshi_index = kalshi_title_index(kalshi)
+        ext_indexes = [(source_markets, TitleIndex((key, ext.get("title", key))
+                                                   for key, ext in source_markets.items()))
+                       for source_markets in sources]
+
+        for name, k_kw, e_kw in MATCH_RULES:
+            # Find Kalshi market (first in snapshot order)
+            ticker = kalshi_index.first(k_kw)
+            if ticker is None:
+                continue
 
-    for name, k_kw, e_kw in MATCH_RULES:
-        # Find Kalshi market
-        k_match = None
-        for ticker, m in kalshi.items():
-            title = m["title"].lower()
-            if all(kw.lower() in title for kw in k_kw):
-                k_match = m
+            # External match: each source's first match, the last source that
+            # has one wins
+            best_ext = None
+            for source_markets, index in reversed(ext_indexes):
+                key = index.first(e_kw)
+                if key is not None:
+                    best_ext = source_markets[key]
+                    break
+
+            opp = strict_opportunity(name, kalshi[ticker], best_ext)
+            if opp:
+                results.append(opp)
+
+    # Generated economic rules: same indicator/comparator/threshold, and the
+    # same period when the Kalshi market names one
+    for terms, ticker in econ_index.rules():
+        best_ext = None
+        for source_markets, index in reversed(ext_econ):
+            keys = index.lookup(*terms)
+            if keys:
+                best_ext = source_markets[keys[0]]
                 break
 
-        if not k_match:
-            continue
+        opp = strict_opportunity(describe(terms), kalshi[ticker], best_ext)
+        if opp:
+            results.append(opp)
 
-        # Find best external match across all sources
-        best_ext = None
-        for source_markets in externals:
-            for key, ext in source_markets.items():
-                ext_title = ext.get("title", key).lower()
-                if all(kw.lower() in ext_title for kw in e_kw):
-                    if best_ext is None or abs(ext["yes"] - 50) < abs(best_ext["yes"] - 50):
-                        # Prefer the match with the most decisive opinion (furthest from 50/50)
-                        pass
-                    best_ext = ext
-                    break  # Take first match from this source
-
-        if not best_ext:
-            continue
+    results.sort(key=lambda x: -x["spread"])
+    return results
 
-        # Calculate spread
-        k_yes = k_match.get("yes_bid", 0) or k_match.get("last_price", 0)
-        k_no = k_match.get("no_bid", 0) or (100 - k_yes)
-        e_yes = best_ext["yes"]
-        spread = abs(k_yes - e_yes)
 
-        if spread < 3:
-            continue
+def strict_opportunity(name, k_match, best_ext):
+    """Opportunity dict for a matched Kalshi/external pair, or None if the
+    spread is too small."""
+    if not best_ext:
+        return None
+
+    # Calculate spread
+    k_yes = k_match.get("yes_bid", 0) or k_match.get("last_price", 0)
+    k_no = k_match.get("no_bid", 0) or (100 - k_yes)
+    e_yes = best_ext["yes"]
+    spread = abs(k_yes - e_yes)
+
+    if spread < 3:
+        return None
+
+    # Determine trade
+    if k_yes > e_yes + 3:
+        trade = f"BUY NO @ {k_no}¢"
+        edge = k_yes - e_yes
+        cost = k_no
+    elif e_yes > k_yes + 3:
+        trade = f"BUY YES @ {k_yes}¢"
+        edge = e_yes - k_yes
+        cost = k_yes
+    else:
+        return None
+
+    roi = round(edge / cost * 100, 1) if cost > 0 else 0
+
+    return {
+        "name": name,
+        "kalshi_ticker": k_match["ticker"],
+        "kalshi_title": k_match["title"],
+        "kalshi_yes": k_yes,
+        "kalshi_no": k_no,
+        "external_yes": e_yes,
+        "external_source": best_ext["source"],
+        "spread": round(spread, 1),
+        "edge": round(edge, 1),
+        "roi": roi,
+        "trade": trade,
+        "volume": k_match.get("volume", 0),
+        "days_left": days_until_close(k_match),
+    }
 
-        # Determine trade
-        if k_yes > e_yes + 3:
-            trade = f"BUY NO @ {k_no}¢"
-            edge = k_yes - e_yes
-            cost = k_no
-        elif e_yes > k_yes + 3:
-            trade = f"BUY YES @ {k_yes}¢"
-            edge = e_yes - k_yes
-            cost = k_yes
-        else:
-            continue
 
-        roi = round(edge / cost * 100, 1) if cost > 0 else 0
-
-        # Days until close
-        close_str = k_match.get("close_time", "")
-        days_left = "?"
-        if close_str:
-            try:
-                close_dt = datetime.fromisoformat(close_str.replace("Z", "+00:00"))
-                days_left = max(0, (close_dt - datetime.now(timezone.utc)).days)
-            except:
-                pass
-
-        results.append({
-            "name": name,
-            "kalshi_title": k_match["title"],
+def similar_pairs(kalshi, externals, matched=()):
+    """Kalshi ↔ Polymarket/PredictIt pairs found by title similarity
+    (title_ann: nearest-neighbour retrieval, then strict confirmation) for
+    Kalshi markets no keyword rule already paired. Reported only — these
+    never become opportunities."""
+    ext_titles = {}
+    for source, markets in externals.items():
+        if source == "odds":  # keyed by team names, not market titles
+            continue
+        for key, ext in markets.items():
+            ext_titles[(source, key)] = ext.get("title", key)
+    kalshi_titles = {ticker: m["title"] for ticker, m in kalshi.items() if ticker not in matched}
+
+    found = []
+    for ticker, (source, key), sim in pair_titles(kalshi_titles, ext_titles):
+        m, ext = kalshi[ticker], externals[source][key]
+        k_yes = m.get("yes_bid", 0) or m.get("last_price", 0)
+        found.append({
+            "kalshi_ticker": ticker,
+            "kalshi_title": m["title"],
             "kalshi_yes": k_yes,
-            "kalshi_no": k_no,
-            "external_yes": e_yes,
-            "external_source": best_ext["source"],
-            "spread": round(spread, 1),
-            "edge": round(edge, 1),
-            "roi": roi,
-            "trade": trade,
-            "volume": k_match.get("volume", 0),
-            "days_left": days_left,
+            "external_title": ext.get("title", key),
+            "external_yes": ext["yes"],
+            "external_source": ext["source"],
+            "similarity": round(sim, 3),
+            "spread": round(abs(k_yes - ext["yes"]), 1),
         })
+    found.sort(key=lambda x: -x["spread"])
+    return found
 
-    results.sort(key=lambda x: -x["spread"])
-    return results
+
+# Title → ticker index of the last Kalshi snapshot (see ticker_for_title)
+TITLE_INDEX = {}
+
+
+def build_title_index(kalshi):
+    """Map each Kalshi title to its ticker (first ticker wins on duplicates)."""
+    index = {}
+    for ticker, m in kalshi.items():
+        index.setdefault(m["title"], ticker)
+    return index
+
+
+def ticker_for_title(title):
+    """Resolve a Kalshi title from the last scan to its ticker — no network."""
+    return TITLE_INDEX.get(title)
 
 
 # ============================================================
 #  MAIN
 # ============================================================
 
-def run():
-    print("=" * 65)
-    print("🔍 KALSHI ARBITRAGE SCANNER v2.1 — Short-Term, Strict Match")
-    print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"📅 Markets closing within {MAX_DAYS} days | Vol ≥ 500")
-    print("=" * 65)
-    print()
+def run(full_match=False):
+    """One scan. Keyword rules are matched incrementally against the pair
+    table in logs/kalshi/pairs.db unless full_match is set."""
+    log.info(f"🔍 KALSHI ARBITRAGE SCANNER v2.1 — markets closing within {MAX_DAYS} days, vol ≥ 500",
+             extra={"fields": {"max_days": MAX_DAYS, "full_match": full_match}})
 
     # Check catalyst calendar first
-    print("📅 Checking catalyst calendar...")
+    log.info("📅 Checking catalyst calendar...")
     catalysts = get_catalyst_calendar()
     if catalysts:
         for c in catalysts:
-            print(f"  {c['note']}")
+            log.info(f"  {c['note']}")
     else:
-        print("  No catalysts within 48 hours.")
-    print()
-
-    print("📡 Fetching sources...")
-    kalshi = fetch_kalshi_short_term()
-    poly = fetch_polymarket()
-    pi = fetch_predictit()
-    odds = fetch_sports_odds()
-    econ = fetch_fred_econ()
-    print()
-
-    externals = [poly, pi]
+        log.info("  No catalysts within 48 hours.")
+
+    log.info("📡 Fetching sources (concurrent)...")
+    sources, source_status = fetch_all_sources()
+    kalshi = sources["kalshi"]
+    poly = sources["polymarket"]
+    pi = sources["predictit"]
+    odds = sources["odds"]
+    econ = sources["fred"]
+    TITLE_INDEX.clear()
+    TITLE_INDEX.update(build_title_index(kalshi))
+    late = [name for name, st in source_status.items() if st == "late"]
+    missing = [name for name, st in source_status.items() if st in ("empty", "error")]
+
+    externals = {"polymarket": poly, "predictit": pi}
     if odds:
-        externals.append(odds)
+        externals["odds"] = odds
 
-    opps = match_strict(kalshi, externals)
+    econ_index = kalshi_econ_index(kalshi)
+    opps = match_strict(kalshi, externals, econ_index=econ_index,
+                        pairs=None if full_match else PairTable(), stale=late + missing)
+    similar = similar_pairs(kalshi, externals, {o["kalshi_ticker"] for o in opps})
 
     # === CPI PROBABILITY MODEL (Grok rec) ===
     cpi_model = {}
     if econ:
         cpi_model = build_cpi_probability_model(econ)
         if cpi_model:
-            print("📊 CPI Probability Model (FRED-based):")
+            log.info("📊 CPI Probability Model (FRED-based):")
             for thresh_key, model_prob in sorted(cpi_model.items()):
                 thresh = thresh_key.replace("cpi_gt_", ">")
-                print(f"    CPI MoM {thresh}%: {model_prob:.1f}% probability (model)")
+                log.info(f"    CPI MoM {thresh}%: {model_prob:.1f}% probability (model)")
 
             # Compare CPI model vs Kalshi CPI market prices
-            print()
-            print("🔬 CPI Model vs Kalshi prices:")
+            log.info("🔬 CPI Model vs Kalshi prices:")
             cpi_arb_found = False
-            seen_cpi_tickers = set()  # Avoid duplicate matches
-            for ticker, m in kalshi.items():
-                title_lower = m["title"].lower()
-                if "cpi" not in title_lower:
+            # Each CPI "> X%" market is parsed once; its threshold keys the model
+            model_by_threshold = {float(k.replace("cpi_gt_", "")): p for k, p in cpi_model.items()}
+            for ticker in econ_index.lookup("cpi", ">"):
+                model_prob = model_by_threshold.get(econ_index.terms[ticker].threshold)
+                if model_prob is None:
                     continue
-                if ticker in seen_cpi_tickers:
+                m = kalshi[ticker]
+                kalshi_yes = m.get("yes_bid", 0) or m.get("last_price", 0)
+                if kalshi_yes <= 0:
                     continue
-                for thresh_key, model_prob in cpi_model.items():
-                    thresh_val = thresh_key.replace("cpi_gt_", "")
-                    # More precise matching: look for the exact threshold with context
-                    # e.g., "more than 0.2%" or "above 0.2%" — but NOT "-0.2%"
-                    import re
-                    # Match "more than X%" or "above X%" where X is our threshold (not negative)
-                    pattern = rf'(?:more than|above|greater than|over)\s+{re.escape(thresh_val)}%'
-                    if not re.search(pattern, title_lower):
-                        continue
-                    if ticker in seen_cpi_tickers:
-                        break
-                    seen_cpi_tickers.add(ticker)
-                    kalshi_yes = m.get("yes_bid", 0) or m.get("last_price", 0)
-                    if kalshi_yes <= 0:
-                        continue
-                    gap = abs(model_prob - kalshi_yes)
-                    if gap <= 5:
-                        continue
-                    cpi_arb_found = True
-                    direction = "UNDERPRICED" if model_prob > kalshi_yes else "OVERPRICED"
-                    print(f"    ⚡ {m['title']}")
-                    print(f"       Kalshi: {kalshi_yes}¢ | Model: {model_prob:.1f}% | Gap: {gap:.1f} pts → {direction}")
-                    # Determine trade direction
-                    if model_prob > kalshi_yes + 5:
-                        trade = f"BUY YES @ {kalshi_yes}¢"
-                        edge = model_prob - kalshi_yes
-                        cost = kalshi_yes
-                    elif kalshi_yes > model_prob + 5:
-                        k_no = m.get("no_bid", 0) or (100 - kalshi_yes)
-                        trade = f"BUY NO @ {k_no}¢"
-                        edge = kalshi_yes - model_prob
-                        cost = k_no
-                    else:
-                        continue
-                    roi = round(edge / cost * 100, 1) if cost > 0 else 0
-                    close_str = m.get("close_time", "")
-                    days_left = "?"
-                    if close_str:
-                        try:
-                            close_dt = datetime.fromisoformat(close_str.replace("Z", "+00:00"))
-                            days_left = max(0, (close_dt - datetime.now(timezone.utc)).days)
-                        except:
-                            pass
-                    opps.append({
-                        "name": f"CPI Model: {m['title'][:50]}",
-                        "kalshi_title": m["title"],
-                        "kalshi_yes": kalshi_yes,
-                        "kalshi_no": m.get("no_bid", 0) or (100 - kalshi_yes),
-                        "external_yes": round(model_prob, 1),
-                        "external_source": "FRED CPI model",
-                        "spread": round(gap, 1),
-                        "edge": round(edge, 1),
-                        "roi": roi,
-                        "trade": trade,
-                        "volume": m.get("volume", 0),
-                        "days_left": days_left,
-                        "fred_note": f"Model: {model_prob:.1f}% (mean MoM: {econ.get('cpi_mom_mean','?')}%, stdev: {econ.get('cpi_mom_stdev','?')}%)",
-                    })
-                    break  # One model match per CPI market
+                gap = abs(model_prob - kalshi_yes)
+                if gap <= 5:
+                    continue
+                cpi_arb_found = True
+                direction = "UNDERPRICED" if model_prob > kalshi_yes else "OVERPRICED"
+                log.info(f"    ⚡ {m['title']} — Kalshi {kalshi_yes}¢ vs model {model_prob:.1f}% → {direction}",
+                         extra={"fields": {"ticker": ticker, "kalshi_yes": kalshi_yes,
+                                           "model_prob": round(model_prob, 1), "gap": round(gap, 1)}})
+                # Determine trade direction
+                if model_prob > kalshi_yes + 5:
+                    trade = f"BUY YES @ {kalshi_yes}¢"
+                    edge = model_prob - kalshi_yes
+                    cost = kalshi_yes
+                elif kalshi_yes > model_prob + 5:
+                    k_no = m.get("no_bid", 0) or (100 - kalshi_yes)
+                    trade = f"BUY NO @ {k_no}¢"
+                    edge = kalshi_yes - model_prob
+                    cost = k_no
+                else:
+                    continue
+                roi = round(edge / cost * 100, 1) if cost > 0 else 0
+                days_left = days_until_close(m)
+                opps.append({
+                    "name": f"CPI Model: {m['title'][:50]}",
+                    "kalshi_ticker": ticker,
+                    "kalshi_title": m["title"],
+                    "kalshi_yes": kalshi_yes,
+                    "kalshi_no": m.get("no_bid", 0) or (100 - kalshi_yes),
+                    "external_yes": round(model_prob, 1),
+                    "external_source": "FRED CPI model",
+                    "spread": round(gap, 1),
+                    "edge": round(edge, 1),
+                    "roi": roi,
+                    "trade": trade,
+                    "volume": m.get("volume", 0),
+                    "days_left": days_left,
+                    "fred_note": f"Model: {model_prob:.1f}% (mean MoM: {econ.get('cpi_mom_mean','?')}%, stdev: {econ.get('cpi_mom_stdev','?')}%)",
+                })
             if not cpi_arb_found:
-                print("    No CPI arbitrage opportunities (Kalshi aligned with model)")
-            print()
+                log.info("    No CPI arbitrage opportunities (Kalshi aligned with model)")
 
     # Add FRED context to economic opportunities
     if econ:
@@ -778,11 +868,12 @@ def run():
 
     # === SPORTS ODDS GAP DETECTION (Grok rec: flag >5% gap) ===
     if odds:
-        print("🏈 Sports odds gap detection (>5% vs Kalshi):")
+        log.info("🏈 Sports odds gap detection (>5% vs Kalshi):")
         sports_gaps_found = False
         # Only compare Kalshi markets that are actual game outcomes
         # (must contain "win" or "winner" — filter out prop bets, announcer markets, etc.)
         game_keywords = ["win", "winner", "beat", "defeat", "champion"]
+        odds_index = build_odds_index(odds)
         for ticker, m in kalshi.items():
             title_lower = m["title"].lower()
             if not any(gk in title_lower for gk in game_keywords):
@@ -790,79 +881,81 @@ def run():
             kalshi_yes = m.get("yes_bid", 0) or m.get("last_price", 0)
             if kalshi_yes <= 0:
                 continue
-            for odds_key, odds_data in odds.items():
+            # Match by team name overlap (need at least 2 meaningful words in
+            # common) — only odds keys sharing 2+ title words are visited
+            title_words = set(normalize(m["title"]).split()) - TITLE_STOPWORDS
+            for odds_key in odds_index.overlapping(title_words, 2):
+                odds_data = odds[odds_key]
                 sports_prob = odds_data["yes"]
                 gap = abs(sports_prob - kalshi_yes)
-                # Match by team name overlap (need at least 2 meaningful words in common)
-                odds_words = set(odds_key.split()) - {"win", "the", "to", "a", "in", "of", "at", "vs"}
-                title_words = set(normalize(m["title"]).split()) - {"win", "the", "to", "a", "in", "of", "at", "vs", "will"}
-                common = odds_words & title_words
-                if len(common) >= 2 and gap > 5:
+                if gap > 5:
                     sports_gaps_found = True
                     direction = "Kalshi underpriced" if sports_prob > kalshi_yes else "Kalshi overpriced"
-                    print(f"    ⚡ {m['title'][:60]}")
-                    print(f"       Kalshi: {kalshi_yes}¢ | Sportsbooks: {sports_prob}% | Gap: {gap:.1f}% → {direction}")
                     books = odds_data.get("books_count", "?")
-                    print(f"       Source: consensus of {books} bookmakers")
+                    log.info(f"    ⚡ {m['title'][:60]} — Kalshi {kalshi_yes}¢ vs sportsbooks {sports_prob}% "
+                             f"({books} books) → {direction}",
+                             extra={"fields": {"ticker": ticker, "kalshi_yes": kalshi_yes,
+                                               "sports_prob": sports_prob, "gap": round(gap, 1)}})
                     break  # One match per Kalshi market
         if not sports_gaps_found:
-            print("    No significant sports gaps found (all <5%)")
-        print()
+            log.info("    No significant sports gaps found (all <5%)")
 
     # Re-sort all opportunities by spread
     opps.sort(key=lambda x: -x["spread"])
 
     if opps:
-        print(f"🚨 {len(opps)} OPPORTUNITIES FOUND")
-        print("-" * 65)
+        log.info(f"🚨 {len(opps)} OPPORTUNITIES FOUND")
         for i, o in enumerate(opps, 1):
             icon = "🔥" if o["spread"] > 15 else "📊"
             catalyst = " ⚡CATALYST" if o.get("catalyst_note") else ""
             model = " 🧮MODEL" if "model" in o.get("external_source", "").lower() else ""
-            print(f"\n  {icon} {i}. {o['name']}{catalyst}{model}")
-            print(f"     Kalshi:   YES {o['kalshi_yes']}¢ / NO {o['kalshi_no']}¢  (vol: {o['volume']:,})")
-            print(f"     External: YES {o['external_yes']}¢  ({o['external_source']})")
-            print(f"     Spread: {o['spread']} pts | ROI: {o['roi']}% | Days: {o['days_left']}")
-            print(f"     → {o['trade']}")
-            if o.get("fred_note"):
-                print(f"     📈 FRED: {o['fred_note']}")
-            if o.get("catalyst_note"):
-                print(f"     ⚡ {o['catalyst_note']}")
+            log.info(f"  {icon} {i}. {o['name']}{catalyst}{model} → {o['trade']}", extra={"fields": {
+                "ticker": o.get("kalshi_ticker"), "kalshi_yes": o["kalshi_yes"],
+                "external_yes": o["external_yes"], "source": o["external_source"],
+                "spread": o["spread"], "roi": o["roi"], "days": o["days_left"],
+                "fred": o.get("fred_note"), "catalyst": o.get("catalyst_note")}})
     else:
-        print("✅ No cross-platform discrepancies found.")
+        log.info("✅ No cross-platform discrepancies found.")
+
+    if similar:
+        log.info(f"🧭 {len(similar)} title-similarity pairs without a rule (report only, not traded)")
+        for p in similar[:10]:
+            log.info(f"  • {p['kalshi_title'][:55]} ↔ {p['external_title'][:55]}", extra={"fields": {
+                "ticker": p["kalshi_ticker"], "source": p["external_source"], "sim": p["similarity"],
+                "kalshi_yes": p["kalshi_yes"], "external_yes": p["external_yes"], "spread": p["spread"]}})
 
     # Summary
-    print()
-    print("=" * 65)
     src_count = sum(1 for s in [poly, pi, odds] if s)
-    print(f"  Sources: Kalshi + {src_count} external ({len(kalshi)} + {len(poly)} + {len(pi)} mkts)")
-    if econ:
-        print(f"  📈 FRED: Rate {econ.get('fed_rate_lower','?')}-{econ.get('fed_rate_upper','?')}% | CPI MoM {econ.get('cpi_mom','?')}% | Unemp {econ.get('unemployment','?')}%")
-        if "gdp_growth" in econ:
-            print(f"  📈 GDP: {econ['gdp_growth']}% (annualized)")
-    if cpi_model:
-        print(f"  🧮 CPI Model: {len(cpi_model)} thresholds evaluated")
-    if catalysts:
-        print(f"  ⚡ CATALYSTS: {len(catalysts)} events within 48h — HIGH OPPORTUNITY WINDOW")
-    missing = []
+    missing_keys = []
     if not ODDS_API_KEY:
-        missing.append("ODDS_API_KEY → https://the-odds-api.com (free 500/mo)")
+        missing_keys.append("ODDS_API_KEY")
     if not FRED_API_KEY:
-        missing.append("FRED_API_KEY → https://fred.stlouisfed.org (free)")
-    if missing:
-        print(f"  ⚙️  Optional keys for .env:")
-        for m in missing:
-            print(f"     • {m}")
-    print("=" * 65)
+        missing_keys.append("FRED_API_KEY")
+    log.info(f"📋 Sources: Kalshi + {src_count} external ({len(kalshi)} + {len(poly)} + {len(pi)} mkts), "
+             f"{len(opps)} opportunities", extra={"fields": {
+                 "kalshi": len(kalshi), "poly": len(poly), "pi": len(pi), "odds": len(odds),
+                 "cpi_model": len(cpi_model), "catalysts": len(catalysts), "late": late,
+                 "missing": missing, "missing_keys": missing_keys, "opps": len(opps)}})
+    if econ:
+        log.info(f"  📈 FRED: Rate {econ.get('fed_rate_lower','?')}-{econ.get('fed_rate_upper','?')}% | "
+                 f"CPI MoM {econ.get('cpi_mom','?')}% | Unemp {econ.get('unemployment','?')}% | "
+                 f"GDP {econ.get('gdp_growth','?')}%")
+    if catalysts:
+        log.info(f"  ⚡ CATALYSTS: {len(catalysts)} events within 48h — HIGH OPPORTUNITY WINDOW")
+    if late or missing:
+        log.warning(f"  ⚠️ Late: {', '.join(late) or '-'} | No data: {', '.join(missing) or '-'}")
 
     # Log
     log_entry = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "kalshi": len(kalshi), "poly": len(poly), "pi": len(pi),
         "odds": len(odds), "catalysts": len(catalysts),
+        "late": late, "missing": missing,
         "cpi_model": cpi_model,
         "opps": len(opps),
-        "details": [{k: v for k, v in o.items()} for o in opps]
+        "details": [{k: v for k, v in o.items()} for o in opps],
+        "similar_pairs": len(similar),
+        "similar_details": similar[:50],
     }
     with open(LOG_DIR / "arbitrage_v2.jsonl", "a") as f:
         f.write(json.dumps(log_entry) + "\n")
@@ -871,4 +964,12 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
+    import argparse
+    parser = argparse.ArgumentParser(description="Kalshi multi-source arbitrage scanner")
+    parser.add_argument("--full-match", action="store_true",
+                        help="Match every rule from scratch (ignore the pair table)")
+    parser.add_argument("--verbose", action="store_true", help="Also render log records on stderr")
+    parser.add_argument("--quiet", action="store_true", help="Log warnings and errors only")
+    args = parser.parse_args()
+    logpipe.set_mode(log, console=args.verbose, quiet=args.quiet or None, console_format="%(message)s")
+    run(full_match=args.full_match)
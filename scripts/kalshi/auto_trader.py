@@ -20,6 +20,7 @@ Risk Rules (updated per Grok recommendations):
 import os
 import sys
 import json
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -27,15 +28,22 @@ sys.stdout.reconfigure(line_buffering=True)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 sys.path.insert(0, str(Path(__file__).parent))
 
-from trade import get_client, get_balance, get_positions, place_order, get_market
-from arbitrage_v2 import run as run_scan
+import logpipe
+from trade import get_client, get_balance, get_positions, place_order, mark_to_market, side_bid
+from arbitrage_v2 import run as run_scan, ticker_for_title, log as scan_log
+from ledger import Ledger, STALE_DAYS
+from kalshi_api import get_quotes
+from ratelimit import SCHEDULER, PRIORITY_EXIT
 
 LOG_DIR = PROJECT_ROOT / "logs" / "kalshi"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
-TRADE_LOG = LOG_DIR / "auto_trades.jsonl"
-POSITION_TRACKER = LOG_DIR / "held_positions.json"
+TRADE_LOG = LOG_DIR / "auto_trades.jsonl"  # audit log; positions live in ledger.py
+# Run log: structured records written off the trading path (see logpipe.py);
+# console output only with --verbose / LOG_CONSOLE=1. The alert is printed.
+log = logpipe.get_logger("auto_trader", LOG_DIR / "auto_trader.jsonl", console_format="%(message)s")
 
 # ============== RISK RULES ==============
 CAPITAL = 100_00           # $100 in cents
@@ -53,80 +61,27 @@ MIN_CASH_TO_TRADE = 600    # Need at least $6 to attempt any trade ($5 buffer +
 STOP_LOSS_PCT = -0.15      # Exit if position value drops 15%
 TAKE_PROFIT_PCT = 0.20     # Exit if position value rises 20%
 
-
-def load_position_tracker():
-    """Load local position tracker — prevents re-buying same markets across runs."""
-    try:
-        return json.loads(POSITION_TRACKER.read_text())
-    except:
-        return {}
-
-def save_position_tracker(tracker):
-    """Save local position tracker."""
-    POSITION_TRACKER.write_text(json.dumps(tracker, indent=2))
-
-def track_position(ticker, trade_info):
-    """Add a ticker to the local position tracker."""
-    tracker = load_position_tracker()
-    if ticker not in tracker:
-        tracker[ticker] = {
-            "first_bought": trade_info.get("timestamp", datetime.now(timezone.utc).isoformat()),
-            "total_contracts": 0,
-            "total_cost_cents": 0,
-            "market_name": trade_info.get("name", ""),
-        }
-    tracker[ticker]["total_contracts"] += trade_info.get("count", 0)
-    tracker[ticker]["total_cost_cents"] += trade_info.get("total_cost", 0)
-    tracker[ticker]["last_bought"] = datetime.now(timezone.utc).isoformat()
-    save_position_tracker(tracker)
-
-def get_tracked_tickers():
-    """Get set of tickers we've already bought (local tracking)."""
-    tracker = load_position_tracker()
-    return set(tracker.keys())
-
-def clear_resolved_positions(tracker):
-    """Remove positions from tracker that have resolved (past their close date)."""
-    now = datetime.now(timezone.utc)
-    to_remove = []
-    for ticker, info in tracker.items():
-        # Extract date from ticker format like KXTRUMPVISITGREENLAND-26FEB01
-        # Keep positions for 7 days after last buy as safety buffer
-        last_bought = info.get("last_bought", info.get("first_bought", ""))
-        try:
-            lb = datetime.fromisoformat(last_bought.replace("Z", "+00:00"))
-            if (now - lb).days > 60:  # Remove after 60 days regardless
-                to_remove.append(ticker)
-        except:
-            pass
-    for t in to_remove:
-        del tracker[t]
-    return tracker
+# --watch-exits: checks run on local order books, so they can be frequent
+EXIT_WATCH_SECONDS = 5
+POSITION_REFRESH_SECONDS = 300  # re-read positions and resubscribe their books
 
 
-def check_stop_loss_take_profit(client, positions):
+def check_stop_loss_take_profit(client, positions, books=None, quotes=None, ledger=None):
     """
     Check existing positions for stop-loss (-15%) or take-profit (+20%) triggers.
+    Entry price is the ledger's average cost over every lot still held.
+    Prices come from `books` (a followed orderbook.BookSet, see watch_exits)
+    for tickers with a live book, with no network call; the rest from batched
+    quotes (a MarketStore, fetched in one get_quotes call if not passed in).
     Returns list of (position, action, reason) tuples for positions that should be exited.
     """
     exits = []
+    ledger = ledger or Ledger()
 
-    # Load trade log for entry prices
-    entry_prices = {}
-    if TRADE_LOG.exists():
-        with open(TRADE_LOG) as f:
-            for line in f:
-                try:
-                    t = json.loads(line.strip())
-                    ticker = t.get("ticker")
-                    if ticker:
-                        entry_prices[ticker] = {
-                            "price": t.get("price", 0),
-                            "side": t.get("side", "yes"),
-                            "count": t.get("count", 0),
-                        }
-                except:
-                    pass
+    if quotes is None:
+        need = [getattr(p, 'ticker', None) for p in positions if getattr(p, 'position', 0) != 0]
+        need = [t for t in need if not (books and books.get(t))]
+        quotes = get_quotes(need, log=log.warning) if need else {}
 
     for p in positions:
         ticker = getattr(p, 'ticker', None)
@@ -134,28 +89,27 @@ def check_stop_loss_take_profit(client, positions):
         if not ticker or pos_count == 0:
             continue
 
-        entry = entry_prices.get(ticker)
-        if not entry:
+        entry = ledger.entry(ticker)
+        if not entry or not entry["side"]:
             continue
 
-        entry_price = entry["price"]
+        entry_price = round(entry["avg_price"], 1)
         if entry_price <= 0:
             continue
 
-        # Get current market price
-        market = get_market(client, ticker)
-        if not market:
-            continue
-
-        # Determine current value based on our side
         side = entry["side"]
-        if side == "yes":
-            current_price = getattr(market, 'yes_bid', 0) or getattr(market, 'last_price', 0) or 0
+        book = books.get(ticker) if books else None
+        exit_liquidity = None
+
+        if book:
+            # Local book — no network call, and we can see depth
+            current_price = book.best_bid(side)
+            exit_liquidity = book.liquidity(side, current_price) if current_price else 0
         else:
-            current_price = getattr(market, 'no_bid', 0) or 0
-            if current_price == 0:
-                yes_price = getattr(market, 'yes_bid', 0) or getattr(market, 'last_price', 0) or 0
-                current_price = 100 - yes_price if yes_price > 0 else 0
+            market = quotes.get(ticker)
+            if not market:
+                continue
+            current_price = side_bid(market, side)
 
         if current_price <= 0:
             continue
@@ -171,6 +125,7 @@ def check_stop_loss_take_profit(client, positions):
                 "count": abs(pos_count),
                 "entry_price": entry_price,
                 "current_price": current_price,
+                "exit_liquidity": exit_liquidity,
                 "pnl_pct": round(pnl_pct * 100, 1),
                 "reason": f"Stop-loss triggered: {pnl_pct*100:.1f}% (threshold: {STOP_LOSS_PCT*100}%)"
             })
@@ -182,6 +137,7 @@ def check_stop_loss_take_profit(client, positions):
                 "count": abs(pos_count),
                 "entry_price": entry_price,
                 "current_price": current_price,
+                "exit_liquidity": exit_liquidity,
                 "pnl_pct": round(pnl_pct * 100, 1),
                 "reason": f"Take-profit triggered: +{pnl_pct*100:.1f}% (threshold: +{TAKE_PROFIT_PCT*100}%)"
             })
@@ -196,7 +152,8 @@ def execute_exit(client, exit_info):
     count = exit_info["count"]
     current_price = exit_info["current_price"]
 
-    print(f"  📤 Exiting: SELL {count} {side.upper()} @ {current_price}¢ on {ticker}")
+    log.info(f"  📤 Exiting: SELL {count} {side.upper()} @ {current_price}¢ on {ticker}",
+             extra={"fields": {"ticker": ticker, "side": side, "count": count, "price": current_price}})
 
     # To exit, we sell our side — place a sell order at current bid
     try:
@@ -213,13 +170,45 @@ def execute_exit(client, exit_info):
         else:
             order.no_price = current_price
 
-        response = client._portfolio_api.create_order(**order.model_dump(exclude_none=True))
+        with SCHEDULER.slot(PRIORITY_EXIT):
+            response = client._portfolio_api.create_order(**order.model_dump(exclude_none=True))
         return {"success": True, "response": str(response)[:200]}
     except Exception as e:
-        print(f"  ⚠️ Exit failed: {e}")
+        log.warning(f"  ⚠️ Exit failed: {e}")
         return {"success": False, "error": str(e)}
 
 
+def execute_exits(client, exits_needed, ledger):
+    """Execute exits from check_stop_loss_take_profit, recording each sale
+    in the ledger. Returns the exits made (trade-log records)."""
+    exits_made = []
+    for ex in exits_needed:
+        icon = "🔴" if ex["action"] == "STOP_LOSS" else "🟢"
+        log.info(f"  {icon} {ex['action']}: {ex['ticker']} — {ex['reason']}", extra={"fields": {
+            "ticker": ex["ticker"], "entry": ex["entry_price"], "now": ex["current_price"],
+            "pnl_pct": round(ex["pnl_pct"], 1), "liquidity": ex.get("exit_liquidity"),
+            "count": ex["count"]}})
+        result = execute_exit(client, ex)
+        if result.get("success"):
+            log.info(f"  ✅ EXIT EXECUTED for {ex['ticker']}", extra={"fields": {"ticker": ex["ticker"]}})
+            timestamp = datetime.now(timezone.utc).isoformat()
+            ledger.record_sell(ex["ticker"], ex["count"], ex["current_price"],
+                               timestamp=timestamp, action=ex["action"])
+            exits_made.append({
+                "timestamp": timestamp,
+                "ticker": ex["ticker"],
+                "action": ex["action"],
+                "side": ex["side"],
+                "count": ex["count"],
+                "entry_price": ex["entry_price"],
+                "exit_price": ex["current_price"],
+                "pnl_pct": ex["pnl_pct"],
+            })
+        else:
+            log.warning(f"  ⚠️ EXIT FAILED for {ex['ticker']}: {result.get('error')}")
+    return exits_made
+
+
 def check_risk_rules(opp, cash_cents, position_value_cents, num_positions=0):
     """Check if an opportunity passes all risk rules. Returns (pass, reason)."""
     
@@ -316,36 +305,9 @@ def calculate_order(opp, cash_cents):
 
 
 def find_ticker(client, opp):
-    """Find the Kalshi ticker for an opportunity."""
-    # The opportunity has kalshi_title — we need to find the ticker
-    kalshi_title = opp.get("kalshi_title", "")
-    
-    # Search Kalshi markets
-    import requests
-    cursor = None
-    for page in range(15):
-        params = {"status": "open", "limit": 200, "with_nested_markets": "true"}
-        if cursor:
-            params["cursor"] = cursor
-        try:
-            r = requests.get(
-                "https://api.elections.kalshi.com/trade-api/v2/events",
-                params=params, timeout=15
-            )
-            data = r.json()
-        except:
-            break
-        
-        for event in data.get("events", []):
-            for m in event.get("markets", []):
-                if m.get("title", "") == kalshi_title:
-                    return m.get("ticker")
-        
-        cursor = data.get("cursor")
-        if not cursor:
-            break
-    
-    return None
+    """Find the Kalshi ticker for an opportunity (no network calls)."""
+    # Opportunities carry their ticker; fall back to the scan's title index
+    return opp.get("kalshi_ticker") or ticker_for_title(opp.get("kalshi_title", ""))
 
 
 def execute_trade(client, opp, order_details):
@@ -358,8 +320,10 @@ def execute_trade(client, opp, order_details):
 
 def execute_trade_with_ticker(client, opp, order_details, ticker):
     """Execute a trade with a known ticker (avoids redundant lookup)."""
-    print(f"  📤 Placing order: {order_details['count']} {order_details['side'].upper()} "
-          f"@ {order_details['price']}¢ on {ticker}")
+    log.info(f"  📤 Placing order: {order_details['count']} {order_details['side'].upper()} "
+             f"@ {order_details['price']}¢ on {ticker}",
+             extra={"fields": {"ticker": ticker, "side": order_details["side"],
+                               "count": order_details["count"], "price": order_details["price"]}})
     
     result = place_order(
         client,
@@ -385,100 +349,78 @@ def execute_trade_with_ticker(client, opp, order_details, ticker):
 
 def run_auto_trader():
     """Main auto-trader loop (single run)."""
-    print("=" * 65)
-    print("🤖 KALSHI AUTO-TRADER — Level 2 (Semi-Autonomous)")
-    print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"📏 Risk: max ${MAX_TRADE_CENTS/100:.0f}/trade ({MAX_PER_TRADE_PCT*100:.0f}%) | "
-          f"SL: {STOP_LOSS_PCT*100:.0f}% | TP: +{TAKE_PROFIT_PCT*100:.0f}%")
-    print("=" * 65)
-    print()
+    log.info(f"🤖 KALSHI AUTO-TRADER — Level 2 | max ${MAX_TRADE_CENTS/100:.0f}/trade "
+             f"({MAX_PER_TRADE_PCT*100:.0f}%) | SL: {STOP_LOSS_PCT*100:.0f}% | TP: +{TAKE_PROFIT_PCT*100:.0f}%")
     
     # 1. Check account
-    print("💰 Checking account...")
+    log.info("💰 Checking account...")
+    ledger = Ledger()
     try:
         client = get_client()
         cash = get_balance(client)
         positions = get_positions(client)
-        position_value = sum(abs(getattr(p, 'position', 0)) for p in positions) * 50  # rough estimate
-        num_positions = len([p for p in positions if getattr(p, 'position', 0) != 0])
-        print(f"  Cash: ${cash/100:.2f} | Positions: {num_positions} | Max: {MAX_POSITIONS}")
+        # Mark-to-market from one batched quote fetch (not a per-position loop)
+        quotes = get_quotes((getattr(p, 'ticker', None) for p in positions
+                             if getattr(p, 'position', 0) != 0), log=log.warning)
+        marks = mark_to_market(positions, quotes)
+        position_value = sum(m["value_cents"] for m in marks.values())
+        num_positions = len(marks)
+        log.info(f"  Cash: ${cash/100:.2f} | Positions: {num_positions} (${position_value/100:.2f}) | Max: {MAX_POSITIONS}",
+                 extra={"fields": {"cash_cents": cash, "positions": num_positions,
+                                   "position_value_cents": position_value}})
     except Exception as e:
-        print(f"  ❌ Account error: {e}")
+        log.error(f"  ❌ Account error: {e}")
         return {"error": str(e), "trades": [], "exits": []}
     
     # 2. CHECK STOP-LOSS / TAKE-PROFIT on existing positions
     exits_made = []
-    print()
-    print("🛡️ Checking stop-loss / take-profit on existing positions...")
+    log.info("🛡️ Checking stop-loss / take-profit on existing positions...")
     try:
-        exits_needed = check_stop_loss_take_profit(client, positions)
+        # Priced from the quotes already fetched for mark-to-market — no
+        # per-position calls
+        exits_needed = check_stop_loss_take_profit(client, positions, quotes=quotes, ledger=ledger)
         if exits_needed:
-            for ex in exits_needed:
-                icon = "🔴" if ex["action"] == "STOP_LOSS" else "🟢"
-                print(f"  {icon} {ex['action']}: {ex['ticker']} — {ex['reason']}")
-                print(f"     Entry: {ex['entry_price']}¢ → Now: {ex['current_price']}¢ ({ex['pnl_pct']:+.1f}%)")
-                result = execute_exit(client, ex)
-                if result.get("success"):
-                    print(f"  ✅ EXIT EXECUTED for {ex['ticker']}")
-                    exits_made.append({
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "ticker": ex["ticker"],
-                        "action": ex["action"],
-                        "side": ex["side"],
-                        "count": ex["count"],
-                        "entry_price": ex["entry_price"],
-                        "exit_price": ex["current_price"],
-                        "pnl_pct": ex["pnl_pct"],
-                    })
-                    # Update cash after exit
-                    cash += ex["current_price"] * ex["count"]
-                    num_positions -= 1
-                else:
-                    print(f"  ⚠️ EXIT FAILED for {ex['ticker']}: {result.get('error')}")
+            exits_made = execute_exits(client, exits_needed, ledger)
+            for ex in exits_made:
+                # Update cash after exit
+                cash += ex["exit_price"] * ex["count"]
+                position_value = max(0, position_value - ex["exit_price"] * ex["count"])
+                num_positions -= 1
         else:
-            print("  ✅ All positions within bounds. No exits needed.")
+            log.info("  ✅ All positions within bounds. No exits needed.")
     except Exception as e:
-        print(f"  ⚠️ Stop/TP check error: {e}")
+        log.warning(f"  ⚠️ Stop/TP check error: {e}")
     
     if cash < MIN_CASH_TO_TRADE:
-        print(f"  ⚠️ Cash too low (${cash/100:.2f} < ${MIN_CASH_TO_TRADE/100:.2f}). Skipping scan.")
+        log.warning(f"  ⚠️ Cash too low (${cash/100:.2f} < ${MIN_CASH_TO_TRADE/100:.2f}). Skipping scan.")
         return {"trades": [], "exits": exits_made, "skipped": "low_cash"}
     
     # 3. Run scanner
-    print()
-    print("🔍 Running arbitrage scan...")
-    print()
+    log.info("🔍 Running arbitrage scan...")
     opportunities = run_scan()
-    print()
     
     if not opportunities:
-        print("✅ No opportunities found. Standing by.")
+        log.info("✅ No opportunities found. Standing by.")
         return {"trades": [], "exits": exits_made, "scanned": True}
     
     # 4. Evaluate each opportunity
     trades_made = []
     
-    # Collect tickers we already hold — use BOTH API positions AND local tracker
+    # Tickers we already hold — API positions here, the ledger per ticker below
+    # (prevents re-buying across runs)
     held_tickers = set()
     for p in positions:
         t = getattr(p, 'ticker', '')
         if t and getattr(p, 'position', 0) != 0:
             held_tickers.add(t)
     
-    # Also check local tracker (prevents re-buying across runs)
-    tracked = get_tracked_tickers()
-    held_tickers.update(tracked)
-    
-    # Clean up old resolved positions from tracker
-    tracker = load_position_tracker()
-    tracker = clear_resolved_positions(tracker)
-    save_position_tracker(tracker)
+    # Close ledger positions whose markets have resolved (no longer held per the API)
+    ledger.close_stale(held=held_tickers)
     
     if held_tickers:
-        print(f"📌 Already holding (API + local): {', '.join(held_tickers)}")
+        log.info(f"📌 Already holding (API): {', '.join(held_tickers)}")
     
-    print("🎯 Evaluating opportunities against risk rules...")
-    print("-" * 65)
+    log.info("🎯 Evaluating opportunities against risk rules...")
     
     for opp in opportunities:
         name = opp.get("name", "Unknown")
@@ -487,41 +429,46 @@ def run_auto_trader():
         passes, reason = check_risk_rules(opp, cash, position_value, num_positions)
         
         if not passes:
-            print(f"  ❌ {name}: {reason}")
+            log.info(f"  ❌ {name}: {reason}")
             continue
         
         # Calculate order
         order = calculate_order(opp, cash)
         if not order:
-            print(f"  ❌ {name}: Could not calculate valid order")
+            log.info(f"  ❌ {name}: Could not calculate valid order")
             continue
         
         # Find ticker BEFORE executing to check for duplicates
         ticker = find_ticker(client, opp)
         if not ticker:
-            print(f"  ❌ {name}: Could not find ticker")
+            log.info(f"  ❌ {name}: Could not find ticker")
             continue
         
-        if ticker in held_tickers:
-            print(f"  ⏭️ {name}: Already holding {ticker} — skipping")
+        if ticker in held_tickers or ledger.is_held(ticker):
+            log.info(f"  ⏭️ {name}: Already holding {ticker} — skipping")
+            continue
+        if ledger.bought_within(ticker):
+            log.info(f"  ⏭️ {name}: Bought {ticker} within {STALE_DAYS} days — skipping")
             continue
         
         # Flag catalyst windows
         catalyst_note = opp.get("catalyst_note", "")
         
-        print(f"\n  ✅ {name} — PASSES ALL RULES")
-        print(f"     Spread: {opp['spread']} pts | ROI: {opp['roi']}% | Days: {opp['days_left']}")
-        print(f"     Order: {order['count']} {order['side'].upper()} @ {order['price']}¢")
-        print(f"     Cost: ${order['total_cost_cents']/100:.2f} | Potential profit: ${order['potential_profit_cents']/100:.2f}")
-        if catalyst_note:
-            print(f"     ⚡ CATALYST: {catalyst_note}")
+        log.info(f"  ✅ {name} — PASSES ALL RULES: {order['count']} {order['side'].upper()} @ {order['price']}¢",
+                 extra={"fields": {"ticker": ticker, "spread": opp["spread"], "roi": opp["roi"],
+                                   "days": opp["days_left"], "cost_cents": order["total_cost_cents"],
+                                   "profit_cents": order["potential_profit_cents"],
+                                   "catalyst": catalyst_note or None}})
         
         # Execute — pass ticker directly to avoid redundant lookup
         result = execute_trade_with_ticker(client, opp, order, ticker)
         
         if result.get("success"):
-            print(f"  🎉 TRADE EXECUTED: {result['count']} {result['side'].upper()} @ {result['price']}¢")
+            log.info(f"  🎉 TRADE EXECUTED: {result['count']} {result['side'].upper()} @ {result['price']}¢",
+                     extra={"fields": {"ticker": ticker, "side": result["side"],
+                                       "count": result["count"], "price": result["price"]}})
             cash -= order["total_cost_cents"]
+            position_value += order["total_cost_cents"]
             num_positions += 1
             held_tickers.add(ticker)
             trade_record = {
@@ -538,28 +485,20 @@ def run_auto_trader():
                 "catalyst": catalyst_note or None,
             }
             trades_made.append(trade_record)
-            # Track locally to prevent re-buying across runs
-            track_position(ticker, trade_record)
+            # Lot + cost basis in the ledger (also prevents re-buying across runs)
+            ledger.record_buy(ticker, result["side"], result["count"], result["price"],
+                              cost_cents=order["total_cost_cents"],
+                              timestamp=trade_record["timestamp"], name=name)
         else:
-            print(f"  ⚠️ TRADE FAILED: {result.get('error')}")
-            print(f"  🛑 Stopping — likely insufficient funds. No more attempts this run.")
+            log.warning(f"  ⚠️ TRADE FAILED: {result.get('error')} — stopping, likely insufficient funds")
             break
     
     # 5. Summary
-    print()
-    print("=" * 65)
-    print(f"📋 SUMMARY: {len(trades_made)} trades | {len(exits_made)} exits")
-    if exits_made:
-        for ex in exits_made:
-            icon = "🔴" if ex["action"] == "STOP_LOSS" else "🟢"
-            print(f"   {icon} EXIT {ex['ticker']}: {ex['pnl_pct']:+.1f}%")
-    if trades_made:
-        total_spent = sum(t["total_cost"] for t in trades_made)
-        print(f"   Total spent: ${total_spent/100:.2f}")
-        print(f"   Remaining cash: ${cash/100:.2f}")
-        for t in trades_made:
-            print(f"   • {t['name']}: {t['count']} {t['side'].upper()} @ {t['price']}¢ (ROI: {t['roi']}%)")
-    print("=" * 65)
+    total_spent = sum(t["total_cost"] for t in trades_made)
+    log.info(f"📋 SUMMARY: {len(trades_made)} trades | {len(exits_made)} exits | "
+             f"spent ${total_spent/100:.2f} | cash ${cash/100:.2f}", extra={"fields": {
+                 "trades": [t["ticker"] for t in trades_made], "exits": [ex["ticker"] for ex in exits_made],
+                 "spent_cents": total_spent, "cash_cents": cash}})
     
     # 6. Log trades & exits
     for t in trades_made:
@@ -572,6 +511,63 @@ def run_auto_trader():
     return {"trades": trades_made, "exits": exits_made, "scanned": True}
 
 
+def watch_exits(url=None):
+    """
+    Long-running exit loop on local order books. Every held ticker's book is
+    seeded once and kept current from orderbook_delta, and stop-loss /
+    take-profit is checked every EXIT_WATCH_SECONDS without a network call.
+    Books a sequence gap marked stale are re-seeded before the next check
+    (and priced from quotes until then). Positions are re-read, and the
+    stream resubscribed, every POSITION_REFRESH_SECONDS.
+    """
+    from orderbook import BookSet
+    from stream import WS_URL, auth_headers
+    from trade import API_KEY_ID, PRIVATE_KEY_PATH
+
+    url = url or WS_URL
+    headers = None
+    if url.startswith("wss://"):
+        with open(PRIVATE_KEY_PATH, "r") as f:
+            private_key = f.read()
+        headers = lambda: auth_headers(API_KEY_ID, private_key, url)
+
+    log.info(f"🛡️ Watching exits on local order books | SL: {STOP_LOSS_PCT*100:.0f}% | "
+             f"TP: +{TAKE_PROFIT_PCT*100:.0f}%", extra={"fields": {
+                 "feed": url, "check_s": EXIT_WATCH_SECONDS, "refresh_s": POSITION_REFRESH_SECONDS}})
+    ledger = Ledger()
+    client = get_client()
+    while True:
+        try:
+            positions = [p for p in get_positions(client)
+                         if getattr(p, 'ticker', '') and getattr(p, 'position', 0) != 0]
+            if not positions:
+                log.info(f"  No open positions — checking again in {POSITION_REFRESH_SECONDS}s")
+                time.sleep(POSITION_REFRESH_SECONDS)
+                continue
+
+            books = BookSet((p.ticker for p in positions), log=log.warning)
+            books.seed()
+            stream = books.follow(url=url, headers=headers, duration=POSITION_REFRESH_SECONDS)
+            log.info(f"  📚 Following {len(positions)} books")
+            while stream.is_alive():
+                books.seed()  # only books marked stale since the last check
+                exits_made = execute_exits(
+                    client, check_stop_loss_take_profit(client, positions, books, ledger=ledger), ledger)
+                if exits_made:
+                    sold = {ex["ticker"] for ex in exits_made}
+                    positions = [p for p in positions if p.ticker not in sold]
+                    with open(TRADE_LOG, "a") as f:
+                        for ex in exits_made:
+                            f.write(json.dumps(ex) + "\n")
+                time.sleep(EXIT_WATCH_SECONDS)
+        except KeyboardInterrupt:
+            log.info("Stopped")
+            break
+        except Exception as e:
+            log.error(f"  ❌ Exit watch error: {e}")
+            time.sleep(60)
+
+
 # Generate alert message for notification
 def format_alert(result):
     """Format trade result for notification."""
@@ -595,6 +591,22 @@ def format_alert(result):
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Kalshi auto-trader (single run)")
+    parser.add_argument("--verbose", action="store_true", help="Also render log records on stderr")
+    parser.add_argument("--quiet", action="store_true", help="Log warnings and errors only")
+    parser.add_argument("--watch-exits", action="store_true",
+                        help="Keep running: check stop-loss/take-profit on live local order books")
+    parser.add_argument("--stream-url", default=None,
+                        help="WebSocket feed for --watch-exits (e.g. ws://127.0.0.1:8765 for stream_stub.py)")
+    args = parser.parse_args()
+    for logger in (log, scan_log):
+        logpipe.set_mode(logger, console=args.verbose, quiet=args.quiet or None, console_format="%(message)s")
+    
+    if args.watch_exits:
+        watch_exits(args.stream_url)
+        sys.exit(0)
+    
     result = run_auto_trader()
     alert = format_alert(result)
     if alert:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Title Pairing Benchmark
+Synthetic Kalshi-like index titles vs external (Polymarket/PredictIt-like)
+query titles, some of which are paraphrases of an index title. Reports, per
+number of probed cells, recall@1 against exact cosine search and query
+latency, then
+end-to-end pair_titles() time and precision/recall on the planted pairs.
+
+Usage:
+    python3 bench_ann.py [--index 12000] [--queries 1000] [--planted 0.4]
+"""
+
+import time
+import random
+import argparse
+
+import title_ann
+
+SYLLABLES = ["ka", "ro", "mi", "den", "sha", "vel", "tor", "lin", "bar", "quo",
+             "zen", "pa", "gri", "son", "mar", "ell", "dov", "nix", "ter", "ula"]
+THINGS = ["Bitcoin", "Ethereum", "Tesla stock", "the S&P 500", "gold", "oil", "the Nasdaq",
+          "CPI", "unemployment", "GDP growth", "the Fed funds rate", "mortgage rates"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+
+def names(rng, n):
+    out = set()
+    while len(out) < n:
+        out.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize())
+    return sorted(out)
+
+
+def make_pools(rng):
+    """Two disjoint pools of people/teams/places: index titles and planted
+    paraphrases use the first, unmatched queries the second."""
+    people, teams, places = names(rng, 600), names(rng, 300), names(rng, 200)
+    return [{"people": people[h::2], "teams": teams[h::2], "places": places[h::2]} for h in (0, 1)]
+
+
+def make_title(rng, pool):
+    month, year = rng.choice(MONTHS), rng.choice([2026, 2027])
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"Will {rng.choice(pool['people'])} win the {rng.choice(pool['places'])} primary in {month} {year}?"
+    if kind == 1:
+        a, b = rng.sample(pool["teams"], 2)
+        return f"Will the {a} beat the {b} on {month} {rng.randint(1, 28)}?"
+    if kind == 2:
+        return f"Will {rng.choice(THINGS)} be above {rng.randint(1, 200) * 5} by end of {month} {year}?"
+    if kind == 3:
+        a, b = rng.sample(pool["people"], 2)
+        return f"Will {a} meet {b} in {rng.choice(pool['places'])} before {month} {year}?"
+    return f"Highest temperature in {rng.choice(pool['places'])} on {month} {rng.randint(1, 28)} above {rng.randint(60, 105)}°F?"
+
+
+def paraphrase(title, rng):
+    """Same event, another venue's wording: dropped/added filler, PredictIt-style prefix."""
+    words = title.rstrip("?").split()
+    filler = {"Will", "the", "by", "end", "of", "on", "in"}
+    words = [w for w in words if w not in filler or rng.random() < 0.5]
+    if rng.random() < 0.5:
+        words = ["Will"] + words
+    if rng.random() < 0.3:
+        return f"{' '.join(words[:3])}: {' '.join(words)}?"
+    return " ".join(words) + ("?" if rng.random() < 0.7 else "")
+
+
+def make_corpus(n_index, n_queries, planted, seed):
+    rng = random.Random(seed)
+    pool, other = make_pools(rng)
+    index = {}
+    while len(index) < n_index:
+        index[f"KX-{len(index):05d}"] = make_title(rng, pool)
+    keys = list(index)
+    queries, truth = {}, {}
+    for i in range(n_queries):
+        q = f"ext-{i:04d}"
+        if rng.random() < planted:
+            k = rng.choice(keys)
+            queries[q] = paraphrase(index[k], rng)
+            truth[q] = k
+        else:
+            queries[q] = make_title(rng, other).replace("Will ", "", 1)
+    return index, queries, truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN title pairing benchmark")
+    parser.add_argument("--index", type=int, default=12000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--planted", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    index, queries, truth = make_corpus(args.index, args.queries, args.planted, args.seed)
+    print(f"📐 {len(index)} index × {len(queries)} query titles, {len(truth)} planted pairs")
+
+    start = time.perf_counter()
+    i_toks = [title_ann.features(title_ann.tokens(t)) for t in index.values()]
+    q_toks = [title_ann.features(title_ann.tokens(t)) for t in queries.values()]
+    encoder = title_ann.TitleEncoder(i_toks + q_toks)
+    i_vec, q_vec = encoder.encode(i_toks), encoder.encode(q_toks)
+    encode_ms = (time.perf_counter() - start) * 1000
+    print(f"  tokenize + encode           {encode_ms:8.1f} ms")
+
+    start = time.perf_counter()
+    exact = title_ann.exact_query(i_vec, q_vec)
+    exact_ms = (time.perf_counter() - start) * 1000
+    answered = [qi for qi, hits in enumerate(exact) if hits]
+    print(f"  exact cosine (brute force)  {exact_ms:8.1f} ms   {len(answered)} queries with a neighbour ≥ {title_ann.MIN_SIM}")
+
+    start = time.perf_counter()
+    ivf = title_ann.IVFIndex(i_vec)
+    build_ms = (time.perf_counter() - start) * 1000
+    cells = len(ivf.centroids)
+    print(f"  IVF build ({cells} cells)        {build_ms:8.1f} ms")
+    print()
+    print(f"  {'probes':>6} {'query':>10} {'recall@1':>9} {'scanned/q':>10}")
+    sizes = ivf.offsets[1:] - ivf.offsets[:-1]
+    for probes in (1, 2, 4, 8, 16, 32):
+        if probes > cells:
+            break
+        start = time.perf_counter()
+        approx = ivf.query(q_vec, probes=probes)
+        query_ms = (time.perf_counter() - start) * 1000
+        hit = sum(1 for qi in answered if approx[qi] and approx[qi][0][0] == exact[qi][0][0])
+        near = (q_vec @ ivf.centroids.T).argsort(axis=1)[:, -probes:]
+        scanned = sizes[near].sum(axis=1).mean()
+        marker = "  ← default" if probes == title_ann.PROBES else ""
+        print(f"  {probes:>6} {query_ms:8.1f}ms {hit / max(len(answered), 1):9.3f} {scanned:10.0f}{marker}")
+
+    print()
+    start = time.perf_counter()
+    pairs = title_ann.pair_titles(index, queries)
+    total_ms = (time.perf_counter() - start) * 1000
+    found = {q: k for k, q, _ in pairs}
+    correct = sum(1 for q, k in found.items() if truth.get(q) == k)
+    print(f"  pair_titles end to end      {total_ms:8.1f} ms   {len(pairs)} confirmed pairs")
+    print(f"    planted recall {correct / max(len(truth), 1):.3f} | precision {correct / max(len(pairs), 1):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Page Decoding Benchmark
+Compares the old path (r.json() + copy ten fields out of every market) with
+fastjson.project() on a synthetic /markets page, for time and peak memory.
+
+Usage:
+    python3 bench_decode.py [--markets 1000] [--pages 12] [--keep 0.3]
+"""
+
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+import fastjson
+
+FIELDS = ("ticker", "title", "category", "yes_bid", "yes_ask", "no_bid",
+          "no_ask", "last_price", "volume", "close_time")
+
+
+def make_page(n, keep_ratio):
+    """A /markets page of n markets with ~40 fields each, as the API returns."""
+    markets = []
+    for i in range(n):
+        m = {
+            "ticker": f"KXBENCH-26OCT{i:05d}-T{random.randint(1, 99)}",
+            "event_ticker": f"KXBENCH-26OCT{i // 10:04d}",
+            "title": f"Will benchmark series {i} settle above {random.randint(1, 500)}?",
+            "subtitle": f"Above {random.randint(1, 500)}",
+            "category": random.choice(["Economics", "Sports", "Politics", "Climate"]),
+            "yes_bid": random.randint(1, 98), "yes_ask": random.randint(2, 99),
+            "no_bid": random.randint(1, 98), "no_ask": random.randint(2, 99),
+            "last_price": random.randint(1, 99),
+            "volume": random.randint(500, 90_000) if random.random() < keep_ratio else random.randint(0, 499),
+            "close_time": "2026-10-20T20:00:00Z",
+            "rules_primary": "If the value reported by the source is above the strike "
+                             "on the expiration date, the market resolves to Yes. " * 3,
+            "rules_secondary": "Revisions after expiration are not considered.",
+            "price_ranges": [{"start": str(c), "end": str(c + 1), "step": "0.01"} for c in (0, 10, 90)],
+            "custom_strike": {"floor_strike": random.random() * 500},
+        }
+        for k in range(40 - len(m)):
+            m[f"extra_field_{k}"] = random.choice([None, 0, 1, "", "active", "binary"])
+        markets.append(m)
+    return json.dumps({"markets": markets, "cursor": "abc"}).encode()
+
+
+def keep(m):
+    return (m.get("volume", 0) or 0) >= 500
+
+
+def baseline(raw):
+    """What fetch_kalshi_short_term used to do: full decode, then copy out."""
+    out = {}
+    for m in json.loads(raw).get("markets", []):
+        if (m.get("volume", 0) or 0) < 500:
+            continue
+        out[m["ticker"]] = {f: m.get(f) for f in FIELDS}
+    return out
+
+
+def projected(decode):
+    def run(raw):
+        return {m["ticker"]: m for m in decode(raw).get("markets", [])}
+    return run
+
+
+def measure(name, fn, pages):
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [fn(raw) for raw in pages]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = sum(len(k) for k in kept)
+    print(f"  {name:<28} {elapsed * 1000:8.1f} ms   peak {peak / 1e6:7.1f} MB   kept {count}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page decoding paths")
+    parser.add_argument("--markets", type=int, default=1000, help="markets per page")
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--keep", type=float, default=0.3, help="fraction passing the volume filter")
+    args = parser.parse_args()
+
+    random.seed(7)
+    pages = [make_page(args.markets, args.keep) for _ in range(args.pages)]
+    print(f"📏 {args.pages} pages × {args.markets} markets, {sum(map(len, pages)) / 1e6:.1f} MB raw\n")
+
+    base = measure("json.loads + copy (old)", baseline, pages)
+    results = []
+    if fastjson.orjson:
+        results.append(("orjson + project", measure("orjson + project", projected(fastjson.project(FIELDS, keep)), pages)))
+    orjson, fastjson.orjson = fastjson.orjson, None  # force the stdlib path
+    try:
+        results.append(("object_hook project", measure("object_hook project", projected(fastjson.project(FIELDS, keep)), pages)))
+    finally:
+        fastjson.orjson = orjson
+
+    print()
+    for name, t in results:
+        print(f"  {name}: {base / t:.1f}x vs old path")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Economic Market Title Parser
+Pulls (indicator, comparator, threshold, period) out of titles like
+"Will CPI rise more than 0.3% in January 2026?" in one regex pass, caches the
+result per ticker, and indexes markets on those fields. Threshold markets are
+then found by lookup ("every CPI > 0.2% market") instead of per-threshold
+regexes or hand-written per-month rules.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+EconTerms = namedtuple("EconTerms", "indicator comparator threshold period")
+
+INDICATORS = ("cpi", "unemployment", "gdp", "inflation")
+LABELS = {"cpi": "CPI", "unemployment": "Unemployment", "gdp": "GDP Growth", "inflation": "Inflation"}
+
+COMPARATORS = {
+    "more than": ">", "greater than": ">", "higher than": ">", "above": ">",
+    "over": ">", "exceed": ">", "exceeds": ">",
+    "at least": ">=",
+    "less than": "<", "lower than": "<", "below": "<", "under": "<",
+    # symbolic titles ("CPI > 0.2% Jan 2026")
+    ">": ">", ">=": ">=", "≥": ">=", "<": "<", "<=": "<=", "≤": "<=",
+}
+# "<comparator> <number>%" — a leading minus is kept, so "above -0.2%" is -0.2
+THRESHOLD_RE = re.compile(
+    r"(?<!\w)(" + "|".join(map(re.escape, sorted(COMPARATORS, key=len, reverse=True)))
+    + r")\s*(-?\d+(?:\.\d+)?)\s*%")
+# A conjunction after the threshold joins another condition ("... AND YoY CPI above 2.5%")
+CONJUNCTION_RE = re.compile(r"\b(and|or)\b")
+
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+MONTH_RE = re.compile(r"\b(" + "|".join(MONTHS + tuple(m[:3] for m in MONTHS if m != "may") + ("sept",))
+                      + r")\.?(?:\s+(20\d\d))?\b")
+QUARTER_RE = re.compile(r"\bq([1-4])(?:\s+(20\d\d))?\b")
+YEAR_RE = re.compile(r"\b(20\d\d)\b")
+
+
+def parse_title(title):
+    """EconTerms for an economic threshold title, or None — also for combo
+    titles with several conditions, which no single rule describes.
+    period is "Jan 2026", "Q1 2026", "Jan", or None."""
+    text = (title or "").lower()
+    indicator = next((name for name in INDICATORS if name in text), None)
+    if indicator is None:
+        return None
+    thresholds = list(THRESHOLD_RE.finditer(text))
+    if len(thresholds) != 1:
+        return None
+    m = thresholds[0]
+    if CONJUNCTION_RE.search(text, m.end()):
+        return None
+    comparator = COMPARATORS[m.group(1)]
+    threshold = round(float(m.group(2)), 3)
+
+    period = None
+    q = QUARTER_RE.search(text)
+    month = MONTH_RE.search(text)
+    if q:
+        year = q.group(2) or _year(text)
+        period = f"Q{q.group(1)}" + (f" {year}" if year else "")
+    elif month and (month.group(1) != "may" or month.group(2)):  # "may" needs a year
+        year = month.group(2) or _year(text)
+        period = month.group(1)[:3].capitalize() + (f" {year}" if year else "")
+    return EconTerms(indicator, comparator, threshold, period)
+
+
+def _year(text):
+    y = YEAR_RE.search(text)
+    return y.group(1) if y else None
+
+
+def describe(terms):
+    """Rule name for a parsed market, e.g. "CPI > 0.3% Jan 2026"."""
+    name = f"{LABELS[terms.indicator]} {terms.comparator} {terms.threshold:g}%"
+    return f"{name} {terms.period}" if terms.period else name
+
+
+# Bounded so a long-running scanner doesn't keep every market it has ever seen
+CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def terms_for(key, title):
+    """Parsed terms per ticker (or external key), reused across snapshots
+    while its title is unchanged — a retitled market is parsed again."""
+    return parse_title(title)
+
+
+class EconIndex:
+    """Parsed economic markets of a snapshot, keyed on their terms."""
+
+    def __init__(self, items=()):
+        self.terms = {}    # key → EconTerms
+        self.by_kind = {}  # (indicator, comparator) → [keys], insertion order
+        self.by_key = {}   # (indicator, comparator, threshold) → [keys]
+        for key, title in items:
+            terms = terms_for(key, title)
+            if terms is None:
+                continue
+            self.terms[key] = terms
+            self.by_kind.setdefault(terms[:2], []).append(key)
+            self.by_key.setdefault(terms[:3], []).append(key)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, indicator, comparator, threshold=None, period=None):
+        """Keys with these terms, in insertion order (None = any). A period
+        matches when one is a prefix of the other ("Jan" ~ "Jan 2026")."""
+        if threshold is None:
+            keys = self.by_kind.get((indicator, comparator), [])
+        else:
+            keys = self.by_key.get((indicator, comparator, round(threshold, 3)), [])
+        if period is None:
+            return list(keys)
+        return [k for k in keys if periods_agree(self.terms[k].period, period)]
+
+    def rules(self):
+        """One (terms, first key) per distinct set of terms, in insertion order."""
+        first = {}
+        for key, terms in self.terms.items():
+            first.setdefault(terms, key)
+        return list(first.items())
+
+
+def periods_agree(a, b):
+    """Same period, allowing a missing year on one side."""
+    if not a or not b:
+        return False
+    a, b = a.split(), b.split()
+    n = min(len(a), len(b))
+    return a[:n] == b[:n]
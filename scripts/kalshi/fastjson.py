@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Fast Page Decoding with Field Projection
+Decodes a Kalshi list page (/markets or /events) and keeps only the fields we
+use from each market, dropping markets that fail a filter as they are decoded
+instead of building dozens-of-field dicts for all of them first.
+
+With orjson installed the page is parsed in C and projected in one pass;
+without it the stdlib decoder projects each market inside object_hook, so
+discarded markets never outlive their own decode.
+
+Benchmark: python3 bench_decode.py
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_DROP = object()
+
+
+def loads(raw):
+    """Decode bytes/str with orjson when available."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _is_market(d):
+    return "ticker" in d and "title" in d
+
+
+def project(fields, keep=None):
+    """
+    Build a page decoder: decode(raw) → page dict whose market lists
+    (top-level "markets", or "markets" nested in each event) contain only
+    `fields` of markets for which keep(market) is true.
+    """
+    fields = tuple(fields)
+
+    def pick(m):
+        if keep is not None and not keep(m):
+            return _DROP
+        return {f: m.get(f) for f in fields}
+
+    if orjson:
+        def decode(raw):
+            data = orjson.loads(raw)
+            for holder in [data] + (data.get("events") or []):
+                markets = holder.get("markets")
+                if markets:
+                    holder["markets"] = [p for p in map(pick, markets) if p is not _DROP]
+            return data
+        return decode
+
+    def hook(d):
+        if _is_market(d):
+            return pick(d)
+        markets = d.get("markets")
+        if markets:
+            d["markets"] = [m for m in markets if m is not _DROP]
+        return d
+
+    def decode(raw):
+        return json.loads(raw, object_hook=hook)
+    return decode
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Kalshi Public API
+Unauthenticated market-data reads shared by scanner, arbitrage_v2,
+auto_trader and monitor. Prefer iter_markets() with server-side filters
+(status, series, close window) over sweeping /events and filtering locally.
+
+Cursor pagination is pipelined: as soon as a page arrives its cursor is used
+to put the next request in flight, and the caller parses/filters the current
+page while that request is on the wire.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import transport
+import snapshot_cache
+from fastjson import project
+from market_store import MarketStore
+from ratelimit import SCHEDULER, PRIORITY_QUOTE, PRIORITY_SCAN
+
+KALSHI_API = "https://api.elections.kalshi.com/trade-api/v2"
+MARKETS_PAGE_LIMIT = 1000  # /markets maximum page size
+QUOTE_CHUNK = 100          # tickers per batched /markets?tickers= request
+QUOTE_WORKERS = 4          # concurrent quote chunks
+RETRIES = 5                # per request, on 429 / 5xx
+
+# The shared short-term universe (arbitrage_v2 / auto_trader and monitor):
+# one snapshot, each caller narrows it with MarketStore masks
+SHORT_TERM_DAYS = 60
+SHORT_TERM_MIN_VOLUME = 500
+SHORT_TERM_SOURCE = f"kalshi:short_term:{SHORT_TERM_DAYS}d"
+SHORT_TERM_FIELDS = ("ticker", "title", "category", "yes_bid", "yes_ask", "no_bid",
+                     "no_ask", "last_price", "volume", "close_time")
+
+
+def fetch_public(path, params=None, timeout=30, priority=PRIORITY_QUOTE, decode=None):
+    """
+    GET a public endpoint and return decoded JSON (`decode(raw_bytes)` if
+    given, e.g. a fastjson.project() decoder). Every request goes through
+    the shared rate-limit scheduler; 429s and 5xx are retried (the scheduler
+    backs off on 429) before raising, so a sweep isn't silently cut short.
+    """
+    url = f"{KALSHI_API}{path}"
+    for attempt in range(RETRIES + 1):
+        SCHEDULER.acquire(priority)
+        r = transport.get(url, params=params, timeout=timeout)
+        SCHEDULER.observe(r)
+        if attempt < RETRIES and (r.status_code == 429 or r.status_code >= 500):
+            if r.status_code >= 500:
+                time.sleep(min(2 ** attempt, 10))
+            continue
+        r.raise_for_status()
+        return decode(r.content) if decode else r.json()
+
+
+# ============== PAGINATION ==============
+def iter_pages(path, params=None, max_pages=20, timeout=15, priority=PRIORITY_SCAN,
+               decode=None):
+    """
+    Yield decoded pages of a cursor-paginated endpoint, prefetching the next
+    page while the caller works on the current one.
+    Errors propagate to the caller after all earlier pages were yielded.
+    """
+    params = dict(params or {})
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kalshi-pager")
+
+    def fetch(cursor):
+        p = dict(params)
+        if cursor:
+            p["cursor"] = cursor
+        return fetch_public(path, p, timeout=timeout, priority=priority, decode=decode)
+
+    try:
+        pending = pool.submit(fetch, params.pop("cursor", None))
+        for page in range(max_pages):
+            data = pending.result()
+            cursor = data.get("cursor")
+            pending = None
+            if cursor and page + 1 < max_pages:
+                pending = pool.submit(fetch, cursor)
+            yield data
+            if pending is None:
+                break
+    finally:
+        # Caller may stop early (e.g. ticker found) — drop any in-flight page
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_events(params=None, max_pages=20, timeout=15):
+    """Yield every event across pages of /events."""
+    for data in iter_pages("/events", params, max_pages=max_pages, timeout=timeout):
+        yield from data.get("events", [])
+
+
+def iter_event_markets(status="open", max_pages=20, timeout=15):
+    """Yield (event, market) pairs from /events with nested markets."""
+    params = {"status": status, "limit": 200, "with_nested_markets": "true"}
+    for event in iter_events(params, max_pages=max_pages, timeout=timeout):
+        for m in event.get("markets", []):
+            yield event, m
+
+
+def iter_markets(status="open", series_ticker=None, event_ticker=None,
+                 min_close_ts=None, max_close_ts=None, max_pages=50, timeout=15,
+                 fields=None, keep=None):
+    """
+    Yield markets from /markets with the filters applied server-side, so only
+    the slice we analyze is transferred. Close bounds are unix seconds.
+    With `fields`, pages are decoded by fastjson.project(fields, keep): only
+    those fields are kept, and markets failing keep(market) are dropped
+    during decoding.
+    """
+    params = {"status": status, "limit": MARKETS_PAGE_LIMIT}
+    if series_ticker:
+        params["series_ticker"] = series_ticker
+    if event_ticker:
+        params["event_ticker"] = event_ticker
+    if min_close_ts is not None:
+        params["min_close_ts"] = int(min_close_ts)
+    if max_close_ts is not None:
+        params["max_close_ts"] = int(max_close_ts)
+    decode = project(fields, keep) if fields else None
+    for data in iter_pages("/markets", params, max_pages=max_pages, timeout=timeout,
+                           decode=decode):
+        yield from data.get("markets", [])
+
+
+# ============== QUOTES ==============
+def get_quotes(tickers, chunk_size=QUOTE_CHUNK, timeout=15, priority=PRIORITY_QUOTE, log=print):
+    """
+    Current quotes for many tickers at once, as a MarketStore
+    ({ticker: market row}). One /markets?tickers= request per chunk, chunks
+    fetched concurrently, so valuing a portfolio is a handful of calls however
+    many positions we hold. Tickers that fail or don't exist are simply
+    absent from the result; failed chunks are reported through `log`.
+    """
+    tickers = sorted({t for t in tickers if t})
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+    def fetch(chunk):
+        try:
+            data = fetch_public("/markets", {"tickers": ",".join(chunk), "limit": len(chunk)},
+                                timeout=timeout, priority=priority)
+            return data.get("markets", [])
+        except Exception as e:
+            log(f"  ⚠️ quotes ({len(chunk)} tickers): {e}")
+            return []
+
+    if not chunks:
+        return MarketStore()
+    with ThreadPoolExecutor(max_workers=min(QUOTE_WORKERS, len(chunks))) as pool:
+        return MarketStore(m for markets in pool.map(fetch, chunks) for m in markets)
+
+
+# ============== SHARED UNIVERSE ==============
+def short_term_markets(max_age=None, log=print):
+    """
+    Open markets closing within SHORT_TERM_DAYS with volume ≥
+    SHORT_TERM_MIN_VOLUME, as a MarketStore. Served from the shared snapshot
+    (SHORT_TERM_SOURCE) when one is younger than max_age; the cutoffs are
+    re-applied as column filters so a cached sweep stays exact.
+    """
+    store = MarketStore(snapshot_cache.cached(
+        SHORT_TERM_SOURCE, lambda: fetch_short_term(log), max_age, log=log).values())
+    return store.select(store.closing_within(SHORT_TERM_DAYS) & (store.volume >= SHORT_TERM_MIN_VOLUME))
+
+
+def fetch_short_term(log=print):
+    """Fetch the short-term universe ({ticker: market}). Status and close
+    window are filtered server-side by /markets; volume has no server filter
+    so it is applied while decoding."""
+    markets = {}
+    cutoff_dt = datetime.now(timezone.utc) + timedelta(days=SHORT_TERM_DAYS)
+
+    # Pages are pipelined (next request in flight while we filter this one) and
+    # decoded straight to SHORT_TERM_FIELDS; low-volume markets are dropped
+    # while decoding
+    count = 0
+    try:
+        for m in iter_markets(status="open", max_close_ts=cutoff_dt.timestamp(),
+                              max_pages=50, timeout=15, fields=SHORT_TERM_FIELDS,
+                              keep=lambda m: (m.get("volume", 0) or 0) >= SHORT_TERM_MIN_VOLUME):
+            count += 1
+            if m["close_time"]:
+                markets[m["ticker"]] = m
+    except Exception as e:
+        # Retries are exhausted — report it and keep this partial sweep out of the cache
+        raise snapshot_cache.PartialFetch(markets, f"after {count} markets: {e}")
+
+    log(f"    ✅ {len(markets)} short-term markets (<{SHORT_TERM_DAYS}d, vol≥{SHORT_TERM_MIN_VOLUME})")
+    return markets
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Keyword Index over Market Titles
+Titles are lowercased and trigram-indexed once per snapshot, so "which title
+contains all of these keywords" intersects a few posting sets and verifies
+the survivors with a plain substring test, instead of scanning every title.
+Matching is exact substring matching, same as `all(kw in title ...)`.
+
+    index = TitleIndex((ticker, m["title"]) for ticker, m in kalshi.items())
+    key = index.first(["cpi", "0.3%"])   # first title (in insertion order) with both
+
+TokenIndex is the whole-word counterpart: keys sharing at least N words
+with a query (team names in odds keys vs a Kalshi title).
+"""
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Trigram postings over (key, title) pairs, in insertion order."""
+
+    def __init__(self, items=()):
+        self.keys = []
+        self.titles = []  # lowercased
+        self.grams = {}   # trigram → set of ids
+        for key, title in items:
+            self.add(key, title)
+
+    def add(self, key, title):
+        i = len(self.keys)
+        title = (title or "").lower()
+        self.keys.append(key)
+        self.titles.append(title)
+        for g in trigrams(title):
+            postings = self.grams.get(g)
+            if postings is None:
+                self.grams[g] = {i}
+            else:
+                postings.add(i)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, keywords):
+        """Ids that may contain every keyword (ascending). Keywords shorter
+        than three characters don't narrow the set; they are only verified."""
+        sets = []
+        for kw in keywords:
+            for g in trigrams(kw):
+                postings = self.grams.get(g)
+                if not postings:
+                    return []
+                sets.append(postings)
+        if not sets:
+            return range(len(self.keys))
+        sets.sort(key=len)
+        found = sets[0]
+        for s in sets[1:]:
+            found = found & s
+            if not found:
+                return []
+        return sorted(found)
+
+    def matches(self, keywords):
+        """Keys of every title containing all keywords, in insertion order."""
+        keywords = [kw.lower() for kw in keywords]
+        titles = self.titles
+        return [self.keys[i] for i in self.candidates(keywords)
+                if all(kw in titles[i] for kw in keywords)]
+
+    def first(self, keywords):
+        """Key of the first title containing all keywords, or None."""
+        keywords = [kw.lower() for kw in keywords]
+        titles = self.titles
+        for i in self.candidates(keywords):
+            if all(kw in titles[i] for kw in keywords):
+                return self.keys[i]
+        return None
+
+
+class TokenIndex:
+    """Word postings over (key, token set) pairs, in insertion order: finds
+    the keys sharing at least N tokens with a query without comparing it
+    against every key."""
+
+    def __init__(self, items=()):
+        self.keys = []
+        self.postings = {}  # token → list of ids (ascending)
+        for key, tokens in items:
+            i = len(self.keys)
+            self.keys.append(key)
+            for t in set(tokens):
+                self.postings.setdefault(t, []).append(i)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def overlapping(self, tokens, min_common=1):
+        """Keys sharing ≥ min_common tokens with `tokens`, in insertion order."""
+        counts = {}
+        for t in set(tokens):
+            for i in self.postings.get(t, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return [self.keys[i] for i in sorted(i for i, n in counts.items() if n >= min_common)]
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Trade Ledger
+The auto-trader's positions in SQLite (WAL), maintained one trade at a time:
+
+  - lots:      one row per buy (count, price, contracts still held),
+  - sells:     one row per exit, with the cost basis it released (FIFO),
+  - positions: one row per ticker — open contracts, cost basis of those
+               contracts, realized P&L, open/closed.
+
+Entry price (average cost across every buy still held) and "do we hold
+this?" are primary-key lookups, so nothing rescans auto_trades.jsonl or
+rewrites held_positions.json. Both are imported once, the first time the
+ledger is opened; auto_trades.jsonl stays the append-only audit log.
+
+    ledger = Ledger()
+    ledger.record_buy("KXCPI-26JAN-T0.1", "yes", 20, 14, name="CPI > 0.1%")
+    ledger.entry("KXCPI-26JAN-T0.1")   # {"side": "yes", "contracts": 20, "avg_price": 14.0, ...}
+    ledger.record_sell("KXCPI-26JAN-T0.1", 20, 19, action="TAKE_PROFIT")
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+LOG_DIR = PROJECT_ROOT / "logs" / "kalshi"
+LEDGER_DB = LOG_DIR / "ledger.db"
+TRADE_LOG = LOG_DIR / "auto_trades.jsonl"
+POSITION_TRACKER = LOG_DIR / "held_positions.json"
+STALE_DAYS = 60  # open positions not bought into for this long are closed (resolved);
+                 # also the re-buy cooldown after a buy, even once exited
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Ledger:
+    def __init__(self, path=None, migrate=True):
+        self.path = Path(path) if path else LEDGER_DB
+        self._conn = None
+        self._migrate = migrate
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS positions (
+                ticker         TEXT PRIMARY KEY,
+                side           TEXT,               -- null if unknown (imported tracker entry)
+                contracts      INTEGER NOT NULL,   -- still held
+                cost_cents     INTEGER NOT NULL,   -- cost basis of the held contracts
+                realized_cents INTEGER NOT NULL DEFAULT 0,
+                name           TEXT,
+                first_bought   TEXT,
+                last_bought    TEXT,
+                status         TEXT NOT NULL,      -- open | closed
+                closed_at      TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS positions_status ON positions (status)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lots (
+                id         INTEGER PRIMARY KEY,
+                ticker     TEXT NOT NULL,
+                side       TEXT,
+                bought_at  TEXT NOT NULL,
+                count      INTEGER NOT NULL,
+                price      INTEGER NOT NULL,    -- cents per contract
+                cost_cents INTEGER NOT NULL,
+                remaining  INTEGER NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS lots_open ON lots (ticker, remaining)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sells (
+                id             INTEGER PRIMARY KEY,
+                ticker         TEXT NOT NULL,
+                sold_at        TEXT NOT NULL,
+                count          INTEGER NOT NULL,
+                price          INTEGER NOT NULL,
+                proceeds_cents INTEGER NOT NULL,
+                cost_cents     INTEGER NOT NULL,  -- basis released (FIFO lots)
+                action         TEXT
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn = conn
+        if self._migrate:
+            self.migrate()
+        return conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- writes -----
+    def _buy(self, conn, ticker, side, count, price, cost_cents, ts, name):
+        conn.execute("INSERT INTO lots (ticker, side, bought_at, count, price, cost_cents, remaining) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", (ticker, side, ts, count, price, cost_cents, count))
+        row = conn.execute("SELECT status FROM positions WHERE ticker = ?", (ticker,)).fetchone()
+        if row is None:
+            conn.execute("INSERT INTO positions (ticker, side, contracts, cost_cents, name, first_bought, "
+                         "last_bought, status) VALUES (?, ?, ?, ?, ?, ?, ?, 'open')",
+                         (ticker, side, count, cost_cents, name, ts, ts))
+        elif row[0] == "closed":  # bought back in after closing: a new holding period
+            conn.execute("UPDATE positions SET side = ?, contracts = ?, cost_cents = ?, name = COALESCE(?, name), "
+                         "first_bought = ?, last_bought = ?, status = 'open', closed_at = NULL "
+                         "WHERE ticker = ?", (side, count, cost_cents, name, ts, ts, ticker))
+        else:
+            conn.execute("UPDATE positions SET side = COALESCE(side, ?), contracts = contracts + ?, "
+                         "cost_cents = cost_cents + ?, name = COALESCE(?, name), last_bought = ? "
+                         "WHERE ticker = ?", (side, count, cost_cents, name, ts, ticker))
+
+    def record_buy(self, ticker, side, count, price, cost_cents=None, timestamp=None, name=None):
+        """Add a lot and grow the position's cost basis (one transaction)."""
+        conn = self._connect()
+        cost_cents = count * price if cost_cents is None else cost_cents
+        with conn:
+            self._buy(conn, ticker, side, count, price, cost_cents, timestamp or _now(), name)
+
+    def _sell(self, conn, ticker, count, price, ts, action):
+        released, left = 0, count
+        for lot_id, lot_count, lot_cost, remaining in conn.execute(
+                "SELECT id, count, cost_cents, remaining FROM lots WHERE ticker = ? AND remaining > 0 "
+                "ORDER BY id", (ticker,)).fetchall():
+            if left <= 0:
+                break
+            take = min(left, remaining)
+            # Basis released so far is rounded cumulatively, so a lot sold in
+            # pieces releases exactly its cost
+            sold_before = lot_count - remaining
+            cost = (round(lot_cost * (sold_before + take) / lot_count)
+                    - round(lot_cost * sold_before / lot_count))
+            conn.execute("UPDATE lots SET remaining = remaining - ? WHERE id = ?", (take, lot_id))
+            released += cost
+            left -= take
+        sold = count - left
+        if not sold:
+            return {"sold": 0, "cost_cents": 0, "realized_cents": 0}
+        proceeds = sold * price
+        conn.execute("INSERT INTO sells (ticker, sold_at, count, price, proceeds_cents, cost_cents, action) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", (ticker, ts, sold, price, proceeds, released, action))
+        conn.execute("UPDATE positions SET contracts = contracts - ?, cost_cents = cost_cents - ?, "
+                     "realized_cents = realized_cents + ? WHERE ticker = ?",
+                     (sold, released, proceeds - released, ticker))
+        conn.execute("UPDATE positions SET status = 'closed', closed_at = ?, cost_cents = 0 "
+                     "WHERE ticker = ? AND contracts <= 0 AND status = 'open'", (ts, ticker))
+        return {"sold": sold, "cost_cents": released, "realized_cents": proceeds - released}
+
+    def record_sell(self, ticker, count, price, timestamp=None, action=None):
+        """
+        Sell up to `count` contracts at `price`, releasing cost basis from
+        the oldest lots first; the position closes when none are left.
+        Returns {"sold", "cost_cents", "realized_cents"}.
+        """
+        conn = self._connect()
+        with conn:
+            return self._sell(conn, ticker, count, price, timestamp or _now(), action)
+
+    def close_position(self, ticker, timestamp=None):
+        """Mark a position closed (resolved) without a sell."""
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE positions SET status = 'closed', closed_at = ? "
+                         "WHERE ticker = ? AND status = 'open'", (timestamp or _now(), ticker))
+
+    def close_stale(self, days=STALE_DAYS, now=None, held=()):
+        """Close open positions last bought more than `days` ago (their
+        markets have resolved), except tickers in `held` — the ones the API
+        still reports. Returns the tickers closed."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=days)).isoformat()
+        conn = self._connect()
+        with conn:
+            # Stored timestamps mix "+00:00" and "Z" suffixes; compare on the date-time part
+            stale = [t for (t,) in conn.execute(
+                "SELECT ticker FROM positions WHERE status = 'open' AND substr(last_bought, 1, 19) < ?",
+                (cutoff[:19],)) if t not in held]
+            conn.executemany("UPDATE positions SET status = 'closed', closed_at = ? WHERE ticker = ?",
+                             ((now.isoformat(), t) for t in stale))
+        return stale
+
+    # ----- lookups -----
+    def entry(self, ticker):
+        """The open position on `ticker` with its average entry price, or None."""
+        row = self._connect().execute(
+            "SELECT side, contracts, cost_cents, realized_cents, name, first_bought, last_bought "
+            "FROM positions WHERE ticker = ? AND status = 'open'", (ticker,)).fetchone()
+        if row is None:
+            return None
+        side, contracts, cost, realized, name, first, last = row
+        return {"ticker": ticker, "side": side, "contracts": contracts, "cost_cents": cost,
+                "avg_price": cost / contracts if contracts > 0 else 0.0,
+                "realized_cents": realized, "name": name, "first_bought": first, "last_bought": last}
+
+    def is_held(self, ticker):
+        return self._connect().execute(
+            "SELECT 1 FROM positions WHERE ticker = ? AND status = 'open'", (ticker,)).fetchone() is not None
+
+    def bought_within(self, ticker, days=STALE_DAYS, now=None):
+        """Whether `ticker` was last bought less than `days` ago, open or
+        closed — the re-buy cooldown, so a position just stopped out isn't
+        bought straight back."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=days)).isoformat()
+        return self._connect().execute(
+            "SELECT 1 FROM positions WHERE ticker = ? AND substr(last_bought, 1, 19) >= ?",
+            (ticker, cutoff[:19])).fetchone() is not None
+
+    def open_tickers(self):
+        return {t for (t,) in self._connect().execute(
+            "SELECT ticker FROM positions WHERE status = 'open'")}
+
+    # ----- import -----
+    def migrate(self, trade_log=None, tracker=None):
+        """
+        One-time import: replay auto_trades.jsonl (buys as lots, exits as
+        FIFO sells), then add held_positions.json entries the log doesn't
+        know as a single lot of unknown side. Returns (buys, sells, tracked),
+        or None if the ledger was already imported.
+        """
+        trade_log = Path(trade_log) if trade_log else TRADE_LOG
+        tracker = Path(tracker) if tracker else POSITION_TRACKER
+        conn = self._conn or self._connect()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+            return None
+        buys = sells = tracked = 0
+        with conn:
+            if trade_log.exists():
+                with open(trade_log) as f:
+                    for line in f:
+                        try:
+                            t = json.loads(line)
+                        except ValueError:
+                            continue
+                        ticker = t.get("ticker")
+                        if not ticker or not t.get("count"):
+                            continue
+                        ts = t.get("timestamp") or _now()
+                        if "exit_price" in t:
+                            self._sell(conn, ticker, t["count"], t["exit_price"], ts, t.get("action"))
+                            sells += 1
+                        elif t.get("price"):
+                            self._buy(conn, ticker, t.get("side"), t["count"], t["price"],
+                                      t.get("total_cost", t["count"] * t["price"]), ts, t.get("name"))
+                            buys += 1
+            try:
+                held = json.loads(tracker.read_text())
+            except:
+                held = {}
+            for ticker, info in held.items():
+                if conn.execute("SELECT 1 FROM positions WHERE ticker = ?", (ticker,)).fetchone():
+                    continue
+                count = info.get("total_contracts", 0)
+                cost = info.get("total_cost_cents", 0)
+                ts = info.get("first_bought") or _now()
+                self._buy(conn, ticker, None, count, round(cost / count) if count else 0, cost, ts,
+                          info.get("market_name"))
+                conn.execute("UPDATE positions SET last_bought = ? WHERE ticker = ?",
+                             (info.get("last_bought", ts), ticker))
+                tracked += 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('migrated', ?)", (_now(),))
+        return buys, sells, tracked
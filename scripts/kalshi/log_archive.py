@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Log Archive — compaction and history queries for logs/kalshi and logs/trading
+The append-only logs (opportunities.jsonl, arbitrage_v2.jsonl,
+auto_trades.jsonl, scanner.log, scanner-stderr.log, ...) are compacted into
+compressed column blocks under logs/archive/, with a SQLite index of which
+block holds which ticker over which time range. A query reads only the
+blocks it needs instead of grepping every log.
+
+  compact  archive everything appended since the last run; live logs over
+           ROTATE_BYTES are first renamed to <name>.<stamp>.closed, and a
+           closed segment is deleted once archived and untouched for
+           SETTLE_SECONDS (a writer still holding it open keeps it alive)
+  query    records by source / ticker / time range, as JSON lines
+  stats    rows, blocks and raw vs archived bytes per source
+
+Usage:
+    python3 log_archive.py compact [--rotate-all]
+    python3 log_archive.py query --ticker KXCPI-26JAN-T0.3 --since 2026-01-20 --until 2026-01-27
+    python3 log_archive.py query --source kalshi/scanner --since 12h --fields time,msg
+    python3 log_archive.py stats
+
+Each block stores its rows sorted by (ticker, time), one zlib-compressed
+column per field, so a ticker query decompresses a few small columns of a
+few blocks. Records without a ticker are indexed under "".
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+LOG_ROOTS = [PROJECT_ROOT / "logs" / "kalshi", PROJECT_ROOT / "logs" / "trading"]
+ARCHIVE_DIR = PROJECT_ROOT / "logs" / "archive"
+INDEX_DB = ARCHIVE_DIR / "index.db"
+
+ROTATE_BYTES = int(os.getenv("LOG_ROTATE_BYTES", str(1 << 20)))
+SETTLE_SECONDS = 600
+BLOCK_ROWS = 2000
+# Trade audit logs (ledger.py rebuilds from them) — archived, never rotated away
+PINNED = {"kalshi/auto_trades", "trading/auto_trades"}
+
+TEXT_LINE_RE = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?:,(\d{3}))? \[(\w+)\] ?(.*)$")
+TICKER_RE = re.compile(r"\b([A-Z][A-Z0-9]{2,}-[A-Z0-9][A-Z0-9.]*(?:-[A-Z0-9.]+)*)\b")
+TIME_KEYS = ("timestamp", "ts")
+TICKER_KEYS = ("ticker", "kalshi_ticker")
+
+
+# ============== SOURCES ==============
+def source_name(path):
+    """logs/kalshi/scanner.log.20260126T010000.closed → "kalshi/scanner"."""
+    name = path.name.split(".")[0]
+    return f"{path.parent.name}/{name}"
+
+
+def live_logs():
+    for root in LOG_ROOTS:
+        if root.is_dir():
+            for path in sorted(root.iterdir()):
+                if path.suffix in (".jsonl", ".log") and path.is_file():
+                    yield path
+
+
+def closed_segments():
+    for root in LOG_ROOTS:
+        if root.is_dir():
+            yield from sorted(root.glob("*.closed"))
+
+
+# ============== PARSING ==============
+def parse_time(value):
+    """ISO string (naive = local time) or epoch number → epoch seconds, or None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_lines(lines, is_text, last_ts=None):
+    """Records from complete log lines. Each gets _ts (epoch) and _ticker.
+    Text continuation lines (tracebacks) are folded into the record above."""
+    records = []
+    for line in lines:
+        if not line.strip():
+            continue
+        if is_text:
+            m = TEXT_LINE_RE.match(line)
+            if not m:
+                if records:
+                    records[-1]["msg"] += "\n" + line
+                    continue
+                rec = {"time": None, "level": None, "msg": line}
+            else:
+                stamp, millis, level, msg = m.groups()
+                ts = time.mktime(time.strptime(stamp, "%Y-%m-%d %H:%M:%S")) + int(millis or 0) / 1000
+                rec = {"time": f"{stamp},{millis}" if millis else stamp, "level": level, "msg": msg}
+                last_ts = ts
+            found = TICKER_RE.search(rec["msg"])
+            rec["_ticker"] = found.group(1) if found else ""
+        else:
+            try:
+                rec = json.loads(line)
+                if not isinstance(rec, dict):
+                    rec = {"_raw": line}
+            except ValueError:
+                rec = {"_raw": line}
+            ts = next((parse_time(rec.get(k)) for k in TIME_KEYS if rec.get(k) is not None), None)
+            if ts is not None:
+                last_ts = ts
+            rec["_ticker"] = next((str(rec[k]) for k in TICKER_KEYS if rec.get(k)), "")
+        rec["_ts"] = last_ts if last_ts is not None else 0.0
+        records.append(rec)
+    return records, last_ts
+
+
+# ============== BLOCKS ==============
+# Block layout: 4-byte header length, JSON header {"rows": n, "columns":
+# {name: [offset, length, encoding]}}, then the compressed columns.
+# "_ts" is packed float64; other columns are JSON lists with missing keys
+# listed separately so records round-trip exactly.
+def encode_block(records):
+    columns = {}
+    for rec in records:
+        for key in rec:
+            columns.setdefault(key, None)
+    blobs, header = [], {"rows": len(records), "columns": {}}
+    offset = 0
+    for name in columns:
+        if name == "_ts":
+            raw, enc = array("d", (r["_ts"] for r in records)).tobytes(), "f8"
+        else:
+            values, missing = [], []
+            for i, rec in enumerate(records):
+                if name in rec:
+                    values.append(rec[name])
+                else:
+                    values.append(None)
+                    missing.append(i)
+            raw, enc = json.dumps({"v": values, "m": missing}, separators=(",", ":")).encode(), "json"
+        blob = zlib.compress(raw, 6)
+        header["columns"][name] = [offset, len(blob), enc]
+        blobs.append(blob)
+        offset += len(blob)
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return len(head).to_bytes(4, "little") + head + b"".join(blobs)
+
+
+class BlockReader:
+    """Lazily decompresses the columns of one block read from disk."""
+
+    def __init__(self, data):
+        n = int.from_bytes(data[:4], "little")
+        self.header = json.loads(data[4:4 + n])
+        self.body = memoryview(data)[4 + n:]
+        self.rows = self.header["rows"]
+        self._cache = {}
+
+    def names(self):
+        return list(self.header["columns"])
+
+    def column(self, name):
+        """(values, missing index set) — values is None if the column is absent."""
+        if name in self._cache:
+            return self._cache[name]
+        spec = self.header["columns"].get(name)
+        if spec is None:
+            result = (None, set(range(self.rows)))
+        else:
+            off, length, enc = spec
+            raw = zlib.decompress(self.body[off:off + length])
+            if enc == "f8":
+                result = (array("d", raw), set())
+            else:
+                col = json.loads(raw)
+                result = (col["v"], set(col["m"]))
+        self._cache[name] = result
+        return result
+
+
+# ============== INDEX ==============
+def connect():
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(INDEX_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS blocks (
+            id        INTEGER PRIMARY KEY,
+            source    TEXT NOT NULL,
+            file      TEXT NOT NULL,     -- relative to ARCHIVE_DIR
+            offset    INTEGER NOT NULL,
+            length    INTEGER NOT NULL,
+            rows      INTEGER NOT NULL,
+            raw_bytes INTEGER NOT NULL,
+            t_min     REAL NOT NULL,
+            t_max     REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS blocks_time ON blocks (source, t_max, t_min);
+        CREATE TABLE IF NOT EXISTS block_tickers (
+            ticker   TEXT NOT NULL,
+            block_id INTEGER NOT NULL,
+            t_min    REAL NOT NULL,
+            t_max    REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS block_tickers_ticker ON block_tickers (ticker, t_max, t_min);
+        CREATE TABLE IF NOT EXISTS cursors (
+            path    TEXT PRIMARY KEY,        -- log file, relative to the project
+            inode   INTEGER NOT NULL,
+            offset  INTEGER NOT NULL,        -- bytes already archived
+            last_ts REAL                     -- for lines without their own time
+        );
+    """)
+    return conn
+
+
+def _rel(path):
+    return str(Path(path).relative_to(PROJECT_ROOT))
+
+
+# ============== COMPACTION ==============
+def rotate(conn, force=False):
+    """Rename live logs over ROTATE_BYTES (all with force) to .closed
+    segments; their archive cursor moves with them. Returns renamed paths."""
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    rotated = []
+    for path in live_logs():
+        if source_name(path) in PINNED:
+            continue
+        size = path.stat().st_size
+        if not size or (size < ROTATE_BYTES and not force):
+            continue
+        target = path.with_name(f"{path.name}.{stamp}.closed")
+        os.replace(path, target)
+        with conn:
+            conn.execute("UPDATE cursors SET path = ? WHERE path = ?", (_rel(target), _rel(path)))
+        rotated.append(target)
+    return rotated
+
+
+def archive_file(conn, path, closed=False):
+    """Archive the bytes of `path` past its cursor (complete lines only,
+    unless the segment is closed and settled). Returns rows archived."""
+    st = path.stat()
+    row = conn.execute("SELECT inode, offset, last_ts FROM cursors WHERE path = ?",
+                       (_rel(path),)).fetchone()
+    offset, last_ts = (row[1], row[2]) if row and row[0] == st.st_ino and row[1] <= st.st_size else (0, None)
+    settled = closed and time.time() - st.st_mtime >= SETTLE_SECONDS
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = len(data) if settled else data.rfind(b"\n") + 1
+    cursor = (_rel(path), st.st_ino, offset + max(end, 0), last_ts)
+    rows = 0
+    if end > 0:
+        chunk = data[:end]
+        records, last_ts = parse_lines(chunk.decode("utf-8", errors="replace").splitlines(),
+                                       is_text=path.name.split(".")[1] == "log", last_ts=last_ts)
+        cursor = cursor[:3] + (last_ts,)
+        rows = write_blocks(conn, source_name(path), records, len(chunk), cursor)
+    if not rows:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?)", cursor)
+    if settled and offset + end >= st.st_size:
+        path.unlink()
+        with conn:
+            conn.execute("DELETE FROM cursors WHERE path = ?", (_rel(path),))
+    return rows
+
+
+def write_blocks(conn, source, records, raw_bytes, cursor):
+    """Append records to a new archive file for `source`, in (ticker, time)
+    order, BLOCK_ROWS per block, and index them — in the same transaction
+    that advances the file's cursor, so a crash never archives lines twice."""
+    if not records:
+        return 0
+    records.sort(key=lambda r: (r["_ticker"], r["_ts"]))
+    out_dir = ARCHIVE_DIR / source
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{time.monotonic_ns() % 10**6}.blk"
+    out = out_dir / name
+    entries = []
+    offset = 0
+    with open(out, "wb") as f:
+        for start in range(0, len(records), BLOCK_ROWS):
+            part = records[start:start + BLOCK_ROWS]
+            blob = encode_block(part)
+            f.write(blob)
+            tickers = {}
+            for r in part:
+                lo, hi = tickers.get(r["_ticker"], (r["_ts"], r["_ts"]))
+                tickers[r["_ticker"]] = (min(lo, r["_ts"]), max(hi, r["_ts"]))
+            ts = [r["_ts"] for r in part]
+            share = raw_bytes * len(part) // len(records)
+            entries.append((offset, len(blob), len(part), share, min(ts), max(ts), tickers))
+            offset += len(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    with conn:
+        for off, length, n, share, t_min, t_max, tickers in entries:
+            cur = conn.execute(
+                "INSERT INTO blocks (source, file, offset, length, rows, raw_bytes, t_min, t_max) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, str(out.relative_to(ARCHIVE_DIR)), off, length, n, share, t_min, t_max))
+            conn.executemany("INSERT INTO block_tickers VALUES (?, ?, ?, ?)",
+                             ((t, cur.lastrowid, lo, hi) for t, (lo, hi) in tickers.items()))
+        conn.execute("INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?)", cursor)
+    return len(records)
+
+
+def compact(rotate_all=False):
+    conn = connect()
+    try:
+        rotated = rotate(conn, force=rotate_all)
+        for path in rotated:
+            print(f"  🔄 rotated {_rel(path)}")
+        total = 0
+        for path in list(closed_segments()):
+            n = archive_file(conn, path, closed=True)
+            total += n
+            gone = "" if path.exists() else " (segment removed)"
+            if n or gone:
+                print(f"  📦 {_rel(path)}: {n} rows{gone}")
+        for path in live_logs():
+            n = archive_file(conn, path)
+            total += n
+            if n:
+                print(f"  📦 {_rel(path)}: {n} rows")
+        print(f"✅ Archived {total} rows")
+    finally:
+        conn.close()
+
+
+# ============== QUERY ==============
+def parse_when(value):
+    """"2026-01-26", "2026-01-26T14:00", "7d", "12h", "30m" → epoch seconds."""
+    if value is None:
+        return None
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([dhm])", value)
+    if m:
+        unit = {"d": 86400, "h": 3600, "m": 60}[m.group(2)]
+        return time.time() - float(m.group(1)) * unit
+    ts = parse_time(value)
+    if ts is None:
+        raise ValueError(f"can't parse time {value!r}")
+    return ts
+
+
+def _block_rows(reader, ticker, since, until, fields):
+    ts, _ = reader.column("_ts")
+    tick, _ = reader.column("_ticker")
+    keep = [i for i in range(reader.rows)
+            if (ticker is None or tick[i] == ticker)
+            and (since is None or ts[i] >= since) and (until is None or ts[i] <= until)]
+    if not keep:
+        return []
+    names = [n for n in reader.names() if n not in ("_ts", "_ticker")]
+    if fields:
+        names = [n for n in names if n in fields]
+    cols = {n: reader.column(n) for n in names}
+    out = []
+    for i in keep:
+        rec = {n: vals[i] for n, (vals, missing) in cols.items() if i not in missing}
+        out.append((ts[i], rec))
+    return out
+
+
+def _live_rows(conn, source, ticker, since, until, fields):
+    """Lines appended after the last compaction, parsed on the fly."""
+    out = []
+    for path in list(closed_segments()) + list(live_logs()):
+        name = source_name(path)
+        if source and name != source:
+            continue
+        row = conn.execute("SELECT inode, offset, last_ts FROM cursors WHERE path = ?",
+                           (_rel(path),)).fetchone()
+        try:
+            st = path.stat()
+            offset, last_ts = (row[1], row[2]) if row and row[0] == st.st_ino and row[1] <= st.st_size else (0, None)
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            continue
+        data = data[:data.rfind(b"\n") + 1]  # a line still being written is skipped
+        records, _ = parse_lines(data.decode("utf-8", errors="replace").splitlines(),
+                                 is_text=path.name.split(".")[1] == "log", last_ts=last_ts)
+        for rec in records:
+            ts = rec.pop("_ts")
+            if ticker is not None and rec.pop("_ticker") != ticker:
+                continue
+            rec.pop("_ticker", None)
+            if (since is None or ts >= since) and (until is None or ts <= until):
+                if fields:
+                    rec = {k: v for k, v in rec.items() if k in fields}
+                out.append((ts, name, rec))
+    return out
+
+
+def query(source=None, ticker=None, since=None, until=None, fields=None, live=True):
+    """[(epoch, source, record)] in time order."""
+    conn = connect()
+    try:
+        sql = "SELECT DISTINCT b.id, b.source, b.file, b.offset, b.length FROM blocks b"
+        where, args = [], []
+        if ticker is not None:
+            sql += " JOIN block_tickers bt ON bt.block_id = b.id"
+            where.append("bt.ticker = ?")
+            args.append(ticker)
+            tmin, tmax = "bt.t_min", "bt.t_max"
+        else:
+            tmin, tmax = "b.t_min", "b.t_max"
+        if source:
+            where.append("b.source = ?")
+            args.append(source)
+        if since is not None:
+            where.append(f"{tmax} >= ?")
+            args.append(since)
+        if until is not None:
+            where.append(f"{tmin} <= ?")
+            args.append(until)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        blocks = conn.execute(sql + " ORDER BY b.file, b.offset", args).fetchall()
+
+        results = []
+        handles = {}
+        try:
+            for _, src, file, off, length in blocks:
+                f = handles.get(file)
+                if f is None:
+                    f = handles[file] = open(ARCHIVE_DIR / file, "rb")
+                f.seek(off)
+                reader = BlockReader(f.read(length))
+                results.extend((ts, src, rec) for ts, rec in _block_rows(reader, ticker, since, until, fields))
+        finally:
+            for f in handles.values():
+                f.close()
+        if live:
+            results.extend(_live_rows(conn, source, ticker, since, until, fields))
+        results.sort(key=lambda r: r[0])
+        return results
+    finally:
+        conn.close()
+
+
+def stats():
+    conn = connect()
+    try:
+        rows = conn.execute(
+            "SELECT source, COUNT(*), SUM(rows), SUM(raw_bytes), SUM(length), MIN(t_min), MAX(t_max) "
+            "FROM blocks GROUP BY source ORDER BY source").fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        print("Archive is empty — run: python3 log_archive.py compact")
+        return
+    print(f"{'source':<28} {'blocks':>6} {'rows':>9} {'raw':>10} {'archived':>10}  span")
+    for source, blocks, n, raw, packed, t_min, t_max in rows:
+        span = f"{datetime.fromtimestamp(t_min):%Y-%m-%d} → {datetime.fromtimestamp(t_max):%Y-%m-%d}"
+        print(f"{source:<28} {blocks:>6} {n:>9} {raw / 1e6:>8.2f}MB {packed / 1e6:>8.2f}MB  {span}")
+
+
+# ============== CLI ==============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact and query the kalshi/trading logs")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("compact", help="Rotate large logs and archive new lines")
+    c.add_argument("--rotate-all", action="store_true", help="Rotate every non-empty log now")
+    q = sub.add_parser("query", help="Print archived records as JSON lines")
+    q.add_argument("--source", help='e.g. "kalshi/opportunities", "kalshi/scanner"')
+    q.add_argument("--ticker")
+    q.add_argument("--since", help='ISO date/time or relative ("7d", "12h", "30m")')
+    q.add_argument("--until")
+    q.add_argument("--fields", help="Comma-separated fields to print")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--no-live", action="store_true", help="Skip lines not yet archived")
+    sub.add_parser("stats", help="Archive size per source")
+    args = parser.parse_args()
+
+    if args.cmd == "compact":
+        compact(rotate_all=args.rotate_all)
+    elif args.cmd == "stats":
+        stats()
+    else:
+        try:
+            since, until = parse_when(args.since), parse_when(args.until)
+        except ValueError as e:
+            sys.exit(f"⚠️ {e}")
+        fields = set(args.fields.split(",")) if args.fields else None
+        results = query(args.source, args.ticker, since, until, fields, live=not args.no_live)
+        if args.limit:
+            results = results[-args.limit:]
+        for ts, source, rec in results:
+            print(json.dumps({"_source": source, "_time": datetime.fromtimestamp(ts).isoformat(), **rec}))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Queue-Backed Structured Logging
+Log calls on the scan/trade path only put the record on a queue; a listener
+thread writes compact JSON lines ({"ts", "level", "logger", "msg", ...fields})
+in batches — every FLUSH_RECORDS records or FLUSH_SECONDS, whichever comes
+first — and reopens the file after log_archive.py rotates it. Console output
+is opt-in (LOG_CONSOLE=1 or --verbose) and also rendered by the listener, so
+nothing blocks on the terminal and no line is written twice. Quiet mode
+(LOG_QUIET=1 or --quiet) keeps only warnings and errors.
+
+    log = logpipe.get_logger("scanner", LOG_DIR / "scanner.jsonl")
+    log.info("🔥 hot opportunity", extra={"fields": {"ticker": t, "roi": 12.5}})
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+from pathlib import Path
+
+FLUSH_RECORDS = 200
+FLUSH_SECONDS = 1.0
+CONSOLE = os.getenv("LOG_CONSOLE", "") == "1"
+QUIET = os.getenv("LOG_QUIET", "") == "1"
+CONSOLE_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+_listeners = {}  # logger name → BatchingListener
+
+
+class JSONLHandler(logging.handlers.WatchedFileHandler):
+    """One compact JSON object per record, written in batches. Reopens the
+    file when it was moved away, like WatchedFileHandler."""
+
+    def __init__(self, path, batch=FLUSH_RECORDS):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(path, encoding="utf-8", delay=True)
+        self.batch = batch
+        self.pending = []
+
+    def format(self, record):
+        rec = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            rec.update(fields)
+        return json.dumps(rec, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def emit(self, record):
+        try:
+            self.pending.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.pending:
+                return
+            if self.stream is None:
+                self.stream = self._open()
+                self._statstream()
+            else:
+                self.reopenIfNeeded()
+            self.stream.write("\n".join(self.pending) + "\n")
+            self.stream.flush()
+            self.pending = []
+        except OSError:
+            pass  # keep the batch; the next flush retries
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Message followed by its structured fields, for the opt-in console."""
+
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += "  " + " ".join(f"{k}={v}" for k, v in fields.items() if v is not None)
+        return text
+
+
+class BatchingListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue has been
+    idle for FLUSH_SECONDS, so a batch never sits unwritten."""
+
+    def __init__(self, q, *handlers, flush_seconds=FLUSH_SECONDS):
+        super().__init__(q, *handlers, respect_handler_level=True)
+        self.flush_seconds = flush_seconds
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+    def stop(self):
+        super().stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+def get_logger(name, path, console=None, quiet=None, console_format=CONSOLE_FORMAT):
+    """
+    Logger `name` whose records go through a queue to a batched JSONL file
+    at `path` (and stderr when console is on). Set up once per name; the
+    listener is stopped — and the last batch written — at exit.
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+    console = CONSOLE if console is None else console
+    quiet = QUIET if quiet is None else quiet
+
+    handlers = [JSONLHandler(path)]
+    if console:
+        handlers.append(_console(console_format))
+    q = queue.SimpleQueue()
+    listener = _listeners[name] = BatchingListener(q, *handlers)
+    listener.start()
+
+    logger.addHandler(logging.handlers.QueueHandler(q))
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _console(console_format):
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(ConsoleFormatter(console_format))
+    return handler
+
+
+def set_mode(logger, console=None, quiet=None, console_format=CONSOLE_FORMAT):
+    """Apply --verbose / --quiet from a CLI to a logger made by get_logger()."""
+    if quiet is not None:
+        logger.setLevel(logging.WARNING if quiet else logging.INFO)
+    listener = _listeners.get(logger.name)
+    if console and listener and not any(type(h) is logging.StreamHandler for h in listener.handlers):
+        listener.handlers += (_console(console_format),)
+
+
+@atexit.register
+def shutdown():
+    """Stop every listener, writing what is still queued."""
+    while _listeners:
+        _listeners.popitem()[1].stop()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Columnar Kalshi Market Store
+Holds a market universe as NumPy columns (prices, volumes, close epoch) plus
+interned titles, instead of one dict per market. Reads like a
+{ticker: market} mapping — store[ticker] is a MarketRow with .get() and
+["field"] like the old dicts — while bulk filters run as array expressions:
+
+    store = MarketStore(markets)
+    short = store.select(store.closing_within(60) & (store.volume >= 500))
+
+Missing numbers are 0 and missing text is "" (no more `or 0` at call sites);
+close_time is parsed once into close_ts (NaN when unknown).
+"""
+
+import sys
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+import numpy as np
+
+PRICE_FIELDS = ("yes_bid", "yes_ask", "no_bid", "no_ask", "last_price")  # cents
+COUNT_FIELDS = ("volume", "volume_24h", "open_interest")
+NUMERIC_FIELDS = PRICE_FIELDS + COUNT_FIELDS
+TEXT_FIELDS = ("title", "category", "event_ticker")
+UNKNOWN_DAYS = 9999  # days_to_resolve() when a market has no close time
+
+
+def parse_ts(value):
+    """ISO-8601 close time → unix seconds (NaN if missing/unparseable)."""
+    if not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return np.nan
+
+
+def format_ts(ts):
+    """Unix seconds → the API's ISO form ("" for NaN)."""
+    if ts != ts:
+        return ""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class MarketRow:
+    """A view of one market in a MarketStore; reads like the old market dict."""
+
+    __slots__ = ("store", "i")
+
+    def __init__(self, store, i):
+        self.store = store
+        self.i = i
+
+    def __getitem__(self, key):
+        return self.store.value(self.i, key)
+
+    def __getattr__(self, name):
+        try:
+            return self.store.value(self.i, name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key):
+        return self.store.has_field(key)
+
+    def get(self, key, default=None):
+        try:
+            return self.store.value(self.i, key)
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        return {key: self.store.value(self.i, key) for key in self.store.fields()}
+
+    def __repr__(self):
+        return f"MarketRow({self.store.tickers[self.i]!r})"
+
+
+class MarketStore(Mapping):
+    """Read-mostly columnar table of markets, keyed by ticker."""
+
+    def __init__(self, markets=()):
+        rows, seen = [], set()
+        for m in markets:
+            ticker = m.get("ticker") if m else None
+            if ticker and ticker not in seen:  # first occurrence wins
+                seen.add(ticker)
+                rows.append(m)
+        n = len(rows)
+
+        self.tickers = [sys.intern(m["ticker"]) for m in rows]
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.text = {f: [sys.intern(m.get(f) or "") for m in rows] for f in TEXT_FIELDS}
+        self.cols = {}
+        for f in PRICE_FIELDS:
+            self.cols[f] = np.fromiter((m.get(f) or 0 for m in rows), dtype=np.int16, count=n)
+        for f in COUNT_FIELDS:
+            self.cols[f] = np.fromiter((m.get(f) or 0 for m in rows), dtype=np.int64, count=n)
+        self.close_ts = np.fromiter(
+            (parse_ts(m.get("close_time") or m.get("expiration_time")) for m in rows),
+            dtype=np.float64, count=n)
+
+    @classmethod
+    def from_events(cls, events):
+        """Store of the markets nested in /events?with_nested_markets pages."""
+        return cls(m for e in events for m in (e.get("markets") or []))
+
+    @classmethod
+    def _from_columns(cls, tickers, text, cols, close_ts):
+        store = cls.__new__(cls)
+        store.tickers = tickers
+        store.index = {t: i for i, t in enumerate(tickers)}
+        store.text = text
+        store.cols = cols
+        store.close_ts = close_ts
+        return store
+
+    # ----- mapping -----
+    def __getitem__(self, ticker):
+        return MarketRow(self, self.index[ticker])
+
+    def __iter__(self):
+        return iter(self.tickers)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self.index
+
+    def __getattr__(self, name):
+        # store.yes_bid, store.volume, ... → the column array
+        cols = self.__dict__.get("cols")
+        if cols is not None and name in cols:
+            return cols[name]
+        raise AttributeError(name)
+
+    # ----- fields -----
+    def fields(self):
+        return ("ticker",) + TEXT_FIELDS + NUMERIC_FIELDS + ("close_time",)
+
+    def has_field(self, key):
+        return key in self.cols or key in self.text or key in ("ticker", "close_time", "close_ts")
+
+    def value(self, i, key):
+        """One field of row i as a plain Python value."""
+        col = self.cols.get(key)
+        if col is not None:
+            return int(col[i])
+        text = self.text.get(key)
+        if text is not None:
+            return text[i]
+        if key == "ticker":
+            return self.tickers[i]
+        if key == "close_time":
+            return format_ts(self.close_ts[i])
+        if key == "close_ts":
+            return float(self.close_ts[i])
+        raise KeyError(key)
+
+    def to_dicts(self):
+        return [MarketRow(self, i).to_dict() for i in range(len(self))]
+
+    # ----- vectorized filters -----
+    def days_to_resolve(self, now=None):
+        """Whole days until close per market (floored, ≥ 0; UNKNOWN_DAYS if unknown)."""
+        now = time.time() if now is None else now
+        with np.errstate(invalid="ignore"):
+            days = np.floor((self.close_ts - now) / 86400)
+        return np.where(np.isnan(days), UNKNOWN_DAYS, np.maximum(days, 0)).astype(np.int64)
+
+    def closing_within(self, days, now=None):
+        """Mask of markets closing within `days` from now (unknown close → False)."""
+        now = time.time() if now is None else now
+        with np.errstate(invalid="ignore"):
+            return self.close_ts <= now + days * 86400
+
+    def select(self, mask):
+        """A new store holding only the rows where `mask` is true (or the given row indices)."""
+        idx = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask, dtype=np.int64)
+        return MarketStore._from_columns(
+            [self.tickers[i] for i in idx],
+            {f: [vals[i] for i in idx] for f, vals in self.text.items()},
+            {f: col[idx] for f, col in self.cols.items()},
+            self.close_ts[idx],
+        )
+
+    def rows(self, mask=None):
+        """Iterate MarketRows (all, or where `mask` is true)."""
+        idx = range(len(self)) if mask is None else np.flatnonzero(mask)
+        for i in idx:
+            yield MarketRow(self, int(i))
+
+    # ----- updates -----
+    def update(self, ticker, quote):
+        """Apply a partial quote ({field: value}) to one market in place.
+        Returns True if any numeric field changed."""
+        i = self.index.get(ticker)
+        if i is None:
+            return False
+        changed = False
+        for key, value in quote.items():
+            col = self.cols.get(key)
+            if col is not None and col[i] != (value or 0):
+                col[i] = value or 0
+                changed = True
+        return changed
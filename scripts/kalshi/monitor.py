@@ -7,18 +7,26 @@ Runs every hour to check positions and find new opportunities.
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import transport
+import polymarket_sync
+from kalshi_api import short_term_markets, get_quotes
 
 from kalshi_python import KalshiClient, Configuration
 
 LOG_DIR = PROJECT_ROOT / "logs" / "kalshi"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Monitor runs hourly next to the auto-trader; its arbitrage_v2 sweep of the
+# same short-term universe is reused if it is at most this old
+SNAPSHOT_MAX_AGE = 900  # seconds
+
 def get_client():
     with open(PROJECT_ROOT / ".kalshi-private-key.pem", "r") as f:
         private_key = f.read()
@@ -27,25 +35,14 @@ def get_client():
     config.private_key_pem = private_key
     return KalshiClient(configuration=config)
 
+def get_markets():
+    """Short-term Kalshi universe as a MarketStore (shared snapshot if fresh)."""
+    return short_term_markets(SNAPSHOT_MAX_AGE)
+
 def get_polymarket_prices():
-    """Get Polymarket prices for arbitrage comparison."""
+    """Get Polymarket prices for arbitrage comparison (every open market)."""
     try:
-        url = "https://gamma-api.polymarket.com/markets"
-        response = requests.get(url, params={"closed": "false", "limit": 100}, timeout=30)
-        data = response.json()
-        
-        prices = {}
-        for m in data:
-            question = m.get('question', '').lower()
-            prices_raw = m.get('outcomePrices', '[]')
-            if isinstance(prices_raw, str):
-                prices_list = json.loads(prices_raw)
-            else:
-                prices_list = prices_raw
-            
-            if len(prices_list) >= 2:
-                prices[question] = float(prices_list[0]) * 100
-        return prices
+        return {m['title'].lower(): m['yes'] for m in polymarket_sync.open_markets(timeout=30)}
     except:
         return {}
 
@@ -73,13 +70,15 @@ def check_portfolio(client):
     total_cost = 0
     total_value = 0
     
+    # One batched quote fetch for every position
+    quotes = get_quotes(positions)
+    
     for ticker, pos in positions.items():
-        try:
-            market = client._markets_api.get_market(ticker=ticker)
-            m = market.market if hasattr(market, 'market') else market
-            title = m.title[:50] if hasattr(m, 'title') else ticker
-            yes_bid = m.yes_bid / 100 if hasattr(m, 'yes_bid') else 0.5
-        except:
+        m = quotes.get(ticker)
+        if m:
+            title = m.get('title', ticker)[:50]
+            yes_bid = (m.get('yes_bid', 0) or 0) / 100
+        else:
             title = ticker
             yes_bid = 0.5
         
@@ -120,10 +119,8 @@ def check_arbitrage():
         print("Could not fetch Polymarket prices")
         return []
     
-    # Get Kalshi markets
-    url = "https://api.elections.kalshi.com/trade-api/v2/events"
-    response = requests.get(url, params={"status": "open", "limit": 200, "with_nested_markets": "true"}, timeout=30)
-    events = response.json().get('events', [])
+    # Get Kalshi markets (volume floor applied as a column filter)
+    markets = get_markets()
     
     opportunities = []
     
@@ -138,29 +135,36 @@ def check_arbitrage():
         ('elon', 'trillionaire'),
     ]
     
-    for e in events:
-        for m in e.get('markets', []):
-            title = m.get('title', '').lower()
-            yes_bid = m.get('yes_bid', 0)
-            volume = m.get('volume', 0)
-            
-            if volume < 1000:
-                continue
-            
-            # Check against Polymarket
-            for poly_q, poly_yes in poly_prices.items():
-                # Simple keyword matching
-                if any(all(kw in title and kw in poly_q for kw in comp) for comp in comparisons):
-                    spread = abs(yes_bid - poly_yes)
-                    if spread > 5:
-                        opportunities.append({
-                            'kalshi': m.get('title', '')[:50],
-                            'kalshi_yes': yes_bid,
-                            'polymarket': poly_q[:50],
-                            'poly_yes': poly_yes,
-                            'spread': spread,
-                            'volume': volume
-                        })
+    # Which comparisons each Polymarket question satisfies, worked out once —
+    # only questions matching at least one are compared with Kalshi titles
+    poly_matches = []
+    for poly_q, poly_yes in poly_prices.items():
+        comps = {i for i, comp in enumerate(comparisons) if all(kw in poly_q for kw in comp)}
+        if comps:
+            poly_matches.append((poly_q, poly_yes, comps))
+    
+    for m in markets.rows(markets.volume >= 1000):
+        title = m['title'].lower()
+        yes_bid = m['yes_bid']
+        volume = m['volume']
+        title_comps = {i for i, comp in enumerate(comparisons) if all(kw in title for kw in comp)}
+        if not title_comps:
+            continue
+        
+        # Check against Polymarket
+        for poly_q, poly_yes, comps in poly_matches:
+            # Simple keyword matching
+            if comps & title_comps:
+                spread = abs(yes_bid - poly_yes)
+                if spread > 5:
+                    opportunities.append({
+                        'kalshi': m['title'][:50],
+                        'kalshi_yes': yes_bid,
+                        'polymarket': poly_q[:50],
+                        'poly_yes': poly_yes,
+                        'spread': spread,
+                        'volume': volume
+                    })
     
     if opportunities:
         opportunities.sort(key=lambda x: -x['spread'])
@@ -180,50 +184,50 @@ def check_new_opportunities(client):
     print("🎯 NEW OPPORTUNITIES")
     print("="*70)
     
-    url = "https://api.elections.kalshi.com/trade-api/v2/events"
-    response = requests.get(url, params={"status": "open", "limit": 200, "with_nested_markets": "true"}, timeout=30)
-    events = response.json().get('events', [])
+    markets = get_markets()
     
     opportunities = []
     
-    for e in events:
-        for m in e.get('markets', []):
-            yes_bid = m.get('yes_bid', 0) or 0
-            yes_ask = m.get('yes_ask', 0) or 0
-            volume = m.get('volume', 0) or 0
-            ticker = m.get('ticker', '').lower()
-            
-            # Skip esports and low volume
-            if 'esport' in ticker or 'multigame' in ticker or volume < 5000:
-                continue
-            
-            # High confidence NO (YES <= 10%)
-            if yes_ask <= 10 and yes_ask > 0:
-                roi = (yes_ask / (100 - yes_bid)) * 100
-                opportunities.append({
-                    'type': 'NO',
-                    'title': m.get('title', '')[:50],
-                    'ticker': m.get('ticker'),
-                    'yes_price': yes_ask,
-                    'cost': 100 - yes_bid,
-                    'profit': yes_bid,
-                    'roi': roi,
-                    'volume': volume
-                })
-            
-            # High confidence YES (>= 90%)
-            elif yes_bid >= 90:
-                roi = ((100 - yes_ask) / yes_ask) * 100
-                opportunities.append({
-                    'type': 'YES',
-                    'title': m.get('title', '')[:50],
-                    'ticker': m.get('ticker'),
-                    'yes_price': yes_ask,
-                    'cost': yes_ask,
-                    'profit': 100 - yes_ask,
-                    'roi': roi,
-                    'volume': volume
-                })
+    # Volume floor and price bands as column filters; only hits are visited
+    yes_bid, yes_ask = markets.yes_bid, markets.yes_ask
+    mask = (markets.volume >= 5000) & (((yes_ask <= 10) & (yes_ask > 0)) | (yes_bid >= 90))
+    for m in markets.rows(mask):
+        yes_bid = m['yes_bid']
+        yes_ask = m['yes_ask']
+        volume = m['volume']
+        ticker = m['ticker'].lower()
+        
+        # Skip esports
+        if 'esport' in ticker or 'multigame' in ticker:
+            continue
+        
+        # High confidence NO (YES <= 10%)
+        if yes_ask <= 10 and yes_ask > 0:
+            roi = (yes_ask / (100 - yes_bid)) * 100
+            opportunities.append({
+                'type': 'NO',
+                'title': m['title'][:50],
+                'ticker': m['ticker'],
+                'yes_price': yes_ask,
+                'cost': 100 - yes_bid,
+                'profit': yes_bid,
+                'roi': roi,
+                'volume': volume
+            })
+        
+        # High confidence YES (>= 90%)
+        elif yes_bid >= 90:
+            roi = ((100 - yes_ask) / yes_ask) * 100
+            opportunities.append({
+                'type': 'YES',
+                'title': m['title'][:50],
+                'ticker': m['ticker'],
+                'yes_price': yes_ask,
+                'cost': yes_ask,
+                'profit': 100 - yes_ask,
+                'roi': roi,
+                'volume': volume
+            })
     
     if opportunities:
         opportunities.sort(key=lambda x: -x['roi'])
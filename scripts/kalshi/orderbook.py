@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Local Kalshi Order Books
+In-memory books for the tickers we hold, built from a snapshot and kept
+current from `orderbook_delta` messages, so exit logic can read best bid and
+depth without a network call.
+
+Kalshi books are bid-only per side: `yes` holds YES bids and `no` holds NO
+bids (a YES ask at p is a NO bid at 100 - p). Prices are cents.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kalshi_api import fetch_public
+from ratelimit import PRIORITY_EXIT
+
+SEED_WORKERS = 8
+
+
+class OrderBook:
+    """Price → resting contracts, per side, for one market."""
+
+    __slots__ = ("ticker", "yes", "no", "stale")
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.yes = {}
+        self.no = {}
+        self.stale = True  # no snapshot yet, or a delta was missed
+
+    def apply_snapshot(self, msg):
+        self.yes = {int(p): int(q) for p, q in (msg.get("yes") or []) if q > 0}
+        self.no = {int(p): int(q) for p, q in (msg.get("no") or []) if q > 0}
+        self.stale = False
+
+    def apply_delta(self, msg):
+        levels = self.yes if msg.get("side") == "yes" else self.no
+        price = int(msg["price"])
+        qty = levels.get(price, 0) + int(msg["delta"])
+        if qty > 0:
+            levels[price] = qty
+        else:
+            levels.pop(price, None)
+
+    # ----- queries -----
+    def best_bid(self, side):
+        levels = self.yes if side == "yes" else self.no
+        return max(levels) if levels else 0
+
+    def best_ask(self, side):
+        other = self.no if side == "yes" else self.yes
+        return 100 - max(other) if other else 0
+
+    def depth(self, side, levels=5):
+        """Top `levels` bids for `side` as [(price, qty)], best first."""
+        book = self.yes if side == "yes" else self.no
+        return sorted(book.items(), reverse=True)[:levels]
+
+    def liquidity(self, side, min_price):
+        """Contracts bid on `side` at min_price or better."""
+        book = self.yes if side == "yes" else self.no
+        return sum(q for p, q in book.items() if p >= min_price)
+
+    def sell_price(self, side, count):
+        """Worst price reached selling `count` contracts into the bids
+        (0 if the book can't absorb them)."""
+        filled = 0
+        for price, qty in self.depth(side, levels=100):
+            filled += qty
+            if filled >= count:
+                return price
+        return 0
+
+
+class BookSet:
+    """
+    Order books for a set of tickers. seed() loads REST snapshots
+    concurrently; on_message() is the stream callback that keeps them current.
+    Stream sequence numbers are per subscription, so a gap marks every book
+    stale until the next snapshot. Snapshot and stream failures are reported
+    through `log`.
+    """
+
+    def __init__(self, tickers=(), log=print):
+        self.books = {t: OrderBook(t) for t in tickers}
+        self.log = log
+        self.lock = threading.Lock()
+        self.seq = {}  # subscription id → last sequence number
+
+    def get(self, ticker):
+        """Live book for `ticker`, or None if missing/stale."""
+        book = self.books.get(ticker)
+        return book if book and not book.stale else None
+
+    def seed(self, tickers=None):
+        """Fetch snapshots for `tickers` (default: every stale book)."""
+        with self.lock:
+            todo = list(tickers or [t for t, b in self.books.items() if b.stale])
+            for t in todo:
+                self.books.setdefault(t, OrderBook(t))
+        if not todo:
+            return
+
+        def fetch(ticker):
+            try:
+                return ticker, fetch_public(f"/markets/{ticker}/orderbook", timeout=15,
+                                             priority=PRIORITY_EXIT).get("orderbook") or {}
+            except Exception as e:
+                self.log(f"  ⚠️ orderbook {ticker}: {e}")
+                return ticker, None
+
+        with ThreadPoolExecutor(max_workers=SEED_WORKERS) as pool:
+            for ticker, snap in pool.map(fetch, todo):
+                if snap is not None:
+                    with self.lock:
+                        self.books[ticker].apply_snapshot(snap)
+
+    def on_message(self, kind, msg):
+        """Stream callback for the orderbook_delta channel."""
+        with self.lock:
+            sid, seq = msg.get("sid"), msg.get("seq")
+            if seq is not None:
+                last = self.seq.get(sid)
+                self.seq[sid] = seq
+                if last is not None and seq != last + 1:
+                    for b in self.books.values():
+                        b.stale = True
+            book = self.books.get(msg.get("market_ticker"))
+            if book is None:
+                return
+            if kind == "orderbook_snapshot":
+                book.apply_snapshot(msg)
+            elif kind == "orderbook_delta" and not book.stale:
+                book.apply_delta(msg)
+
+    def follow(self, url=None, headers=None, duration=None):
+        """Keep books current from the WebSocket feed in a background thread
+        (for `duration` seconds, None = forever)."""
+        from stream import WS_URL, run_stream
+
+        thread = threading.Thread(
+            target=run_stream,
+            args=(list(self.books), self.on_message),
+            kwargs={"url": url or WS_URL, "channels": ("orderbook_delta",), "headers": headers,
+                    "duration": duration, "log": self.log},
+            daemon=True, name="orderbook-stream",
+        )
+        thread.start()
+        return thread
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Incremental Rule Matching
+Keeps the result of keyword-rule matching between runs (SQLite, WAL): for
+every rule, which Kalshi ticker and which external market it resolved to,
+plus a title fingerprint per market per source. A run then only
+
+  - re-matches against markets that are new or retitled since last run,
+  - fully re-resolves a rule when the market it pointed at vanished or was
+    retitled (or the rule itself is new),
+  - re-prices a pair when its quotes moved.
+
+so steady-state cost follows churn, not universe size. First-match
+semantics are kept: a rule's match is the first market (snapshot order)
+whose title contains all of its keywords.
+
+    table = PairTable()
+    opps, stats = table.match(kalshi, {"polymarket": poly, ...}, MATCH_RULES, price)
+"""
+
+import json
+import hashlib
+import sqlite3
+from pathlib import Path
+
+from keyword_index import TitleIndex
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PAIRS_DB = PROJECT_ROOT / "logs" / "kalshi" / "pairs.db"
+KALSHI = "kalshi"
+
+
+def fingerprint(text):
+    return hashlib.blake2b((text or "").encode(), digest_size=8).hexdigest()
+
+
+def rule_signature(name, k_kw, e_kw):
+    return f"{name}|{','.join(k_kw)}|{','.join(e_kw)}"
+
+
+class _Source:
+    """One source's titles this run, with its churn against the last run."""
+
+    def __init__(self, titles, known):
+        self.titles = titles  # key → title, snapshot order
+        self.fps = {k: fingerprint(t) for k, t in titles.items()}
+        self.changed = [k for k, fp in self.fps.items() if known.get(k) != fp]
+        self.changed_set = set(self.changed)
+        self.removed = [k for k in known if k not in titles]
+        self.changed_index = TitleIndex((k, titles[k]) for k in self.changed)
+        self._full = None
+        self._pos = None
+
+    def full_index(self):
+        if self._full is None:
+            self._full = TitleIndex(self.titles.items())
+        return self._full
+
+    def pos(self, key):
+        if self._pos is None:
+            self._pos = {k: i for i, k in enumerate(self.titles)}
+        return self._pos[key]
+
+    def resolve(self, cached, keywords, known_rule):
+        """First key whose title contains `keywords`, given last run's answer."""
+        if not known_rule or (cached is not None and (cached not in self.titles or cached in self.changed_set)):
+            return self.full_index().first(keywords)
+        hit = self.changed_index.first(keywords)
+        if hit is None:
+            return cached
+        if cached is None:
+            return hit
+        return hit if self.pos(hit) < self.pos(cached) else cached
+
+
+class PairTable:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else PAIRS_DB
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS titles (
+                source TEXT NOT NULL,
+                key    TEXT NOT NULL,
+                fp     TEXT NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS pairs (
+                rule     TEXT PRIMARY KEY,
+                ticker   TEXT,
+                ext      TEXT NOT NULL,   -- JSON {source: key or null}
+                quote_fp TEXT,
+                opp      TEXT             -- JSON opportunity or null
+            )
+        """)
+        return conn
+
+    def reset(self):
+        """Forget everything — the next match() is a full one."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM titles")
+                conn.execute("DELETE FROM pairs")
+        finally:
+            conn.close()
+
+    def match(self, kalshi, externals, rules, price, stale=()):
+        """
+        Resolve `rules` [(name, kalshi keywords, external keywords)] against
+        kalshi {ticker: market} and externals {source: {key: market}} (later
+        sources win, as in match_strict). price(name, kalshi_market,
+        ext_market) → opportunity dict or None.
+        Sources named in `stale` (late or failed this run) and empty ones
+        are left out: their cached titles and pairs are kept for next run.
+        Returns (opportunities, stats).
+        """
+        stats = {"changed": 0, "removed": 0, "rematched": 0, "repriced": 0}
+        if not kalshi:
+            return [], stats
+        skipped = {n for n, markets in externals.items() if not markets} | set(stale)
+        conn = self._connect()
+        try:
+            known = {}
+            for source, key, fp in conn.execute("SELECT source, key, fp FROM titles"):
+                known.setdefault(source, {})[key] = fp
+            pairs = {row[0]: row[1:] for row in conn.execute(
+                "SELECT rule, ticker, ext, quote_fp, opp FROM pairs")}
+
+            sources = {KALSHI: _Source({t: m["title"] for t, m in kalshi.items()}, known.get(KALSHI, {}))}
+            for name, markets in externals.items():
+                if name in skipped:
+                    continue
+                sources[name] = _Source({k: e.get("title", k) for k, e in markets.items()},
+                                        known.get(name, {}))
+            ext_names = [n for n in sources if n != KALSHI]
+
+            opps = []
+            stats["changed"] = sum(len(s.changed) for s in sources.values())
+            stats["removed"] = sum(len(s.removed) for s in sources.values())
+            updates = []
+            for name, k_kw, e_kw in rules:
+                sig = rule_signature(name, k_kw, e_kw)
+                row = pairs.get(sig)
+                old_ticker, old_ext, old_qfp, old_opp = row if row else (None, "{}", None, None)
+                old_ext = json.loads(old_ext)
+
+                ticker = sources[KALSHI].resolve(old_ticker, k_kw, row is not None)
+                ext = {n: sources[n].resolve(old_ext.get(n), e_kw, row is not None and n in old_ext)
+                       for n in ext_names}
+                if ext != {n: old_ext.get(n) for n in ext_names} or ticker != old_ticker:
+                    stats["rematched"] += 1
+                ext.update((n, old_ext[n]) for n in skipped if n in old_ext)  # until it's back
+
+                # Last source with a match wins
+                best = next(((n, ext[n]) for n in reversed(ext_names) if ext[n] is not None), None)
+                opp, qfp = None, None
+                if ticker is not None and best is not None:
+                    k_match = kalshi[ticker]
+                    ext_market = externals[best[0]][best[1]]
+                    qfp = fingerprint(json.dumps([
+                        best, k_match.get("yes_bid"), k_match.get("last_price"),
+                        k_match.get("no_bid"), k_match.get("volume"),
+                        ext_market.get("yes"), ext_market.get("source")]))
+                    if qfp == old_qfp and ticker == old_ticker:
+                        opp = json.loads(old_opp) if old_opp else None
+                    else:
+                        opp = price(name, k_match, ext_market)
+                        stats["repriced"] += 1
+                if opp:
+                    opps.append(opp)
+
+                new_row = (ticker, json.dumps(ext, sort_keys=True), qfp,
+                           json.dumps(opp) if opp else None)
+                if row is None or new_row != (row[0], json.dumps(old_ext, sort_keys=True), row[2], row[3]):
+                    updates.append((sig,) + new_row)
+
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?)", updates)
+                live = {rule_signature(*r) for r in rules}
+                conn.executemany("DELETE FROM pairs WHERE rule = ?",
+                                 ((sig,) for sig in pairs if sig not in live))
+                for source_name, src in sources.items():
+                    conn.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?)",
+                                     ((source_name, k, src.fps[k]) for k in src.changed))
+                    conn.executemany("DELETE FROM titles WHERE source = ? AND key = ?",
+                                     ((source_name, k) for k in src.removed))
+            return opps, stats
+        finally:
+            conn.close()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Polymarket Universe Sync
+Pages through every open market on the Gamma API (limit/offset, WAVE pages
+in flight at a time) instead of the first 100-200, and keeps the decoded
+result in SQLite (WAL) between runs. A market is only re-parsed when its
+updatedAt, outcomePrices or volume changed since the last sync, and only
+those rows are written; markets that stopped appearing are dropped after a
+complete sync (an incomplete or empty one keeps its changes, returns the
+stored universe and is not reused). A sync younger than SYNC_TTL seconds is
+reused without touching the network, so the scanners, monitor and
+arbitrage.py share one pass.
+
+    records = polymarket_sync.open_markets()   # [{"id", "title", "yes", "no", ...}]
+"""
+
+import os
+import json
+import time
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import transport
+from fastjson import loads
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+POLY_DB = PROJECT_ROOT / "logs" / "kalshi" / "polymarket.db"
+GAMMA_MARKETS = "https://gamma-api.polymarket.com/markets"
+PAGE_LIMIT = 500
+WAVE = int(os.getenv("POLYMARKET_SYNC_WAVE", "8"))        # pages in flight
+MAX_PAGES = int(os.getenv("POLYMARKET_SYNC_MAX_PAGES", "200"))
+SYNC_TTL = float(os.getenv("POLYMARKET_SYNC_TTL", "60"))  # seconds
+
+
+def decode_prices(raw):
+    """outcomePrices (JSON string or list) → list of floats, or None."""
+    try:
+        prices = json.loads(raw) if isinstance(raw, str) else raw
+        return [float(p) for p in prices]
+    except (ValueError, TypeError):
+        return None
+
+
+def _fingerprint(m):
+    return f"{m.get('updatedAt')}|{m.get('outcomePrices')}|{m.get('volumeNum', m.get('volume'))}"
+
+
+def _parse(m):
+    """Decoded record for one Gamma market, or None if it has no YES/NO price."""
+    prices = decode_prices(m.get("outcomePrices", "[]"))
+    if not prices or len(prices) < 2:
+        return None
+    yes = prices[0] * 100
+    return {
+        "id": str(m.get("id")),
+        "title": m.get("question", ""),
+        "yes": yes,
+        "no": 100 - yes,
+        "volume": m.get("volumeNum", m.get("volume", 0)),
+        "end_date": m.get("endDate"),
+        "updated_at": m.get("updatedAt"),
+        "source": "polymarket",
+    }
+
+
+def fetch_pages(timeout=15, wave=WAVE, max_pages=MAX_PAGES, log=print):
+    """
+    Every open market, in offset order. The first page tells how many rows
+    the API actually returns per page (it may cap `limit`); the rest are
+    requested `wave` at a time at multiples of that, and paging ends at the
+    first empty page. Returns (markets, complete) — complete is False if a
+    page failed or max_pages was hit.
+    """
+    def fetch(offset):
+        r = transport.get(GAMMA_MARKETS, params={"closed": "false", "limit": PAGE_LIMIT,
+                                                 "offset": offset}, timeout=timeout)
+        r.raise_for_status()
+        return loads(r.content)
+
+    try:
+        pages = [fetch(0)]
+    except Exception as e:
+        log(f"    ⚠️ Polymarket page failed: {e}")
+        return [], False
+    step, complete = len(pages[0]), not pages[0]
+    with ThreadPoolExecutor(max_workers=wave, thread_name_prefix="polymarket") as pool:
+        for start in range(1, max_pages if step else 1, wave):
+            offsets = [p * step for p in range(start, min(start + wave, max_pages))]
+            try:
+                batch = list(pool.map(fetch, offsets))
+            except Exception as e:
+                log(f"    ⚠️ Polymarket page failed: {e}")
+                break
+            pages.extend(batch)
+            if any(not page for page in batch):
+                complete = True
+                break
+
+    markets, seen = [], set()
+    for page in pages:
+        for m in page:
+            key = m.get("id")
+            if key is not None and key not in seen:  # offsets shift while paging
+                seen.add(key)
+                markets.append(m)
+    return markets, complete
+
+
+class PolymarketSync:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else POLY_DB
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS markets (
+                id     TEXT PRIMARY KEY,
+                fp     TEXT NOT NULL,
+                pos    INTEGER NOT NULL,   -- offset order of the last sync
+                record TEXT                -- decoded JSON, null if unpriced
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)")
+        return conn
+
+    def _stored(self, conn):
+        # One decode for the whole universe instead of one json.loads per row
+        (blob,) = conn.execute(
+            "SELECT group_concat(record, ',') FROM "
+            "(SELECT record FROM markets WHERE record IS NOT NULL ORDER BY pos)").fetchone()
+        return loads(f"[{blob}]") if blob else []
+
+    def sync(self, max_age=None, timeout=15, log=print):
+        """Return (records, stats). Reuses the stored universe if the last
+        complete sync is younger than max_age (default SYNC_TTL). Only new or
+        changed markets are parsed and written; an empty or incomplete fetch
+        falls back to the stored universe."""
+        max_age = SYNC_TTL if max_age is None else max_age
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+            if row and max_age > 0 and time.time() - row[0] <= max_age:
+                records = self._stored(conn)
+                return records, {"cached": True, "age": time.time() - row[0], "markets": len(records)}
+
+            markets, complete = fetch_pages(timeout=timeout, log=log)
+            complete = complete and bool(markets)
+            known = {k: (fp, pos) for k, fp, pos in conn.execute("SELECT id, fp, pos FROM markets")}
+            upserts, moved, seen = [], [], set()
+            for pos, m in enumerate(markets):
+                key, fp = str(m["id"]), _fingerprint(m)
+                seen.add(key)
+                old = known.get(key)
+                if old is None or old[0] != fp:
+                    record = _parse(m)
+                    upserts.append((key, fp, pos, json.dumps(record) if record else None))
+                elif old[1] != pos:
+                    moved.append((pos, key))
+
+            removed = [k for k in known if k not in seen] if complete else []
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?)", upserts)
+                conn.executemany("UPDATE markets SET pos = ? WHERE id = ?", moved)
+                conn.executemany("DELETE FROM markets WHERE id = ?", ((k,) for k in removed))
+                if complete:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)", (time.time(),))
+            records = self._stored(conn)
+            stats = {"cached": False, "markets": len(records), "fetched": len(markets),
+                     "changed": len(upserts), "removed": len(removed), "complete": complete}
+            return records, stats
+        finally:
+            conn.close()
+
+
+def open_markets(max_age=None, timeout=15, log=print):
+    """Decoded records of every open, priced Polymarket market (see sync())."""
+    try:
+        records, stats = PolymarketSync().sync(max_age=max_age, timeout=timeout, log=log)
+    except sqlite3.Error as e:
+        log(f"    ⚠️ Polymarket sync store unavailable ({e}) — fetching without it")
+        markets, _ = fetch_pages(timeout=timeout, log=log)
+        return [r for r in map(_parse, markets) if r]
+    if stats["cached"]:
+        log(f"    ♻️ Polymarket: sync {stats['age']:.0f}s old ({stats['markets']} markets)")
+    else:
+        note = "" if stats["complete"] else " — incomplete, serving the stored universe"
+        log(f"    🔄 Polymarket: {stats['fetched']} fetched, {stats['changed']} new/changed, "
+            f"{stats['removed']} gone{note}")
+    return records
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Kalshi Rate-Limit Scheduler
+One token bucket for every Kalshi request in the process, with strict
+priorities: while an order or exit is waiting, no scan/pagination request is
+allowed through. The rate adapts to the API — halved on a 429 (honouring
+Retry-After), nudged back up after a run of successes, and capped by the
+X-RateLimit-* headers when the server sends them (Limit is a count per
+RATE_WINDOW seconds; the headers can lower the rate, never raise it above
+RATE_PER_SEC).
+
+    with SCHEDULER.slot(PRIORITY_ORDER):
+        client._portfolio_api.create_order(...)
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+# Priorities — lower number wins
+PRIORITY_ORDER = 0   # order placement
+PRIORITY_EXIT = 1    # exits, held-position books
+PRIORITY_QUOTE = 2   # batched quotes / single-market reads
+PRIORITY_SCAN = 3    # bulk pagination
+
+RATE_PER_SEC = float(os.getenv("KALSHI_RATE_PER_SEC", "10"))
+BURST = int(os.getenv("KALSHI_RATE_BURST", "10"))
+RATE_WINDOW = float(os.getenv("KALSHI_RATE_WINDOW", "1"))  # seconds X-RateLimit-Limit counts over
+MIN_RATE = 1.0
+RECOVER_AFTER = 20     # successes before raising the rate again
+RECOVER_STEP = 0.5     # requests/sec added per recovery
+
+
+class RateScheduler:
+    def __init__(self, rate=RATE_PER_SEC, burst=BURST, window=RATE_WINDOW):
+        self.ceiling = rate
+        self.window = window
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.successes = 0
+        self.waiting = [0, 0, 0, 0]
+        self.cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority=PRIORITY_SCAN):
+        """Block until a request of `priority` may be sent."""
+        with self.cond:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self.blocked_until:
+                        self.cond.wait(self.blocked_until - now)
+                        continue
+                    if any(self.waiting[:priority]):
+                        self.cond.wait(0.05)  # a higher priority goes first
+                        continue
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    self.cond.wait((1 - self.tokens) / self.rate)
+            finally:
+                self.waiting[priority] -= 1
+                self.cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority=PRIORITY_SCAN):
+        """Acquire around a call made outside transport (e.g. the SDK client);
+        a 429 raised inside still backs the scheduler off."""
+        self.acquire(priority)
+        try:
+            yield
+        except Exception as e:
+            if getattr(e, "status", None) == 429:
+                self.backoff()
+            raise
+
+    # ----- learning -----
+    def observe(self, response):
+        """Update the rate from a response's status and rate-limit headers."""
+        headers = response.headers
+        with self.cond:
+            limit = headers.get("X-RateLimit-Limit")
+            if limit:
+                try:
+                    self.max_rate = max(MIN_RATE, min(self.ceiling, float(limit) / self.window))
+                    self.rate = min(self.rate, self.max_rate)
+                except ValueError:
+                    pass
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining == "0" and reset:
+                try:
+                    self._block(_seconds_until(float(reset)))
+                except ValueError:
+                    pass
+
+        if response.status_code == 429:
+            retry_after = headers.get("Retry-After")
+            try:
+                self.backoff(float(retry_after) if retry_after else None)
+            except ValueError:
+                self.backoff()
+            return
+
+        with self.cond:
+            self.successes += 1
+            if self.successes >= RECOVER_AFTER and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + RECOVER_STEP)
+                self.successes = 0
+
+    def backoff(self, retry_after=None):
+        """Halve the rate and pause everyone (Retry-After, else one refill)."""
+        with self.cond:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.successes = 0
+            self.tokens = 0
+            self._block(retry_after if retry_after is not None else 1 / self.rate)
+            self.cond.notify_all()
+
+    def _block(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(0, seconds))
+
+
+def _seconds_until(reset):
+    """X-RateLimit-Reset may be a delay or an epoch timestamp."""
+    return reset - time.time() if reset > 1e9 else reset
+
+
+SCHEDULER = RateScheduler()
@@ -9,7 +9,7 @@ source .venv/bin/activate
 INTERVAL=${1:-300}
 
 echo "Starting Kalshi Scanner (interval: ${INTERVAL}s)"
-echo "Logs: logs/kalshi/scanner.log"
+echo "Logs: logs/kalshi/scanner.jsonl (add --verbose for console output)"
 echo "Opportunities: logs/kalshi/opportunities.jsonl"
 echo ""
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Adaptive Per-Market Scan Scheduler
+Instead of refreshing the whole universe every SCAN_INTERVAL, every market
+gets its own refresh interval, set from
+
+  - days to resolution (a market closing in 2 days is looked at every
+    ~30s, one 80+ days out every ~30 min),
+  - recent quote volatility (EWMA of |Δmid| per √minute between refreshes),
+  - how close its quotes sit to a price level where a scanner tier switches
+    on (e.g. YES ask 15¢ / YES bid 85¢),
+
+and each cycle fetches only the markets that are due, most overdue first,
+within a request budget (token bucket in requests/sec). So API calls go
+where edge appears fast without raising total request volume.
+
+    sched = ScanScheduler(store, levels={"yes_ask": (15, 10, 8), "yes_bid": (85, 90, 92)},
+                          budget_rate=0.06)
+    tickers = sched.due(limit=sched.affordable() * QUOTE_CHUNK)
+    sched.observe(get_quotes(tickers), tickers, requests=chunks)
+"""
+
+import time
+
+import numpy as np
+
+from market_store import MarketStore, NUMERIC_FIELDS
+
+# (days to resolve ≤ N, base interval seconds)
+DAY_INTERVALS = ((2, 30), (7, 60), (30, 180), (90, 600))
+FAR_INTERVAL = 1800        # beyond the last band (or unknown close)
+MIN_INTERVAL = 15
+MAX_INTERVAL = 3600
+VOL_SCALE = 1.0            # ¢/√min of mid movement that halves the interval
+VOL_ALPHA = 0.3            # EWMA weight of the newest observation
+NEAR_LEVEL = ((2, 0.25), (5, 0.5))  # (within N¢ of a tier level, interval factor)
+
+
+class ScanScheduler:
+    def __init__(self, store, levels=None, budget_rate=1.0, burst=4.0, now=None):
+        """
+        store: the universe (MarketStore); refreshed quotes are applied to it.
+        levels: {column: price levels where a tier switches on}.
+        budget_rate: requests/sec allowed on average; burst: bucket size.
+        """
+        self.levels = levels or {}
+        self.budget_rate = budget_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.time() if now is None else now
+        self.store = MarketStore()
+        self.reset_universe(store, now)
+
+    # ----- universe -----
+    def reset_universe(self, store, now=None):
+        """Adopt a freshly loaded universe. Markets seen before keep their
+        volatility estimate; every market counts as just refreshed."""
+        now = time.time() if now is None else now
+        old, n = self.store, len(store)
+        vol = np.zeros(n)
+        for i, ticker in enumerate(store.tickers):
+            j = old.index.get(ticker)
+            if j is not None:
+                vol[i] = self.vol[j]
+        self.store = store
+        self.vol = vol
+        self.mid = self._mid(np.arange(n))
+        self.refreshed = np.full(n, now)
+        self.interval = self.intervals(now=now)
+        self.next_due = now + self.interval
+
+    def _mid(self, rows):
+        return (self.store.yes_bid[rows].astype(np.float64) + self.store.yes_ask[rows]) / 2
+
+    # ----- intervals -----
+    def intervals(self, rows=None, now=None):
+        """Refresh interval (seconds) for each row (all rows by default)."""
+        rows = np.arange(len(self.store)) if rows is None else np.asarray(rows)
+        days = self.store.days_to_resolve(now)[rows]
+        base = np.full(len(rows), float(FAR_INTERVAL))
+        for limit, seconds in reversed(DAY_INTERVALS):
+            base = np.where(days <= limit, seconds, base)
+
+        factor = 1.0 / (1.0 + self.vol[rows] / VOL_SCALE)
+        near = np.ones(len(rows))
+        for column, levels in self.levels.items():
+            prices = getattr(self.store, column)[rows].astype(np.int32)
+            distance = np.min([np.abs(prices - level) for level in levels], axis=0)
+            for within, f in NEAR_LEVEL:
+                near = np.where((prices > 0) & (distance <= within), np.minimum(near, f), near)
+        factor = factor * near
+        return np.clip(base * factor, MIN_INTERVAL, MAX_INTERVAL)
+
+    # ----- budget -----
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.budget_rate)
+        self.updated = now
+
+    def affordable(self, now=None):
+        """Whole requests the budget allows right now (0 while it is
+        overdrawn, e.g. after a universe reload)."""
+        self._refill(time.time() if now is None else now)
+        return max(0, int(self.tokens))
+
+    def spend(self, requests, now=None):
+        """Charge requests made outside observe() (e.g. a universe reload)."""
+        self._refill(time.time() if now is None else now)
+        self.tokens -= requests
+
+    # ----- cycle -----
+    def due(self, now=None, limit=None):
+        """Tickers due for a refresh, most overdue (relative to their own
+        interval) first, at most `limit`."""
+        now = time.time() if now is None else now
+        rows = np.flatnonzero(self.next_due <= now)
+        if limit is not None and len(rows) > limit:
+            limit = max(0, limit)
+            lateness = (now - self.next_due[rows]) / self.interval[rows]
+            rows = rows[np.argsort(-lateness, kind="stable")[:limit]]
+        return [self.store.tickers[i] for i in rows]
+
+    def observe(self, quotes, tickers, requests=0, now=None):
+        """
+        Apply refreshed quotes (a MarketStore from get_quotes) for the
+        requested `tickers`, update volatility and reschedule them; charge
+        `requests` to the budget. Tickers missing from quotes (a failed
+        fetch) are retried after MIN_INTERVAL with their volatility, mid and
+        last refresh untouched. Returns the refreshed row indices.
+        """
+        now = time.time() if now is None else now
+        self.spend(requests, now)
+        rows, failed = [], []
+        for ticker in tickers:
+            i = self.store.index.get(ticker)
+            if i is None:
+                continue
+            q = quotes.get(ticker) if quotes is not None else None
+            if q is None:
+                failed.append(i)
+                continue
+            self.store.update(ticker, {f: q[f] for f in NUMERIC_FIELDS})
+            rows.append(i)
+        if failed:
+            self.next_due[failed] = now + MIN_INTERVAL
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return rows
+        mid = self._mid(rows)
+        minutes = np.maximum((now - self.refreshed[rows]) / 60, 1 / 60)
+        move = np.abs(mid - self.mid[rows]) / np.sqrt(minutes)
+        self.vol[rows] = (1 - VOL_ALPHA) * self.vol[rows] + VOL_ALPHA * move
+        self.mid[rows] = mid
+        self.refreshed[rows] = now
+        self.interval[rows] = self.intervals(rows, now)
+        self.next_due[rows] = now + self.interval[rows]
+        return rows
+
+    def summary(self):
+        """Counts of markets per interval band, for logging."""
+        bands = ((60, "≤1m"), (300, "≤5m"), (1800, "≤30m"), (float("inf"), ">30m"))
+        out, lower = {}, 0
+        for upper, label in bands:
+            out[label] = int(((self.interval > lower) & (self.interval <= upper)).sum())
+            lower = upper
+        return out
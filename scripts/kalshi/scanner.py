@@ -11,25 +11,34 @@ import os
 import sys
 import json
 import time
-import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+import numpy as np
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import kalshi_api
+import logpipe
+import snapshot_cache
+from market_store import MarketStore, MarketRow
+from ratelimit import PRIORITY_SCAN
 
 from kalshi_python import KalshiClient, Configuration
 
 # ============== CONFIG ==============
 API_KEY_ID = os.getenv("KALSHI_API_KEY_ID", "898f7406-b498-4205-8949-c9f137403966")
 PRIVATE_KEY_PATH = os.getenv("KALSHI_PRIVATE_KEY_PATH", str(PROJECT_ROOT / ".kalshi-private-key.pem"))
-BASE_URL = "https://api.elections.kalshi.com"
 
 SCAN_INTERVAL_SECONDS = 300
 LOG_DIR = PROJECT_ROOT / "logs" / "kalshi"
 OPPORTUNITIES_FILE = LOG_DIR / "opportunities.jsonl"
 HOT_OPPORTUNITIES_FILE = LOG_DIR / "hot-opportunities.jsonl"
+OPPORTUNITY_STATE_FILE = LOG_DIR / "opportunity_state.json"
+CHANGE_THRESHOLD_CENTS = 2  # cost/potential/spread move that counts as "changed"
 
 # Capital management
 CAPITAL = 100  # dollars
@@ -47,18 +56,15 @@ FOCUS_SERIES = [
     # Add more economic/politics series
     "KXCPI", "KXFOMC", "KXJOBSREPORT", "KXNFP"
 ]
+FOCUS_CATEGORIES = ["Economics", "Financials", "Politics", "Climate and Weather"]
+FETCH_WORKERS = 8  # Concurrent series/category requests per scan
+SNAPSHOT_MAX_AGE = None  # None = snapshot_cache.DEFAULT_TTL, 0 = always fetch
 
 # ============== LOGGING ==============
+# Structured records, written off the scan path in batches (see logpipe.py);
+# console output only with --verbose / LOG_CONSOLE=1.
 LOG_DIR.mkdir(parents=True, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / "scanner.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+logger = logpipe.get_logger("scanner", LOG_DIR / "scanner.jsonl")
 
 # ============== KALSHI CLIENT ==============
 def get_client():
@@ -75,10 +81,7 @@ def get_balance(client):
 
 # ============== PUBLIC API ==============
 def fetch_public(path, params=None):
-    url = f"{BASE_URL}/trade-api/v2{path}"
-    response = requests.get(url, params=params, timeout=30)
-    response.raise_for_status()
-    return response.json()
+    return kalshi_api.fetch_public(path, params, timeout=30, priority=PRIORITY_SCAN)
 
 def get_events(category=None, status="open", limit=100):
     params = {"status": status, "limit": limit, "with_nested_markets": "true"}
@@ -87,39 +90,50 @@ def get_events(category=None, status="open", limit=100):
     return fetch_public("/events", params).get('events', [])
 
 def get_markets_by_series(series_ticker):
-    try:
-        return fetch_public("/markets", {"series_ticker": series_ticker}).get('markets', [])
-    except:
-        return []
-
-def get_all_markets():
-    """Fetch all interesting markets."""
-    all_markets = []
-    
-    # From focus series
-    for series in FOCUS_SERIES:
-        markets = get_markets_by_series(series)
-        all_markets.extend(markets)
-    
-    # From key categories
-    for category in ["Economics", "Financials", "Politics", "Climate and Weather"]:
-        try:
-            events = get_events(category=category, limit=100)
-            for event in events:
-                all_markets.extend(event.get('markets', []))
-        except Exception as e:
-            logger.debug(f"Category {category} error: {e}")
+    # Open markets only, max page size — settled/closed ones are never analyzed
+    return list(kalshi_api.iter_markets(status="open", series_ticker=series_ticker,
+                                        max_pages=5, timeout=30))
+
+def get_markets_by_category(category):
+    markets = []
+    for event in get_events(category=category, limit=100):
+        markets.extend(event.get('markets', []))
+    return markets
+
+def get_all_markets(max_age=None):
+    """All interesting markets — from the shared snapshot if fresh enough.
+    Returns (markets, status) — see snapshot_cache.load_or_fetch."""
+    return snapshot_cache.load_or_fetch("kalshi:focus", fetch_all_markets,
+                                        SNAPSHOT_MAX_AGE if max_age is None else max_age,
+                                        log=logger.info)
+
+def fetch_all_markets():
+    """Fetch all interesting markets (series + categories, fetched concurrently).
+    If any fetch fails, the rest are returned via PartialFetch so the
+    incomplete universe is used this scan but never cached."""
+    jobs = [(get_markets_by_series, series) for series in FOCUS_SERIES]
+    jobs += [(get_markets_by_category, category) for category in FOCUS_CATEGORIES]
     
-    # Dedupe
-    seen = set()
-    unique = []
-    for m in all_markets:
-        ticker = m.get('ticker')
-        if ticker and ticker not in seen:
-            seen.add(ticker)
-            unique.append(m)
+    # Streaming dedupe: merge each response as soon as it lands
+    unique, failed = {}, []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {pool.submit(fn, arg): arg for fn, arg in jobs}
+        for future in as_completed(futures):
+            try:
+                markets = future.result()
+            except Exception as e:
+                logger.debug(f"{futures[future]} error: {e}")
+                failed.append(futures[future])
+                continue
+            for m in markets:
+                ticker = m.get('ticker')
+                if ticker and ticker not in unique:
+                    unique[ticker] = m
     
-    return unique
+    if failed:
+        raise snapshot_cache.PartialFetch(list(unique.values()),
+                                          f"{len(failed)}/{len(jobs)} fetches failed: {', '.join(failed)}")
+    return list(unique.values())
 
 # ============== EXTERNAL DATA ==============
 def get_cme_fedwatch_probs():
@@ -143,260 +157,320 @@ def get_external_odds(market_title):
     return None
 
 # ============== ANALYSIS ==============
-def calculate_days_to_resolution(market):
-    """Calculate days until market resolves."""
-    close_time = market.get('close_time') or market.get('expiration_time')
-    if not close_time:
-        return 9999  # Unknown = far future
-    
-    try:
-        close_dt = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
-        now = datetime.now(timezone.utc)
-        delta = close_dt - now
-        return max(0, delta.days)
-    except:
-        return 9999
+# Rules are evaluated as column expressions over the whole MarketStore; each
+# hit is a numeric record (OPP_DTYPE) and only becomes a display dict in
+# format_opportunity(). Rule order = the order a market's opportunities are
+# listed in.
+ESTIMATED_FEES = 2  # ~2 cents per trade round trip
 
-def analyze_market(market):
-    """Analyze market for opportunities with improved logic."""
-    ticker = market.get('ticker', 'UNKNOWN')
-    title = market.get('title', ticker)
-    
-    yes_bid = market.get('yes_bid', 0) or 0
-    yes_ask = market.get('yes_ask', 0) or 0
-    no_bid = market.get('no_bid', 0) or 0
-    no_ask = market.get('no_ask', 0) or 0
-    volume = market.get('volume', 0) or 0
-    volume_24h = market.get('volume_24h', 0) or 0
-    open_interest = market.get('open_interest', 0) or 0
-    
-    days_to_resolve = calculate_days_to_resolution(market)
-    
-    # Skip very low volume
-    min_vol = MIN_VOLUME_SHORT_TERM if days_to_resolve <= 30 else MIN_VOLUME
-    if volume < min_vol:
-        return None
-    
-    opportunities = []
-    spread = yes_ask - yes_bid if yes_ask and yes_bid else 0
-    
-    # Estimate fees (~2 cents per trade round trip)
-    estimated_fees = 2
-    
-    # ==========================================
-    # TIER 1: SHORT-TERM HIGH CONFIDENCE (< 30 days)
-    # ==========================================
-    if days_to_resolve <= 30:
-        # High confidence NO (YES <= 15%)
-        if yes_ask <= 15 and yes_ask > 0:
-            no_cost = 100 - yes_bid
-            potential = yes_bid - estimated_fees
-            if potential >= MIN_EDGE_CENTS:
-                max_contracts = int((CAPITAL * MAX_POSITION_PCT) / (no_cost / 100))
-                opportunities.append({
-                    "type": "🔥 HOT: SHORT-TERM NO",
-                    "priority": 1,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "no_cost": f"{no_cost}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "volume_24h": volume_24h,
-                    "suggested_size": f"${min(20, CAPITAL * MAX_POSITION_PCT):.0f} ({max_contracts} contracts)",
-                    "action": f"BUY NO at {no_cost}¢ → {potential}¢ profit in {days_to_resolve} days",
-                    "roi_pct": f"{(potential/no_cost)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-        
-        # High confidence YES (>= 85%)
-        if yes_bid >= 85:
-            potential = (100 - yes_ask) - estimated_fees
-            if potential >= MIN_EDGE_CENTS:
-                max_contracts = int((CAPITAL * MAX_POSITION_PCT) / (yes_ask / 100))
-                opportunities.append({
-                    "type": "🔥 HOT: SHORT-TERM YES",
-                    "priority": 1,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "volume_24h": volume_24h,
-                    "suggested_size": f"${min(20, CAPITAL * MAX_POSITION_PCT):.0f} ({max_contracts} contracts)",
-                    "action": f"BUY YES at {yes_ask}¢ → {potential}¢ profit in {days_to_resolve} days",
-                    "roi_pct": f"{(potential/yes_ask)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    # ==========================================
-    # TIER 2: MEDIUM-TERM (30-90 days)
-    # ==========================================
-    elif days_to_resolve <= 90:
-        # Higher threshold for medium-term
-        if yes_ask <= 10 and yes_ask > 0:
-            no_cost = 100 - yes_bid
-            potential = yes_bid - estimated_fees
-            if potential >= MIN_EDGE_CENTS and volume >= 5000:
-                opportunities.append({
-                    "type": "📊 MEDIUM-TERM NO",
-                    "priority": 2,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "no_cost": f"{no_cost}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "action": f"BUY NO at {no_cost}¢ → {potential}¢ profit in {days_to_resolve} days",
-                    "roi_pct": f"{(potential/no_cost)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-        
-        if yes_bid >= 90:
-            potential = (100 - yes_ask) - estimated_fees
-            if potential >= MIN_EDGE_CENTS and volume >= 5000:
-                opportunities.append({
-                    "type": "📊 MEDIUM-TERM YES",
-                    "priority": 2,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "action": f"BUY YES at {yes_ask}¢ → {potential}¢ profit in {days_to_resolve} days",
-                    "roi_pct": f"{(potential/yes_ask)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    # ==========================================
-    # TIER 3: LONG-TERM HIGH VALUE (90+ days, but big edge)
-    # ==========================================
+RULES = (
+    # (type, priority, side, hold)
+    ("🔥 HOT: SHORT-TERM NO", 1, "no", "short"),
+    ("🔥 HOT: SHORT-TERM YES", 1, "yes", "short"),
+    ("📊 MEDIUM-TERM NO", 2, "no", "medium"),
+    ("📊 MEDIUM-TERM YES", 2, "yes", "medium"),
+    ("📈 LONG-TERM NO", 3, "no", "long"),
+    ("📈 LONG-TERM YES", 3, "yes", "long"),
+    ("💹 WIDE SPREAD", 4, None, None),
+)
+
+OPP_DTYPE = np.dtype([
+    ("row", np.int32),        # index into the MarketStore
+    ("rule", np.int8),        # index into RULES
+    ("priority", np.int8),
+    ("days", np.int32),
+    ("cost", np.int16),       # cents per contract (0 for WIDE SPREAD)
+    ("potential", np.int16),  # cents profit per contract after fees
+    ("spread", np.int16),
+])
+
+def evaluate_rules(markets, now=None, sort=True):
+    """
+    Tier 1/2/3 and wide-spread rules over every market at once.
+    Returns an OPP_DTYPE array, sorted by (priority, -potential) unless
+    sort=False (then by market, in RULES order).
+    """
+    yes_bid = markets.yes_bid.astype(np.int32)
+    yes_ask = markets.yes_ask.astype(np.int32)
+    volume = markets.volume
+    days = markets.days_to_resolve(now)
+    
+    short = days <= 30
+    medium = (days > 30) & (days <= 90)
+    long_term = days > 90
+    # Skip very low volume (lower floor for short-term)
+    liquid = volume >= np.where(short, MIN_VOLUME_SHORT_TERM, MIN_VOLUME)
+    
+    no_cost, no_potential = 100 - yes_bid, yes_bid - ESTIMATED_FEES
+    yes_cost, yes_potential = yes_ask, (100 - yes_ask) - ESTIMATED_FEES
+    spread = np.where((yes_ask != 0) & (yes_bid != 0), yes_ask - yes_bid, 0)
+    
+    masks = (
+        # TIER 1: SHORT-TERM HIGH CONFIDENCE (< 30 days) — YES <= 15% / >= 85%
+        short & (yes_ask > 0) & (yes_ask <= 15) & (no_potential >= MIN_EDGE_CENTS),
+        short & (yes_bid >= 85) & (yes_potential >= MIN_EDGE_CENTS),
+        # TIER 2: MEDIUM-TERM (30-90 days) — higher thresholds
+        medium & (yes_ask > 0) & (yes_ask <= 10) & (no_potential >= MIN_EDGE_CENTS) & (volume >= 5000),
+        medium & (yes_bid >= 90) & (yes_potential >= MIN_EDGE_CENTS) & (volume >= 5000),
+        # TIER 3: LONG-TERM HIGH VALUE (90+ days, but big edge and volume)
+        long_term & (yes_ask <= 8) & (volume >= 50000) & (no_potential >= 5),
+        long_term & (yes_bid >= 92) & (volume >= 50000) & (yes_potential >= 5),
+        # MARKET MAKING
+        (spread >= 5) & (volume >= 10000) & (days <= 90),
+    )
+    
+    parts = []
+    for rule, mask in enumerate(masks):
+        _, priority, side, _ = RULES[rule]
+        cost = no_cost if side == "no" else yes_cost if side == "yes" else None
+        potential = no_potential if side == "no" else yes_potential if side == "yes" else None
+        if cost is not None:
+            mask = mask & (cost > 0)  # sizing/ROI divide by cost
+        idx = np.flatnonzero(mask & liquid)
+        rec = np.zeros(len(idx), dtype=OPP_DTYPE)
+        rec["row"] = idx
+        rec["rule"] = rule
+        rec["priority"] = priority
+        rec["days"] = days[idx]
+        rec["spread"] = spread[idx]
+        if cost is not None:
+            rec["cost"] = cost[idx]
+            rec["potential"] = potential[idx]
+        parts.append(rec)
+    
+    recs = np.concatenate(parts)
+    if sort:
+        order = np.lexsort((recs["rule"], recs["row"], -recs["potential"].astype(np.int32), recs["priority"]))
     else:
-        # Only flag if very high edge AND volume
-        if yes_ask <= 8 and volume >= 50000:
-            no_cost = 100 - yes_bid
-            potential = yes_bid - estimated_fees
-            if potential >= 5:  # Higher threshold for long-term
-                opportunities.append({
-                    "type": "📈 LONG-TERM NO",
-                    "priority": 3,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "no_cost": f"{no_cost}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "action": f"BUY NO at {no_cost}¢ → {potential}¢ profit (long-term hold)",
-                    "roi_pct": f"{(potential/no_cost)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-        
-        if yes_bid >= 92 and volume >= 50000:
-            potential = (100 - yes_ask) - estimated_fees
-            if potential >= 5:
-                opportunities.append({
-                    "type": "📈 LONG-TERM YES",
-                    "priority": 3,
-                    "ticker": ticker,
-                    "title": title,
-                    "days_to_resolve": days_to_resolve,
-                    "yes_price": f"{yes_ask}¢",
-                    "potential_cents": potential,
-                    "volume": volume,
-                    "action": f"BUY YES at {yes_ask}¢ → {potential}¢ profit (long-term hold)",
-                    "roi_pct": f"{(potential/yes_ask)*100:.1f}%",
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    # ==========================================
-    # MARKET MAKING OPPORTUNITIES
-    # ==========================================
-    if spread >= 5 and volume >= 10000 and days_to_resolve <= 90:
-        opportunities.append({
-            "type": "💹 WIDE SPREAD",
-            "priority": 4,
-            "ticker": ticker,
-            "title": title,
-            "days_to_resolve": days_to_resolve,
+        order = np.lexsort((recs["rule"], recs["row"]))
+    return recs[order]
+
+def format_opportunity(markets, rec, timestamp=None):
+    """Display/log dict for one OPP_DTYPE record."""
+    row = int(rec["row"])
+    kind, priority, side, hold = RULES[rec["rule"]]
+    ticker = markets.tickers[row]
+    days = int(rec["days"])
+    yes_bid = markets.value(row, "yes_bid")
+    yes_ask = markets.value(row, "yes_ask")
+    volume = markets.value(row, "volume")
+    cost, potential = int(rec["cost"]), int(rec["potential"])
+    opp = {
+        "type": kind,
+        "priority": priority,
+        "ticker": ticker,
+        "title": markets.value(row, "title"),
+        "days_to_resolve": days,
+    }
+    
+    if side is None:
+        spread = int(rec["spread"])
+        opp.update({
             "spread": f"{spread}¢",
             "yes_bid": f"{yes_bid}¢",
             "yes_ask": f"{yes_ask}¢",
             "volume": volume,
             "action": f"Market making opportunity: place orders inside {spread}¢ spread",
-            "timestamp": datetime.now(timezone.utc).isoformat()
         })
+    else:
+        opp["yes_price"] = f"{yes_ask}¢"
+        if side == "no":
+            opp["no_cost"] = f"{cost}¢"
+        opp["potential_cents"] = potential
+        opp["volume"] = volume
+        if hold == "short":
+            max_contracts = int((CAPITAL * MAX_POSITION_PCT) / (cost / 100))
+            opp["volume_24h"] = markets.value(row, "volume_24h")
+            opp["suggested_size"] = f"${min(20, CAPITAL * MAX_POSITION_PCT):.0f} ({max_contracts} contracts)"
+        when = "(long-term hold)" if hold == "long" else f"in {days} days"
+        opp["action"] = f"BUY {side.upper()} at {cost}¢ → {potential}¢ profit {when}"
+        opp["roi_pct"] = f"{(potential/cost)*100:.1f}%"
     
+    opp["timestamp"] = timestamp or datetime.now(timezone.utc).isoformat()
+    return opp
+
+def _single_store(market):
+    return market.store.select([market.i]) if isinstance(market, MarketRow) else MarketStore([market])
+
+def analyze_market(market):
+    """Opportunities for a single market (dict or MarketStore row), same rules as evaluate_rules."""
+    store = _single_store(market)
+    timestamp = datetime.now(timezone.utc).isoformat()
+    opportunities = [format_opportunity(store, rec, timestamp)
+                     for rec in evaluate_rules(store, sort=False)]
     return opportunities if opportunities else None
 
-def log_opportunity(opp, is_hot=False):
-    """Log opportunity to file."""
-    target_file = HOT_OPPORTUNITIES_FILE if is_hot else OPPORTUNITIES_FILE
-    with open(target_file, "a") as f:
-        f.write(json.dumps(opp) + "\n")
+def log_opportunity(opp, is_hot=False, writer=None):
+    """Log opportunity to file (through `writer` when one is open)."""
+    if writer is not None:
+        writer.write(opp, is_hot)
+    else:
+        target_file = HOT_OPPORTUNITIES_FILE if is_hot else OPPORTUNITIES_FILE
+        with open(target_file, "a") as f:
+            f.write(json.dumps(opp) + "\n")
     
-    # Format for console
+    # One structured record per event (the full opportunity is in the jsonl above)
     priority = opp.get('priority', 9)
-    if priority == 1:
-        logger.info("=" * 70)
-        logger.info(f"🔥🔥🔥 {opp['type']} 🔥🔥🔥")
-        logger.info(f"   {opp['title'][:55]}")
-        logger.info(f"   Days to resolve: {opp['days_to_resolve']}")
-        logger.info(f"   {opp['action']}")
-        logger.info(f"   ROI: {opp.get('roi_pct', 'N/A')} | Volume: {opp['volume']:,}")
-        if 'suggested_size' in opp:
-            logger.info(f"   Suggested: {opp['suggested_size']}")
-        logger.info("=" * 70)
+    fields = {"ticker": opp.get("ticker"), "event": opp.get("event"), "priority": priority}
+    if opp.get('event') == 'disappeared':
+        if priority <= 3:
+            logger.info(f"➖ {opp['type']}: {opp['title'][:40]}... gone", extra={"fields": fields})
+    elif priority == 1:
+        fields.update(days=opp['days_to_resolve'], roi=opp.get('roi_pct'), volume=opp['volume'],
+                      size=opp.get('suggested_size'))
+        logger.info(f"{opp['type']}: {opp['title'][:55]} — {opp['action']}", extra={"fields": fields})
     elif priority <= 3:
-        logger.info(f"📊 {opp['type']}: {opp['title'][:40]}... ({opp.get('roi_pct', 'N/A')} ROI)")
+        fields.update(roi=opp.get('roi_pct'))
+        logger.info(f"📊 {opp['type']}: {opp['title'][:40]}...", extra={"fields": fields})
+
+# ============== CHANGE DETECTION ==============
+# The opportunity logs are an event stream: a (ticker, type) pair is written
+# when it appears, when its cost, potential or spread moves by
+# CHANGE_THRESHOLD_CENTS or more since it was last written, and when it
+# disappears — not again on every scan while nothing happens.
+class OpportunityWriter:
+    """Buffered appends to the opportunity logs, opened once per scan."""
+    
+    def __init__(self):
+        self.files = {}
+        self.count = 0
+    
+    def write(self, opp, is_hot=False):
+        path = HOT_OPPORTUNITIES_FILE if is_hot else OPPORTUNITIES_FILE
+        f = self.files.get(path)
+        if f is None:
+            f = self.files[path] = open(path, "a", buffering=1 << 16)
+        f.write(json.dumps(opp) + "\n")
+        self.count += 1
+    
+    def flush(self):
+        for f in self.files.values():
+            f.flush()
+    
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class OpportunityTracker:
+    """Last written state per (ticker, type), kept across scans and restarts."""
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else OPPORTUNITY_STATE_FILE
+        try:
+            self.state = json.loads(self.path.read_text())
+        except:
+            self.state = {}  # "ticker|type" → {priority, cost, potential, spread, title}
+    
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, separators=(",", ":")))
+        os.replace(tmp, self.path)
+    
+    @staticmethod
+    def _moved(old, new):
+        return any(abs(old[f] - new[f]) >= CHANGE_THRESHOLD_CENTS for f in ("cost", "potential", "spread"))
+    
+    def record(self, markets, recs, writer, timestamp=None, tickers=None):
+        """
+        Write the transitions between the stored state and `recs` (this
+        scan's OPP_DTYPE records over `markets`). Pairs missing from recs
+        count as disappeared — among all tracked pairs, or only those of
+        `tickers` when just those markets were re-evaluated.
+        Returns {"appeared": n, "changed": n, "disappeared": n}.
+        """
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+        counts = {"appeared": 0, "changed": 0, "disappeared": 0}
+        current = set()
+        for rec in recs:
+            row = int(rec["row"])
+            kind, priority = RULES[rec["rule"]][:2]
+            key = f"{markets.tickers[row]}|{kind}"
+            current.add(key)
+            snap = {"priority": priority, "cost": int(rec["cost"]),
+                    "potential": int(rec["potential"]), "spread": int(rec["spread"])}
+            old = self.state.get(key)
+            if old is None:
+                event = "appeared"
+            elif self._moved(old, snap):
+                event = "changed"
+            else:
+                continue
+            opp = format_opportunity(markets, rec, timestamp)
+            opp["event"] = event
+            if old is not None:
+                opp["previous"] = {f: old[f] for f in ("cost", "potential", "spread")}
+            log_opportunity(opp, is_hot=priority == 1, writer=writer)
+            snap["title"] = opp["title"]
+            self.state[key] = snap
+            counts[event] += 1
+        
+        for key in list(self.state):
+            if key in current:
+                continue
+            ticker, kind = key.split("|", 1)
+            if tickers is not None and ticker not in tickers:
+                continue
+            old = self.state.pop(key)
+            log_opportunity({
+                "event": "disappeared",
+                "type": kind,
+                "priority": old["priority"],
+                "ticker": ticker,
+                "title": old.get("title", ""),
+                "previous": {f: old[f] for f in ("cost", "potential", "spread")},
+                "timestamp": timestamp,
+            }, is_hot=old["priority"] == 1, writer=writer)
+            counts["disappeared"] += 1
+        return counts
 
 # ============== SCANNER ==============
-def scan_once():
-    """Run scan with priority sorting."""
-    markets = get_all_markets()
+def load_universe(max_age=None):
+    """The scan universe as a MarketStore, and whether it was "cached",
+    "fetched" or only "partial"ly fetched."""
+    markets, status = get_all_markets(max_age)
+    return MarketStore(markets), status
+
+def scan_once(tracker=None):
+    """Run scan with priority sorting; log only opportunity transitions."""
+    markets, status = load_universe()
     logger.info(f"Fetched {len(markets)} markets")
     
-    all_opps = []
-    for market in markets:
-        opps = analyze_market(market)
-        if opps:
-            all_opps.extend(opps)
-    
-    # Sort by priority (1 = best)
-    all_opps.sort(key=lambda x: (x.get('priority', 9), -x.get('potential_cents', 0)))
+    # Sorted by priority (1 = best), then potential
+    recs = evaluate_rules(markets)
     
-    # Log opportunities
-    hot_count = 0
-    for opp in all_opps:
-        is_hot = opp.get('priority') == 1
-        if is_hot:
-            hot_count += 1
-        log_opportunity(opp, is_hot=is_hot)
+    # Log what appeared, moved or disappeared since the last scan
+    if markets:
+        tracker = tracker or OpportunityTracker()
+        # A partial fetch only re-evaluated the markets it got; the rest haven't disappeared
+        tickers = set(markets.tickers) if status == "partial" else None
+        with OpportunityWriter() as writer:
+            counts = tracker.record(markets, recs, writer, tickers=tickers)
+        tracker.save()
+        logger.info(f"Logged {counts['appeared']} new, {counts['changed']} changed, "
+                    f"{counts['disappeared']} gone")
     
-    return len(all_opps), hot_count
+    return len(recs), int((recs["priority"] == 1).sum())
 
 def show_top_opportunities():
     """Show top opportunities summary."""
-    markets = get_all_markets()
+    markets, _ = load_universe()
     
-    all_opps = []
-    for market in markets:
-        opps = analyze_market(market)
-        if opps:
-            all_opps.extend(opps)
-    
-    # Sort by priority then ROI
-    all_opps.sort(key=lambda x: (x.get('priority', 9), -x.get('potential_cents', 0)))
+    # Sorted by priority then potential; only the top 20 are formatted
+    recs = evaluate_rules(markets)
     
     print(f"\n{'='*80}")
     print(f"TOP OPPORTUNITIES (sorted by priority)")
     print(f"{'='*80}")
     
-    for i, opp in enumerate(all_opps[:20], 1):
+    for i, rec in enumerate(recs[:20], 1):
+        opp = format_opportunity(markets, rec)
         print(f"\n{i}. {opp['type']}")
         print(f"   {opp['title'][:60]}")
         print(f"   {opp['action']}")
@@ -404,35 +478,160 @@ def show_top_opportunities():
 
 def run_scanner(client):
     """Main loop."""
-    logger.info("=" * 70)
-    logger.info("🚀 Kalshi Scanner v4 (Grok-Enhanced) Starting")
-    logger.info(f"   Capital: ${CAPITAL}")
-    logger.info(f"   Max position: {MAX_POSITION_PCT*100:.0f}%")
-    logger.info(f"   Min edge: {MIN_EDGE_CENTS}¢")
-    logger.info(f"   Scan interval: {SCAN_INTERVAL_SECONDS}s")
-    logger.info("=" * 70)
+    logger.info("🚀 Kalshi Scanner v4 (Grok-Enhanced) Starting", extra={"fields": {
+        "capital": CAPITAL, "max_position_pct": MAX_POSITION_PCT * 100,
+        "min_edge_cents": MIN_EDGE_CENTS, "interval_s": SCAN_INTERVAL_SECONDS}})
     
     scan_count = 0
+    tracker = OpportunityTracker()
     while True:
         try:
             scan_count += 1
-            logger.info(f"\n--- Scan #{scan_count} @ {datetime.now().strftime('%H:%M:%S')} ---")
+            total_opps, hot_opps = scan_once(tracker)
             
-            total_opps, hot_opps = scan_once()
+            logger.info(f"Scan #{scan_count}: {total_opps} opportunities ({hot_opps} HOT), "
+                        f"next in {SCAN_INTERVAL_SECONDS}s",
+                        extra={"fields": {"scan": scan_count, "total": total_opps, "hot": hot_opps}})
+            time.sleep(SCAN_INTERVAL_SECONDS)
             
-            if hot_opps > 0:
-                logger.info(f"🔥 {hot_opps} HOT opportunities found!")
-            logger.info(f"Total: {total_opps} opportunities")
+        except KeyboardInterrupt:
+            logger.info("Stopped")
+            break
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            time.sleep(60)
+
+# ============== STREAM MODE ==============
+def run_stream_scanner(url=None):
+    """
+    Subscribe to quote updates for the watched universe and re-run
+    analyze_market only for markets whose quotes changed. The universe is
+    refreshed (and the subscription renewed) every SCAN_INTERVAL_SECONDS.
+    """
+    from stream import WS_URL, auth_headers, quote_from_ticker, run_stream
+    
+    url = url or WS_URL
+    headers = None
+    if url.startswith("wss://"):
+        with open(PRIVATE_KEY_PATH, "r") as f:
+            private_key = f.read()
+        headers = lambda: auth_headers(API_KEY_ID, private_key, url)
+    
+    logger.info("⚡ Kalshi Scanner v4 — STREAM MODE", extra={"fields": {
+        "feed": url, "universe_refresh_s": SCAN_INTERVAL_SECONDS}})
+    
+    while True:
+        markets, _ = load_universe()
+        if not markets:
+            logger.error("No markets to watch — retrying in 60s")
+            time.sleep(60)
+            continue
+        logger.info(f"📡 Watching {len(markets)} markets")
+        stats = {"updates": 0, "analyzed": 0, "events": 0}
+        tracker = OpportunityTracker()
+        writer = OpportunityWriter()
+        
+        def on_message(kind, msg):
+            if kind != "ticker":
+                return
+            ticker = msg.get("market_ticker")
+            if ticker not in markets:
+                return
+            stats["updates"] += 1
+            if not markets.update(ticker, quote_from_ticker(msg)):
+                return
+            stats["analyzed"] += 1
+            store = _single_store(markets[ticker])
+            counts = tracker.record(store, evaluate_rules(store, sort=False), writer, tickers={ticker})
+            if any(counts.values()):
+                stats["events"] += sum(counts.values())
+                writer.flush()
+        
+        try:
+            run_stream(list(markets), on_message, url=url, headers=headers,
+                       duration=SCAN_INTERVAL_SECONDS, log=logger.warning)
+        except KeyboardInterrupt:
+            logger.info("Stopped")
+            break
+        finally:
+            writer.close()
+            tracker.save()
+        logger.info(f"Stream window: {stats['updates']} updates, "
+                    f"{stats['analyzed']} re-analyzed, {stats['events']} opportunity events")
+
+# ============== ADAPTIVE MODE ==============
+# Each market is refreshed on its own interval (see scan_scheduler.py), set by
+# days to resolution, quote volatility and distance to these tier levels.
+TIER_LEVELS = {"yes_ask": (15, 10, 8), "yes_bid": (85, 90, 92)}  # cents
+UNIVERSE_REFRESH_SECONDS = 1800  # full reload: new listings, close times
+ADAPTIVE_TICK_SECONDS = 5
+# Requests one fixed-interval scan makes at minimum (one per series/category);
+# the adaptive budget is this many per SCAN_INTERVAL_SECONDS, reloads included.
+FULL_SCAN_REQUESTS = len(FOCUS_SERIES) + len(FOCUS_CATEGORIES)
+
+def run_adaptive_scanner():
+    """
+    Reload the universe every UNIVERSE_REFRESH_SECONDS (evaluated in full,
+    like scan_once), and in between re-quote only the markets that are due,
+    in batched get_quotes calls, within the request rate of the fixed loop.
+    """
+    from scan_scheduler import ScanScheduler
+    
+    budget = FULL_SCAN_REQUESTS / SCAN_INTERVAL_SECONDS
+    logger.info("🎯 Kalshi Scanner v4 — ADAPTIVE MODE", extra={"fields": {
+        "budget_per_min": round(budget * 60, 1), "universe_refresh_s": UNIVERSE_REFRESH_SECONDS}})
+    
+    tracker = OpportunityTracker()
+    sched, markets, reloaded = None, None, 0
+    while True:
+        try:
+            now = time.time()
+            if sched is None or now - reloaded >= UNIVERSE_REFRESH_SECONDS:
+                markets, status = load_universe()
+                if not markets:
+                    logger.error("No markets to watch — retrying in 60s")
+                    time.sleep(60)
+                    continue
+                if sched is None:
+                    sched = ScanScheduler(markets, levels=TIER_LEVELS, budget_rate=budget, now=now)
+                else:
+                    sched.reset_universe(markets, now)
+                if status != "cached":  # a snapshot reuse made no requests
+                    sched.spend(FULL_SCAN_REQUESTS, now)
+                reloaded = now
+                tickers = set(markets.tickers) if status == "partial" else None
+                with OpportunityWriter() as writer:
+                    counts = tracker.record(markets, evaluate_rules(markets), writer, tickers=tickers)
+                tracker.save()
+                bands = ", ".join(f"{n} {label}" for label, n in sched.summary().items())
+                logger.info(f"📋 Universe: {len(markets)} markets | intervals: {bands}")
+                logger.info(f"Logged {counts['appeared']} new, {counts['changed']} changed, "
+                            f"{counts['disappeared']} gone")
+                continue
             
-            logger.info(f"Next scan in {SCAN_INTERVAL_SECONDS}s...")
-            time.sleep(SCAN_INTERVAL_SECONDS)
+            due = sched.due(now, limit=sched.affordable(now) * kalshi_api.QUOTE_CHUNK)
+            if due:
+                quotes = kalshi_api.get_quotes(due, priority=PRIORITY_SCAN, log=logger.warning)
+                requests = -(-len(due) // kalshi_api.QUOTE_CHUNK)
+                rows = sched.observe(quotes, due, requests=requests, now=now)
+                store = markets.select(rows)
+                with OpportunityWriter() as writer:
+                    counts = tracker.record(store, evaluate_rules(store), writer, tickers=set(store.tickers))
+                log = logger.info if any(counts.values()) else logger.debug
+                log(f"🔁 Re-quoted {len(quotes)}/{len(due)} due markets ({requests} requests): "
+                    f"{counts['appeared']} new, {counts['changed']} changed, {counts['disappeared']} gone")
+                if any(counts.values()):
+                    tracker.save()
+            
+            time.sleep(ADAPTIVE_TICK_SECONDS)
             
         except KeyboardInterrupt:
-            logger.info("\nStopped")
+            logger.info("Stopped")
             break
         except Exception as e:
             logger.error(f"Error: {e}")
             time.sleep(60)
+    tracker.save()
 
 # ============== CLI ==============
 if __name__ == "__main__":
@@ -441,17 +640,39 @@ if __name__ == "__main__":
     parser.add_argument("--once", action="store_true")
     parser.add_argument("--top", action="store_true")
     parser.add_argument("--interval", type=int, default=300)
+    parser.add_argument("--max-age", type=float, default=None,
+                        help="Reuse a market snapshot up to this many seconds old (0 = always fetch)")
+    parser.add_argument("--stream", action="store_true",
+                        help="React to live quote updates instead of polling")
+    parser.add_argument("--stream-url", default=None,
+                        help="WebSocket feed (default Kalshi; ws://127.0.0.1:8765 for stream_stub.py)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Refresh each market on its own interval instead of all at once")
+    parser.add_argument("--verbose", action="store_true", help="Also render log records on stderr")
+    parser.add_argument("--quiet", action="store_true", help="Log warnings and errors only")
     args = parser.parse_args()
+    logpipe.set_mode(logger, console=args.verbose, quiet=args.quiet or None)
     
     if args.interval:
         SCAN_INTERVAL_SECONDS = args.interval
+    if args.max_age is not None:
+        SNAPSHOT_MAX_AGE = args.max_age
+    
+    if args.stream and args.stream_url and args.stream_url.startswith("ws://"):
+        # Local stand-in feed — no account needed
+        run_stream_scanner(args.stream_url)
+        sys.exit(0)
     
     client = get_client()
     balance = get_balance(client)
     CAPITAL = balance
     print(f"💰 Balance: ${balance:.2f}")
     
-    if args.top:
+    if args.stream:
+        run_stream_scanner(args.stream_url)
+    elif args.adaptive:
+        run_adaptive_scanner()
+    elif args.top:
         show_top_opportunities()
     elif args.once:
         scan_once()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Market Snapshot Cache
+On-disk (SQLite, WAL) store of fetched market universes, shared across
+processes; callers check here first and only hit the network when the
+snapshot is older than their TTL. Two universes are kept:
+
+  - "kalshi:short_term:60d" (kalshi_api.short_term_markets) — every open
+    market closing within 60 days, volume ≥ 500. Shared by arbitrage_v2
+    (and so auto_trader) and monitor.py, which narrow it with MarketStore
+    masks; monitor accepts a 15-minute-old sweep so its hourly run reuses
+    the auto-trader's.
+  - "kalshi:focus" (scanner.get_all_markets) — the scanner's focus series
+    and categories, long-dated markets included. Shared by every scanner
+    process and mode (loop, --once, --top, --adaptive, --stream).
+
+    markets = snapshot_cache.cached("kalshi:focus", fetch_all_markets)
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CACHE_DB = PROJECT_ROOT / "logs" / "kalshi" / "snapshots.db"
+DEFAULT_TTL = float(os.getenv("KALSHI_SNAPSHOT_TTL", "240"))  # seconds
+KEEP_PER_SOURCE = 2  # older snapshots are pruned on write
+
+
+class PartialFetch(Exception):
+    """Raised by a fetch that only got part of the universe. cached() hands
+    the partial data back to the caller but never stores it."""
+
+    def __init__(self, data, reason):
+        super().__init__(reason)
+        self.data = data
+
+
+def _connect():
+    CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            source     TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            payload    BLOB NOT NULL,
+            PRIMARY KEY (source, fetched_at)
+        )
+    """)
+    return conn
+
+
+def load(source, max_age=None):
+    """Return (data, age_seconds) for the newest snapshot of `source` no older
+    than max_age (default DEFAULT_TTL), or (None, None)."""
+    max_age = DEFAULT_TTL if max_age is None else max_age
+    if max_age <= 0:
+        return None, None
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT fetched_at, payload FROM snapshots WHERE source = ? "
+                "ORDER BY fetched_at DESC LIMIT 1", (source,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None, None
+    if not row:
+        return None, None
+    age = time.time() - row[0]
+    if age > max_age:
+        return None, None
+    return json.loads(zlib.decompress(row[1])), age
+
+
+def store(source, data):
+    """Save a snapshot of `source` (empty results are not cached)."""
+    if not data:
+        return
+    payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 1)
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                now = time.time()
+                conn.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                             (source, now, payload))
+                conn.execute(
+                    "DELETE FROM snapshots WHERE source = ? AND fetched_at NOT IN "
+                    "(SELECT fetched_at FROM snapshots WHERE source = ? "
+                    " ORDER BY fetched_at DESC LIMIT ?)",
+                    (source, source, KEEP_PER_SOURCE)
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # cache is best-effort
+
+
+def load_or_fetch(source, fetch, max_age=None, log=print):
+    """
+    Load a fresh-enough snapshot of `source`, else call fetch() and store it.
+    Returns (data, status): status is "cached" (no request made), "fetched",
+    or "partial" (fetch raised PartialFetch; the data was not stored).
+    """
+    data, age = load(source, max_age)
+    if data is not None:
+        log(f"    ♻️ {source}: snapshot {age:.0f}s old")
+        return data, "cached"
+    try:
+        data = fetch()
+    except PartialFetch as e:
+        log(f"    ⚠️ {source}: incomplete ({e}) — not cached")
+        return e.data, "partial"
+    store(source, data)
+    return data, "fetched"
+
+
+def cached(source, fetch, max_age=None, log=print):
+    """Load a fresh-enough snapshot of `source`, else call fetch() and store it."""
+    return load_or_fetch(source, fetch, max_age, log)[0]
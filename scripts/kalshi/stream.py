@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Kalshi WebSocket Stream
+Subscribes to market data channels (ticker, orderbook_delta) for a set of
+tickers and hands every data message to a callback, so callers react to quote
+changes as they happen instead of re-polling the whole universe.
+
+Production: wss://api.elections.kalshi.com/trade-api/ws/v2 (signed headers).
+Offline:    python3 stream_stub.py, then point at ws://127.0.0.1:8765.
+"""
+
+import time
+import json
+import base64
+import asyncio
+from urllib.parse import urlsplit
+
+import websockets
+
+WS_URL = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+RECONNECT_DELAY = 2      # seconds, doubles per failure
+MAX_RECONNECT_DELAY = 60
+
+
+# ============== AUTH ==============
+def auth_headers(api_key_id, private_key_pem, url=WS_URL):
+    """Kalshi signed-request headers for the WebSocket handshake
+    (RSA-PSS/SHA256 over timestamp + method + path)."""
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    key = serialization.load_pem_private_key(private_key_pem.encode(), password=None)
+    ts = str(int(time.time() * 1000))
+    message = f"{ts}GET{urlsplit(url).path}".encode()
+    signature = key.sign(
+        message,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+    return {
+        "KALSHI-ACCESS-KEY": api_key_id,
+        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode(),
+        "KALSHI-ACCESS-TIMESTAMP": ts,
+    }
+
+
+def _connect(url, headers):
+    # websockets >= 14 renamed extra_headers → additional_headers
+    major = int(websockets.__version__.split(".")[0])
+    key = "additional_headers" if major >= 14 else "extra_headers"
+    return websockets.connect(url, max_size=None, **({key: headers} if headers else {}))
+
+
+def quote_from_ticker(msg):
+    """Normalize a `ticker` channel payload to the REST market field names."""
+    yes_bid = msg.get("yes_bid", 0) or 0
+    yes_ask = msg.get("yes_ask", 0) or 0
+    quote = {
+        "yes_bid": yes_bid,
+        "yes_ask": yes_ask,
+        "no_bid": 100 - yes_ask if yes_ask else 0,
+        "no_ask": 100 - yes_bid if yes_bid else 0,
+    }
+    if "price" in msg:
+        quote["last_price"] = msg["price"]
+    if "volume" in msg:
+        quote["volume"] = msg["volume"]
+    if "open_interest" in msg:
+        quote["open_interest"] = msg["open_interest"]
+    return quote
+
+
+# ============== STREAM ==============
+async def stream(tickers, on_message, url=WS_URL, channels=("ticker",),
+                 headers=None, duration=None, log=print):
+    """
+    Subscribe `channels` for `tickers` and call on_message(type, msg) for each
+    data message. Reconnects with backoff; returns after `duration` seconds
+    (None = forever). `headers` may be a dict or a callable returning one
+    (signatures are timestamped, so re-sign on every reconnect). Connection
+    errors are reported through `log`.
+    """
+    deadline = time.monotonic() + duration if duration else None
+    delay = RECONNECT_DELAY
+
+    while deadline is None or time.monotonic() < deadline:
+        try:
+            hdrs = headers() if callable(headers) else headers
+            async with _connect(url, hdrs) as ws:
+                await ws.send(json.dumps({
+                    "id": 1,
+                    "cmd": "subscribe",
+                    "params": {"channels": list(channels), "market_tickers": list(tickers)},
+                }))
+                delay = RECONNECT_DELAY
+                while True:
+                    timeout = None if deadline is None else deadline - time.monotonic()
+                    if timeout is not None and timeout <= 0:
+                        return
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout)
+                    except asyncio.TimeoutError:
+                        return
+                    data = json.loads(raw)
+                    kind = data.get("type")
+                    if kind == "error":
+                        raise RuntimeError(data.get("msg"))
+                    if kind in ("subscribed", "ok"):
+                        continue
+                    msg = data.get("msg", {})
+                    if "seq" in data:  # per-subscription sequence, for gap detection
+                        msg["sid"], msg["seq"] = data.get("sid"), data["seq"]
+                    on_message(kind, msg)
+        except (OSError, websockets.ConnectionClosed, RuntimeError) as e:
+            log(f"  ⚠️ stream: {e} — reconnecting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+
+def run_stream(tickers, on_message, **kwargs):
+    """Blocking wrapper around stream()."""
+    asyncio.run(stream(tickers, on_message, **kwargs))
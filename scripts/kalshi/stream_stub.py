@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Local Kalshi WebSocket Stand-in
+Speaks the subset of the Kalshi WS protocol we use (subscribe → `subscribed`,
+then `ticker` messages, or `orderbook_snapshot` + sequenced `orderbook_delta`)
+and random-walks quotes/books for whatever tickers a client subscribes to.
+Lets `scanner.py --stream` and orderbook.BookSet.follow() run offline.
+
+Usage:
+    python3 stream_stub.py [--port 8765] [--rate 20]
+    python3 scanner.py --stream --stream-url ws://127.0.0.1:8765 --max-age 86400
+
+(--max-age lets the scanner take its universe from the last cached snapshot,
+so no REST call is needed either.)
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import websockets
+
+RATE = 20  # quote updates per second, per connection
+
+
+def _seed_quote():
+    yes_bid = random.randint(1, 97)
+    return {"yes_bid": yes_bid, "yes_ask": min(99, yes_bid + random.randint(1, 4)),
+            "price": yes_bid, "volume": random.randint(500, 100_000)}
+
+
+def _step(q):
+    """Random-walk a quote by a tick or two."""
+    move = random.choice((-2, -1, 0, 1, 2))
+    yes_bid = max(1, min(97, q["yes_bid"] + move))
+    q.update(yes_bid=yes_bid,
+             yes_ask=min(99, yes_bid + random.randint(1, 4)),
+             price=yes_bid,
+             volume=q["volume"] + random.randint(0, 50))
+    return q
+
+
+def _seed_book(q):
+    """Bid ladders around a seeded quote: YES bids below yes_bid, NO bids
+    below 100 - yes_ask."""
+    return {
+        "yes": {p: random.randint(1, 200) for p in range(max(1, q["yes_bid"] - 4), q["yes_bid"] + 1)},
+        "no": {p: random.randint(1, 200) for p in range(max(1, 96 - q["yes_ask"]), 101 - q["yes_ask"])},
+    }
+
+
+async def handler(ws, path=None, rate=RATE):
+    sids = {}   # channel → subscription id
+    seqs = {}   # subscription id → last sequence number
+    quotes = {}
+    books = {}
+    subscribed = asyncio.Event()
+
+    async def send(kind, channel, msg):
+        sid = sids[channel]
+        seqs[sid] = seqs.get(sid, 0) + 1
+        await ws.send(json.dumps({"type": kind, "sid": sid, "seq": seqs[sid], "msg": msg}))
+
+    async def publish():
+        await subscribed.wait()
+        while True:
+            await asyncio.sleep(1 / rate)
+            ticker = random.choice(list(quotes))
+            if "ticker" in sids:
+                q = _step(quotes[ticker])
+                await ws.send(json.dumps({
+                    "type": "ticker", "sid": sids["ticker"],
+                    "msg": {"market_ticker": ticker, **q, "ts": int(time.time())},
+                }))
+            if "orderbook_delta" in sids:
+                side = random.choice(("yes", "no"))
+                levels = books[ticker][side]
+                if not levels:
+                    continue
+                price = random.choice(list(levels))
+                delta = random.randint(-levels.get(price, 0), 50)
+                levels[price] = levels.get(price, 0) + delta
+                if levels[price] <= 0:
+                    del levels[price]
+                await send("orderbook_delta", "orderbook_delta",
+                           {"market_ticker": ticker, "price": price, "delta": delta, "side": side})
+
+    publisher = asyncio.create_task(publish())
+    try:
+        async for raw in ws:
+            cmd = json.loads(raw)
+            if cmd.get("cmd") != "subscribe":
+                continue
+            params = cmd.get("params", {})
+            for ticker in params.get("market_tickers", []):
+                quotes.setdefault(ticker, _seed_quote())
+                books.setdefault(ticker, _seed_book(quotes[ticker]))
+            for channel in params.get("channels", []):
+                sids[channel] = len(sids) + 1
+                await ws.send(json.dumps({"id": cmd.get("id"), "type": "subscribed",
+                                          "msg": {"channel": channel, "sid": sids[channel]}}))
+                if channel == "orderbook_delta":
+                    for ticker in params.get("market_tickers", []):
+                        book = books[ticker]
+                        await send("orderbook_snapshot", channel, {
+                            "market_ticker": ticker,
+                            "yes": sorted(book["yes"].items()),
+                            "no": sorted(book["no"].items()),
+                        })
+            if quotes:
+                subscribed.set()
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        publisher.cancel()
+
+
+async def serve(host="127.0.0.1", port=8765, rate=RATE):
+    async with websockets.serve(lambda ws, path=None: handler(ws, path, rate), host, port):
+        print(f"🧪 Kalshi stream stand-in on ws://{host}:{port} ({rate} updates/s)")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Kalshi WebSocket stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=RATE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.rate))
+    except KeyboardInterrupt:
+        pass
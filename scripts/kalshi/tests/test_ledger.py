@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Ledger: FIFO sells, oversells, stale closing and the one-time import."""
+
+import sys
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from ledger import Ledger
+
+
+def make_ledger(tmp_path):
+    return Ledger(tmp_path / "ledger.db", migrate=False)
+
+
+def test_partial_sell_across_two_lots(tmp_path):
+    with make_ledger(tmp_path) as ledger:
+        ledger.record_buy("KXCPI-T0.1", "yes", 10, 10)   # 100¢
+        ledger.record_buy("KXCPI-T0.1", "yes", 10, 20)   # 200¢
+
+        sold = ledger.record_sell("KXCPI-T0.1", 15, 30, action="TAKE_PROFIT")
+        # FIFO: all of lot 1 (100¢) plus half of lot 2 (100¢)
+        assert sold == {"sold": 15, "cost_cents": 200, "realized_cents": 450 - 200}
+
+        entry = ledger.entry("KXCPI-T0.1")
+        assert entry["contracts"] == 5
+        assert entry["cost_cents"] == 100
+        assert entry["avg_price"] == 20.0
+        assert entry["realized_cents"] == 250
+
+
+def test_sell_more_than_held(tmp_path):
+    with make_ledger(tmp_path) as ledger:
+        ledger.record_buy("KXGDP-T2", "no", 4, 25)
+
+        sold = ledger.record_sell("KXGDP-T2", 10, 30)
+        assert sold == {"sold": 4, "cost_cents": 100, "realized_cents": 20}
+        assert ledger.entry("KXGDP-T2") is None
+        assert not ledger.is_held("KXGDP-T2")
+
+        # Nothing left: a further sell is a no-op
+        assert ledger.record_sell("KXGDP-T2", 1, 30) == {"sold": 0, "cost_cents": 0, "realized_cents": 0}
+
+
+def test_close_stale_keeps_tickers_still_held(tmp_path):
+    with make_ledger(tmp_path) as ledger:
+        ledger.record_buy("OLD-HELD", "yes", 1, 10, timestamp="2026-01-01T00:00:00+00:00")
+        ledger.record_buy("OLD-GONE", "yes", 1, 10, timestamp="2026-01-01T00:00:00Z")
+        ledger.record_buy("RECENT", "yes", 1, 10, timestamp="2026-10-01T00:00:00+00:00")
+
+        now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+        assert ledger.close_stale(now=now, held={"OLD-HELD"}) == ["OLD-GONE"]
+        assert ledger.open_tickers() == {"OLD-HELD", "RECENT"}
+
+
+def test_migrate_replays_trade_log(tmp_path):
+    trade_log = tmp_path / "auto_trades.jsonl"
+    trades = [
+        {"timestamp": "2026-09-01T12:00:00+00:00", "ticker": "KXCPI-T0.1", "side": "yes",
+         "count": 10, "price": 12, "total_cost": 120, "name": "CPI > 0.1%"},
+        {"timestamp": "2026-09-02T12:00:00+00:00", "ticker": "KXCPI-T0.1", "side": "yes",
+         "count": 10, "price": 16, "total_cost": 160},
+        {"timestamp": "2026-09-03T12:00:00+00:00", "ticker": "KXCPI-T0.1", "action": "TAKE_PROFIT",
+         "count": 12, "exit_price": 20},
+        {"timestamp": "2026-09-04T12:00:00+00:00", "ticker": "KXUNEMP-T4", "side": "no",
+         "count": 5, "price": 40},
+    ]
+    trade_log.write_text("\n".join(json.dumps(t) for t in trades) + "\nnot json\n")
+    tracker = tmp_path / "held_positions.json"
+    tracker.write_text(json.dumps({
+        "KXCPI-T0.1": {"total_contracts": 20, "total_cost_cents": 280},
+        "KXGDP-T2": {"total_contracts": 3, "total_cost_cents": 90, "market_name": "GDP > 2%",
+                     "first_bought": "2026-08-01T00:00:00+00:00",
+                     "last_bought": "2026-08-05T00:00:00+00:00"},
+    }))
+
+    with make_ledger(tmp_path) as ledger:
+        assert ledger.migrate(trade_log=trade_log, tracker=tracker) == (3, 1, 1)
+        assert ledger.migrate(trade_log=trade_log, tracker=tracker) is None
+
+        cpi = ledger.entry("KXCPI-T0.1")
+        # 12 sold FIFO: lot 1 (120¢) and 2 of lot 2 (32¢) → 8 left costing 128¢
+        assert (cpi["side"], cpi["contracts"], cpi["cost_cents"]) == ("yes", 8, 128)
+        assert cpi["realized_cents"] == 12 * 20 - 152
+        assert cpi["name"] == "CPI > 0.1%"
+
+        assert ledger.entry("KXUNEMP-T4")["avg_price"] == 40.0
+
+        gdp = ledger.entry("KXGDP-T2")
+        assert (gdp["side"], gdp["contracts"], gdp["cost_cents"]) == (None, 3, 90)
+        assert gdp["last_bought"] == "2026-08-05T00:00:00+00:00"
+
+
+def test_rebuy_cooldown_outlasts_the_exit(tmp_path):
+    with make_ledger(tmp_path) as ledger:
+        ledger.record_buy("KXCPI-T0.1", "yes", 5, 20, timestamp="2026-10-01T00:00:00+00:00")
+        ledger.record_sell("KXCPI-T0.1", 5, 15, timestamp="2026-10-02T00:00:00+00:00", action="STOP_LOSS")
+        assert not ledger.is_held("KXCPI-T0.1")
+
+        assert ledger.bought_within("KXCPI-T0.1", now=datetime(2026, 10, 17, tzinfo=timezone.utc))
+        assert not ledger.bought_within("KXCPI-T0.1", now=datetime(2026, 12, 1, tzinfo=timezone.utc))
+        assert not ledger.bought_within("NEVER-BOUGHT")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""log_archive: compaction round trip, incremental appends, text logs, query filters, rotation."""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import log_archive
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    """A project tree with logs/kalshi and logs/trading; returns logs/kalshi."""
+    kalshi = tmp_path / "logs" / "kalshi"
+    kalshi.mkdir(parents=True)
+    (tmp_path / "logs" / "trading").mkdir()
+    monkeypatch.setattr(log_archive, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(log_archive, "LOG_ROOTS", [kalshi, tmp_path / "logs" / "trading"])
+    monkeypatch.setattr(log_archive, "ARCHIVE_DIR", tmp_path / "logs" / "archive")
+    monkeypatch.setattr(log_archive, "INDEX_DB", tmp_path / "logs" / "archive" / "index.db")
+    return kalshi
+
+
+def opportunity(ticker, day, hour, **extra):
+    return {"timestamp": f"2026-01-{day:02d}T{hour:02d}:00:00+00:00", "ticker": ticker,
+            "event": "appeared", **extra}
+
+
+def write_jsonl(path, records, mode="a"):
+    with open(path, mode) as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def archived(**filters):
+    return [rec for _, _, rec in log_archive.query(live=False, **filters)]
+
+
+def test_compact_query_round_trip(logs):
+    records = [opportunity("KXCPI-26JAN-T0.3", 20, h, cost=h, nested={"a": [1, 2]}) for h in range(5)]
+    records.append({"timestamp": "2026-01-21T00:00:00Z", "msg": "no ticker", "roi": None})
+    write_jsonl(logs / "opportunities.jsonl", records)
+
+    log_archive.compact()
+
+    assert archived(source="kalshi/opportunities") == records
+    assert (logs / "opportunities.jsonl").exists()  # small live logs are not rotated
+
+
+def test_incremental_append_after_compaction(logs):
+    path = logs / "opportunities.jsonl"
+    write_jsonl(path, [opportunity("KXA-1", 20, 1), opportunity("KXA-1", 20, 2)])
+    log_archive.compact()
+
+    write_jsonl(path, [opportunity("KXA-1", 20, 3)])
+    with open(path, "a") as f:
+        f.write('{"timestamp": "2026-01-20T04:00:00Z", "ticker": "KXA-1"')  # still being written
+    log_archive.compact()
+    hours = [r["timestamp"][11:13] for r in archived(ticker="KXA-1")]
+    assert hours == ["01", "02", "03"]
+    # Nothing archived twice, and the unfinished line isn't read live either
+    assert len(log_archive.query(ticker="KXA-1")) == 3
+
+    with open(path, "a") as f:
+        f.write(', "event": "changed"}\n')
+    log_archive.compact()
+    assert [r["timestamp"][11:13] for r in archived(ticker="KXA-1")] == ["01", "02", "03", "04"]
+
+
+def test_text_log_parsing():
+    lines = [
+        "2026-01-26 14:00:00,250 [INFO] 🔥 HOT: KXCPI-26JAN-T0.3 cost 12",
+        "2026-01-26 14:00:05 [ERROR] Error: boom",
+        "Traceback (most recent call last):",
+        '  File "scanner.py", line 1',
+        "no timestamp, no ticker",
+    ]
+    records, last_ts = log_archive.parse_lines(lines, is_text=True)
+
+    start = time.mktime(time.strptime("2026-01-26 14:00:00", "%Y-%m-%d %H:%M:%S"))
+    assert len(records) == 2
+    assert records[0]["_ts"] == start + 0.25
+    assert records[0]["time"] == "2026-01-26 14:00:00,250"
+    assert (records[0]["level"], records[0]["_ticker"]) == ("INFO", "KXCPI-26JAN-T0.3")
+    assert records[1]["_ts"] == last_ts == start + 5
+    assert records[1]["msg"].splitlines() == ["Error: boom", "Traceback (most recent call last):",
+                                              '  File "scanner.py", line 1', "no timestamp, no ticker"]
+    assert records[1]["_ticker"] == ""
+
+
+def test_time_and_ticker_filters(logs):
+    write_jsonl(logs / "opportunities.jsonl",
+                [opportunity(t, day, 12) for day in (20, 22, 24, 26) for t in ("KXA-1", "KXB-2")])
+    (logs / "scanner.log").write_text("2026-01-23 08:00:00 [INFO] KXA-1 moved\n")
+    log_archive.compact()
+
+    since = log_archive.parse_when("2026-01-22T00:00:00+00:00")
+    until = log_archive.parse_when("2026-01-25T00:00:00+00:00")
+    window = archived(source="kalshi/opportunities", ticker="KXA-1", since=since, until=until)
+    assert [r["timestamp"][:10] for r in window] == ["2026-01-22", "2026-01-24"]
+    assert {r["ticker"] for r in archived(source="kalshi/opportunities", ticker="KXB-2")} == {"KXB-2"}
+
+    across = log_archive.query(ticker="KXA-1", live=False)
+    assert [src for _, src, _ in across].count("kalshi/scanner") == 1
+    assert [ts for ts, _, _ in across] == sorted(ts for ts, _, _ in across)
+
+    assert archived(fields={"ticker"}, ticker="KXB-2", since=until) == [{"ticker": "KXB-2"}]
+
+
+def test_pinned_logs_are_never_rotated(logs, monkeypatch):
+    monkeypatch.setattr(log_archive, "ROTATE_BYTES", 100)
+    monkeypatch.setattr(log_archive, "SETTLE_SECONDS", 0)
+    trades = [opportunity("KXA-1", 20, h, count=1, price=10) for h in range(5)]
+    write_jsonl(logs / "auto_trades.jsonl", trades)
+    write_jsonl(logs / "scanner.jsonl", [opportunity("KXA-1", 20, h) for h in range(5)])
+
+    log_archive.compact(rotate_all=True)
+    log_archive.compact(rotate_all=True)
+
+    # The audit log stays in place, whole, and is archived once
+    assert (logs / "auto_trades.jsonl").read_text().count("\n") == 5
+    assert archived(source="kalshi/auto_trades") == trades
+    # An ordinary log over the limit is rotated, archived, and its settled segment removed
+    assert not (logs / "scanner.jsonl").exists()
+    assert list(logs.glob("*.closed")) == []
+    assert len(archived(source="kalshi/scanner")) == 5
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""ScanScheduler: per-market intervals, due ordering under a budget, failed refreshes."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from market_store import MarketStore, format_ts
+from scan_scheduler import ScanScheduler, MIN_INTERVAL, FAR_INTERVAL
+
+NOW = 1_800_000_000.0
+DAY = 86400
+
+
+def market(ticker, days=None, yes_bid=40, yes_ask=45):
+    m = {"ticker": ticker, "title": ticker, "yes_bid": yes_bid, "yes_ask": yes_ask}
+    if days is not None:
+        m["close_time"] = format_ts(NOW + days * DAY + 3600)
+    return m
+
+
+def test_intervals_by_days_volatility_and_level():
+    store = MarketStore([
+        market("D1", 1), market("D5", 5), market("D20", 20), market("D60", 60),
+        market("D200", 200), market("NOCLOSE"),
+        market("NEAR", 60, yes_bid=8, yes_ask=12),     # 3¢ from the 15¢ level
+        market("AT", 1, yes_bid=10, yes_ask=15),       # on it
+    ])
+    sched = ScanScheduler(store, levels={"yes_ask": (15,)}, now=NOW)
+
+    assert list(sched.intervals(now=NOW)) == [30, 60, 180, 600, FAR_INTERVAL, FAR_INTERVAL,
+                                              300, MIN_INTERVAL]
+
+    sched.vol[store.index["D60"]] = 1.0  # one VOL_SCALE halves the interval
+    assert sched.intervals([store.index["D60"]], now=NOW)[0] == 300
+
+
+def test_due_orders_by_lateness_within_budget():
+    store = MarketStore([market("FAR", 60), market("NEAR", 1), market("MID", 20)])
+    sched = ScanScheduler(store, budget_rate=0.01, burst=2, now=NOW)
+
+    now = NOW + 700  # NEAR (30s) is ~22 intervals late, MID (180s) ~3, FAR (600s) ~0.2
+    assert sched.due(now) == ["FAR", "NEAR", "MID"]
+    assert sched.due(now, limit=sched.affordable(now)) == ["NEAR", "MID"]
+
+    quotes = MarketStore([market("NEAR", 1), market("MID", 20)])
+    sched.observe(quotes, ["NEAR", "MID"], requests=2, now=now)
+    assert sched.affordable(now) == 0
+    assert sched.due(now, limit=sched.affordable(now)) == []
+    assert sched.due(now) == ["FAR"]
+
+
+def test_failed_tickers_retry_soon_without_a_refresh():
+    store = MarketStore([market("OK", 5), market("FAILED", 5)])
+    sched = ScanScheduler(store, now=NOW)
+    failed = store.index["FAILED"]
+    sched.vol[failed] = 0.5
+    before = (sched.vol[failed], sched.mid[failed], sched.refreshed[failed], sched.interval[failed])
+
+    now = NOW + 120
+    quotes = MarketStore([market("OK", 5, yes_bid=50, yes_ask=56)])
+    rows = sched.observe(quotes, ["OK", "FAILED"], now=now)
+
+    assert list(rows) == [store.index["OK"]]
+    assert sched.refreshed[store.index["OK"]] == now
+    assert sched.mid[store.index["OK"]] == 53
+    assert (sched.vol[failed], sched.mid[failed], sched.refreshed[failed], sched.interval[failed]) == before
+    assert sched.next_due[failed] == now + MIN_INTERVAL
+    assert sched.due(now + MIN_INTERVAL) == ["FAILED"]
+
+
+def test_overdrawn_budget_allows_nothing():
+    store = MarketStore([market(f"M{i}", 1) for i in range(300)])
+    sched = ScanScheduler(store, budget_rate=0.01, burst=4, now=NOW)
+
+    now = NOW + 60
+    sched.spend(22, now)  # a universe reload charged against a burst of 4
+    assert sched.affordable(now) == 0
+    assert sched.due(now, limit=sched.affordable(now) * 100) == []
+    assert sched.due(now, limit=-1000) == []
+    assert len(sched.due(now)) == 300
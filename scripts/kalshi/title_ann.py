@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Approximate Nearest-Neighbour Title Pairing
+Finds likely cross-venue pairs (Kalshi ↔ Polymarket/PredictIt) without
+hand-written keywords:
+
+  1. titles → hashed TF-IDF vectors (word unigrams + bigrams hashed into
+     DIM buckets with a sign bit, idf over both venues, L2-normalised) —
+     CPU only, no model files;
+  2. an inverted-file index (spherical k-means cells over the index titles)
+     retrieves candidates: each query is only compared, by exact cosine,
+     with the titles in its PROBES nearest cells;
+  3. confirm() is the strict second stage: the two titles must carry the
+     same numbers (thresholds, years, dates) and share most of their words.
+
+    pairs = pair_titles(kalshi_titles, external_titles)  # [(k_key, e_key, sim)]
+
+Benchmark (recall vs latency vs exact search): python3 bench_ann.py
+"""
+
+import re
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+
+DIM = 256          # hashed feature dimensions
+PROBES = 8         # cells searched per query
+KMEANS_ITERS = 6
+TRAIN_PER_CELL = 40
+MIN_SIM = 0.5      # cosine floor for a candidate
+SEED = 7
+
+TOKEN_RE = re.compile(r"\d+(?:\.\d+)?|[a-z]+")
+NUMBER_RE = re.compile(r"\d")
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+# "january"/"jan"/"sept" → "jan"/"sep": months are compared like numbers
+MONTH_TOKENS = {m: m[:3] for m in MONTHS}
+MONTH_TOKENS.update({m[:3]: m[:3] for m in MONTHS})
+MONTH_TOKENS["sept"] = "sep"
+STOPWORDS = {"will", "the", "a", "an", "be", "in", "of", "on", "by", "to", "at",
+             "for", "or", "and", "is", "this", "that", "vs", "than", "before", "after"}
+
+
+def tokens(title):
+    """Lowercased word/number tokens, stopwords dropped ("0.3%" → "0.3"),
+    month names shortened ("January" → "jan")."""
+    return [MONTH_TOKENS.get(t, t) for t in TOKEN_RE.findall((title or "").lower())
+            if t not in STOPWORDS]
+
+
+def key_terms(toks):
+    """Numbers and months: these must agree exactly for two titles to pair."""
+    return {t for t in toks if NUMBER_RE.match(t) or t in MONTH_TOKENS}
+
+
+def features(toks):
+    """Unigrams plus adjacent bigrams."""
+    return toks + [f"{a} {b}" for a, b in zip(toks, toks[1:])]
+
+
+class TitleEncoder:
+    """Hashed TF-IDF over a fixed corpus of feature lists (fit on both venues)."""
+
+    def __init__(self, corpus, dim=DIM):
+        self.dim = dim
+        df = Counter(f for feats in corpus for f in set(feats))
+        n = len(corpus)
+        self.default_idf = math.log(1 + n) + 1
+        self.vocab = {}  # feature → id into cols/weights
+        cols, weights = [], []
+        for f, c in df.items():
+            col, sign = self._hash(f)
+            self.vocab[f] = len(cols)
+            cols.append(col)
+            weights.append(sign * (math.log((1 + n) / (1 + c)) + 1))
+        self.cols = cols
+        self.weights = weights
+
+    def idf(self, feature):
+        i = self.vocab.get(feature)
+        return abs(self.weights[i]) if i is not None else self.default_idf
+
+    def _hash(self, feature):
+        v = zlib.crc32(feature.encode())
+        return v % self.dim, (1.0 if v & 0x80000000 else -1.0)
+
+    def _id(self, feature):
+        i = self.vocab.get(feature)
+        if i is None:  # unseen at fit time
+            col, sign = self._hash(feature)
+            i = self.vocab[feature] = len(self.cols)
+            self.cols.append(col)
+            self.weights.append(sign * self.default_idf)
+        return i
+
+    def encode(self, corpus):
+        """(len(corpus), dim) float32, one L2-normalised row per feature list."""
+        n = len(corpus)
+        lengths = np.fromiter((len(feats) for feats in corpus), dtype=np.int64, count=n)
+        ids = np.fromiter((self._id(f) for feats in corpus for f in feats),
+                          dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        cols = np.asarray(self.cols, dtype=np.int64)[ids]
+        weights = np.asarray(self.weights)[ids]
+        m = np.bincount(rows * self.dim + cols, weights=weights,
+                        minlength=n * self.dim).reshape(n, self.dim).astype(np.float32)
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        return m / np.where(norms == 0, 1, norms)
+
+
+class IVFIndex:
+    """Unit vectors grouped into k-means cells; queries scan only the
+    cells nearest to them, each as one matrix product."""
+
+    def __init__(self, vectors, cells=None, iters=KMEANS_ITERS, seed=SEED):
+        n = len(vectors)
+        cells = max(1, min(n, cells or int(math.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        # Centroids are trained on a sample (~TRAIN_PER_CELL rows per cell)
+        train = vectors[rng.choice(n, min(n, cells * TRAIN_PER_CELL), replace=False)] if n else vectors
+        m = len(train)
+        centroids = train[rng.choice(m, cells, replace=False)] if m else train[:0]
+        for _ in range(iters if m else 0):
+            assign = (train @ centroids.T).argmax(axis=1)
+            onehot = np.zeros((cells, m), dtype=train.dtype)
+            onehot[assign, np.arange(m)] = 1
+            sums = onehot @ train
+            empty = np.flatnonzero(np.bincount(assign, minlength=cells) == 0)
+            sums[empty] = train[rng.choice(m, len(empty))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1, norms)
+        assign = (vectors @ centroids.T).argmax(axis=1) if n else np.zeros(0, dtype=np.int64)
+        self.centroids = centroids
+        self.order = np.argsort(assign, kind="stable")  # cell-major row order
+        self.blocks = vectors[self.order]
+        self.offsets = np.searchsorted(assign[self.order], np.arange(cells + 1))
+
+    def __len__(self):
+        return len(self.order)
+
+    def query(self, vectors, k=1, probes=PROBES, min_sim=MIN_SIM):
+        """For each query row, up to k (index row, cosine) pairs ≥ min_sim, best first."""
+        results = [[] for _ in range(len(vectors))]
+        if not len(self) or not len(vectors):
+            return results
+        cells = len(self.centroids)
+        probes = min(probes, cells)
+        near = np.argpartition(-(vectors @ self.centroids.T), probes - 1, axis=1)[:, :probes]
+        flat = near.ravel()
+        by_cell = np.argsort(flat, kind="stable")
+        cell_starts = np.searchsorted(flat[by_cell], np.arange(cells + 1))
+        q_out, i_out, s_out = [], [], []
+        for c in range(cells):
+            lo, hi = self.offsets[c], self.offsets[c + 1]
+            qs = by_cell[cell_starts[c]:cell_starts[c + 1]] // probes
+            if hi == lo or not len(qs):
+                continue
+            sims = vectors[qs] @ self.blocks[lo:hi].T
+            kk = min(k, hi - lo)
+            top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk] if kk < hi - lo else \
+                np.broadcast_to(np.arange(hi - lo), (len(qs), hi - lo))
+            q_out.append(np.repeat(qs, kk))
+            i_out.append((top + lo).ravel())
+            s_out.append(np.take_along_axis(sims, top, axis=1).ravel())
+        if not q_out:
+            return results
+        q_all, i_all, s_all = np.concatenate(q_out), np.concatenate(i_out), np.concatenate(s_out)
+        keep = s_all >= min_sim
+        q_all, i_all, s_all = q_all[keep], self.order[i_all[keep]], s_all[keep]
+        for j in np.lexsort((-s_all, q_all)):
+            hits = results[q_all[j]]
+            if len(hits) < k:
+                hits.append((int(i_all[j]), float(s_all[j])))
+        return results
+
+
+def exact_query(index_vectors, vectors, k=1, min_sim=MIN_SIM):
+    """Brute-force counterpart of IVFIndex.query (for benchmarking)."""
+    sims = vectors @ index_vectors.T
+    top = np.argsort(-sims, axis=1)[:, :k] if k > 1 else sims.argmax(axis=1)[:, None]
+    return [[(int(j), float(sims[i, j])) for j in row if sims[i, j] >= min_sim]
+            for i, row in enumerate(top)]
+
+
+def confirm(a_tokens, b_tokens, idf=None, min_overlap=0.8):
+    """
+    Strict second stage: identical numbers and months, at least two words in
+    common, and the common words carry ≥ min_overlap of the lighter title's
+    word weight (idf(word), 1 each without an idf) — a different name,
+    place or subject sinks the pair even when the template matches.
+    """
+    a_keys, b_keys = key_terms(a_tokens), key_terms(b_tokens)
+    if a_keys != b_keys:
+        return False
+    a_words = set(a_tokens) - a_keys
+    b_words = set(b_tokens) - b_keys
+    common = a_words & b_words
+    if len(common) < 2:
+        return False
+    weight = idf or (lambda w: 1.0)
+    shared = sum(weight(w) for w in common)
+    return shared >= min_overlap * min(sum(weight(w) for w in a_words),
+                                       sum(weight(w) for w in b_words))
+
+
+def pair_titles(index_titles, query_titles, k=3, probes=PROBES, min_sim=MIN_SIM):
+    """
+    Pair {key: title} dicts: for each query title, its most similar index
+    title among the top k that passes confirm(). Returns
+    [(index_key, query_key, cosine)].
+    """
+    if not index_titles or not query_titles:
+        return []
+    i_keys, q_keys = list(index_titles), list(query_titles)
+    i_toks = [tokens(index_titles[key]) for key in i_keys]
+    q_toks = [tokens(query_titles[key]) for key in q_keys]
+    i_feats = [features(t) for t in i_toks]
+    q_feats = [features(t) for t in q_toks]
+    encoder = TitleEncoder(i_feats + q_feats)
+    index = IVFIndex(encoder.encode(i_feats))
+    pairs = []
+    for qi, hits in enumerate(index.query(encoder.encode(q_feats), k=k, probes=probes, min_sim=min_sim)):
+        for ii, sim in hits:
+            if confirm(i_toks[ii], q_toks[qi], encoder.idf):
+                pairs.append((i_keys[ii], q_keys[qi], sim))
+                break
+    return pairs
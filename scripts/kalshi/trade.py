@@ -14,6 +14,10 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from kalshi_python import KalshiClient, Configuration, CreateOrderRequest
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ratelimit import SCHEDULER, PRIORITY_ORDER, PRIORITY_EXIT, PRIORITY_QUOTE
+
 # ============== CONFIG ==============
 API_KEY_ID = os.getenv("KALSHI_API_KEY_ID", "898f7406-b498-4205-8949-c9f137403966")
 PRIVATE_KEY_PATH = os.getenv("KALSHI_PRIVATE_KEY_PATH", str(PROJECT_ROOT / ".kalshi-private-key.pem"))
@@ -33,7 +37,8 @@ def get_balance(client):
 def get_positions(client):
     """Get current positions."""
     try:
-        positions = client._portfolio_api.get_positions()
+        with SCHEDULER.slot(PRIORITY_EXIT):
+            positions = client._portfolio_api.get_positions()
         return positions.market_positions if hasattr(positions, 'market_positions') else []
     except Exception as e:
         print(f"Error getting positions: {e}")
@@ -42,12 +47,46 @@ def get_positions(client):
 def get_market(client, ticker):
     """Get market details."""
     try:
-        market = client._markets_api.get_market(ticker=ticker)
+        with SCHEDULER.slot(PRIORITY_QUOTE):
+            market = client._markets_api.get_market(ticker=ticker)
         return market.market if hasattr(market, 'market') else market
     except Exception as e:
         print(f"Error getting market {ticker}: {e}")
         return None
 
+def side_bid(market, side):
+    """What one contract of `side` sells for now, in cents, from a market dict
+    (falls back to last price / the other side when there is no bid)."""
+    if side == 'yes':
+        return market.get('yes_bid', 0) or market.get('last_price', 0) or 0
+    no_bid = market.get('no_bid', 0) or 0
+    if no_bid == 0:
+        yes_price = market.get('yes_bid', 0) or market.get('last_price', 0) or 0
+        no_bid = 100 - yes_price if yes_price > 0 else 0
+    return no_bid
+
+def mark_to_market(positions, quotes):
+    """
+    Value positions at current bids. `quotes` maps ticker → market (the
+    MarketStore from kalshi_api.get_quotes, or plain dicts). Returns {ticker: {side, count, bid, value_cents}};
+    positions with no quote are valued at 0.
+    """
+    table = {}
+    for p in positions:
+        ticker = getattr(p, 'ticker', None)
+        pos = getattr(p, 'position', 0)
+        if not ticker or pos == 0:
+            continue
+        side = 'yes' if pos > 0 else 'no'
+        bid = side_bid(quotes.get(ticker, {}), side)
+        table[ticker] = {
+            "side": side,
+            "count": abs(pos),
+            "bid": bid,
+            "value_cents": abs(pos) * bid,
+        }
+    return table
+
 def place_order(client, ticker, side, count, limit_price=None):
     """
     Place an order.
@@ -69,7 +108,9 @@ def place_order(client, ticker, side, count, limit_price=None):
             order.yes_price = limit_price if side == 'yes' else None
             order.no_price = limit_price if side == 'no' else None
         
-        response = client._portfolio_api.create_order(**order.model_dump(exclude_none=True))
+        # Orders jump ahead of any queued scan/pagination traffic
+        with SCHEDULER.slot(PRIORITY_ORDER):
+            response = client._portfolio_api.create_order(**order.model_dump(exclude_none=True))
         return response
     except Exception as e:
         print(f"Error placing order: {e}")
@@ -19,13 +19,16 @@ Risk Rules:
 import os
 import sys
 import json
-import requests
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 sys.stdout.reconfigure(line_buffering=True)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import transport
+
 LOG_DIR = PROJECT_ROOT / "logs" / "trading"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 TRADE_LOG = LOG_DIR / "auto_trades.jsonl"
@@ -61,7 +64,7 @@ CASH_BUFFER = 10.0          # Keep $10 buffer (Grok: up from $5)
 def api_get(endpoint, data_api=False):
     url = f"{DATA_URL}{endpoint}" if data_api else f"{BASE_URL}{endpoint}"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        r = transport.get(url, headers=HEADERS, timeout=15)
         if r.status_code == 200:
             return r.json()
         else:
@@ -74,7 +77,7 @@ def api_get(endpoint, data_api=False):
 
 def api_post(endpoint, data):
     try:
-        r = requests.post(f"{BASE_URL}{endpoint}", headers=HEADERS, json=data, timeout=15)
+        r = transport.post(f"{BASE_URL}{endpoint}", headers=HEADERS, json=data, timeout=15)
         if r.status_code in (200, 201):
             return r.json()
         else:
@@ -87,7 +90,7 @@ def api_post(endpoint, data):
 
 def api_delete(endpoint):
     try:
-        r = requests.delete(f"{BASE_URL}{endpoint}", headers=HEADERS, timeout=15)
+        r = transport.delete(f"{BASE_URL}{endpoint}", headers=HEADERS, timeout=15)
         return r.status_code in (200, 204)
     except:
         return False
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Transport
+One pooled requests.Session per host, so back-to-back calls to the same API
+reuse a keep-alive connection instead of paying a fresh TLS handshake.
+
+Used by every script that talks to Kalshi, Polymarket, PredictIt, The Odds API,
+FRED or Alpaca. Drop-in for requests.get/post/delete:
+
+    import transport
+    r = transport.get(url, params=params, timeout=15)
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ============== CONFIG ==============
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))  # keep-alive connections per host
+USER_AGENT = "clawd-trading/1.0"
+
+# urllib3 only decodes brotli bodies when a brotli package is importable
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# ============== SESSIONS ==============
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "User-Agent": USER_AGENT,
+    })
+    return session
+
+
+def session_for(url):
+    """Get (or create) the pooled session for the host of `url`."""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _new_session()
+    return session
+
+
+def _timeout(timeout):
+    """Callers pass a read timeout in seconds (as they did with requests);
+    connects always use the shorter CONNECT_TIMEOUT."""
+    if timeout is None:
+        return (CONNECT_TIMEOUT, READ_TIMEOUT)
+    if isinstance(timeout, tuple):
+        return timeout
+    return (min(CONNECT_TIMEOUT, timeout), timeout)
+
+
+# ============== REQUESTS ==============
+def request(method, url, timeout=None, **kwargs):
+    return session_for(url).request(method, url, timeout=_timeout(timeout), **kwargs)
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    return request("GET", url, params=params, timeout=timeout, **kwargs)
+
+
+def post(url, json=None, timeout=None, **kwargs):
+    return request("POST", url, json=json, timeout=timeout, **kwargs)
+
+
+def delete(url, timeout=None, **kwargs):
+    return request("DELETE", url, timeout=timeout, **kwargs)
+
+
+def close():
+    """Close all pooled connections (optional — they close at exit anyway)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()